@@ -22,6 +22,7 @@ Sous-packages disponibles (état actuel) :
 - audit              : journal immuable (chaîne SHA-256)                      [implémenté]
 - crypto             : quarantaine chiffrée AES-256-GCM                       [implémenté]
 - notify             : notifications sortantes (Slack/syslog/webhook)        [implémenté]
+- severity           : rang des niveaux de sévérité (partagé)                [implémenté]
 - detection          : détecteurs de signatures bas niveau                   [héritage non-intégré]
 - explainability     : SHAP/LIME et cadre éthique                            [héritage non-intégré]
 - learning           : apprentissage par renforcement (TensorFlow)           [héritage non-intégré]
@@ -35,7 +36,50 @@ Licence : MIT
 __version__ = "0.2.0"
 __author__ = "BioCybe Team"
 
-# Aucun import eager au niveau du package : chaque sous-module doit être
-# importé explicitement par l'appelant. Cela évite qu'un module non
-# implémenté ou avec une dépendance manquante (TensorFlow, yara, etc.)
-# ne casse l'ensemble du système au moment de `import src`.
+# Aucun import eager au niveau du package : un module non implémenté ou
+# avec une dépendance manquante (TensorFlow, yara, etc.) ne doit pas casser
+# `import biocybe`. Les sous-modules restent accessibles en attribut
+# (`biocybe.scanner`) via __getattr__ (PEP 562) : chargés au premier accès.
+_LAZY_SUBMODULES = frozenset(
+    {
+        "api",
+        "audit",
+        "biocybe_core",
+        "crypto",
+        "dashboard",
+        "detection",
+        "explainability",
+        "intel",
+        "isolation",
+        "learning",
+        "lymphocytes_b",
+        "lymphocytes_t",
+        "macrophages",
+        "memory",
+        "network_monitor",
+        "network_sentinel",
+        "neutralization",
+        "nk_cells",
+        "notify",
+        "regeneration",
+        "scanner",
+        "severity",
+        "swarm",
+        "swarm_intelligence",
+        "watcher",
+    }
+)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        import importlib
+
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module  # accès suivants : lookup direct, sans __getattr__
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _LAZY_SUBMODULES)
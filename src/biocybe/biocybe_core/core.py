@@ -6,6 +6,8 @@ Ce module est responsable de l'initialisation, coordination et communication
 entre les différents modules "cellulaires" du système.
 """
 
+import contextlib
+import copy
 import importlib
 import json
 import logging
@@ -13,33 +15,186 @@ import os
 import pkgutil
 import queue
 import sys
+import tempfile
 import threading
-from collections.abc import Callable
+import time
+from collections import ChainMap, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
-
-import yaml
-
-# Configuration du logger
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        # encoding="utf-8" explicite : sinon cp1252 sur Windows casse
-        # les accents et rend les logs non-parsables pour les SIEM.
-        logging.FileHandler("biocybe.log", encoding="utf-8"),
-    ],
-)
+from types import MappingProxyType
+from typing import Any, ClassVar
+
+from ..config_loader import load_yaml_config
+from ..log_setup import configure_logging
+
+try:  # sérialisation JSON en C si l'extra `perf` est installé
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - dépend de l'extra installé
+    _orjson = None  # type: ignore[assignment]
+
+# Journalisation asynchrone (QueueHandler → QueueListener) : le dispatcher et
+# les workers des cellules n'écrivent jamais eux-mêmes sur disque. Sans effet
+# si l'application (CLI, API, tests) a déjà configuré le logger racine.
+configure_logging()
 logger = logging.getLogger("biocybe.core")
 
+# Nombre maximal de messages extraits du bus par passe du dispatcher
+DISPATCH_BATCH_SIZE = 256
+# Attente maximale (s) de la distribution du message d'arrêt dans stop()
+SHUTDOWN_DRAIN_TIMEOUT = 1.0
+# Durée (s) pendant laquelle get_status resert le même état
+STATUS_CACHE_TTL = 0.5
+
+
+# Configuration par défaut du noyau, en lecture seule : complète la
+# configuration chargée (ou la remplace si le fichier est absent/invalide).
+_DEFAULT_CONFIG = MappingProxyType(
+    {
+        "core": MappingProxyType(
+            {"message_retention": 1000, "log_level": "INFO", "xai_enabled": True}
+        ),
+        "cells": MappingProxyType(
+            {
+                "autoload": True,
+                "enabled_types": (
+                    "macrophage",
+                    "b_cell",
+                    "t_cell",
+                    "nk_cell",
+                    "memory_cell",
+                    "barrier_cell",
+                ),
+            }
+        ),
+    }
+)
+
+
+def _with_default_config(loaded: Any) -> ChainMap:
+    """
+    Superpose la configuration chargée à `_DEFAULT_CONFIG`.
+
+    Les sections par défaut ("core", "cells") sont fusionnées clé par clé :
+    `config["cells"]["autoload"]` est toujours défini, même si le YAML ne
+    renseigne qu'une partie de la section. Les écritures ne touchent jamais
+    les valeurs par défaut.
+    """
+    if not isinstance(loaded, dict):
+        loaded = {}
+    sections = {
+        name: ChainMap(loaded[name], defaults)  # type: ignore[arg-type]
+        for name, defaults in _DEFAULT_CONFIG.items()
+        if isinstance(loaded.get(name), dict)
+    }
+    # ChainMap n'écrit que dans la première map : les défauts en lecture seule
+    # ne sont jamais modifiés
+    return ChainMap(sections, loaded, _DEFAULT_CONFIG)  # type: ignore[arg-type]
+
+
+def _monotonic_ns_to_iso(ns: int) -> str:
+    """Convertit un horodatage `time.monotonic_ns()` en date ISO locale."""
+    return datetime.fromtimestamp(time.time() - (time.monotonic_ns() - ns) / 1e9).isoformat()
+
+
+def _dumps_status(status: dict) -> bytes:
+    """Sérialise un état en JSON indenté (UTF-8)."""
+    if _orjson is not None:
+        return _orjson.dumps(
+            status, default=str, option=_orjson.OPT_INDENT_2 | _orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(status, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _write_atomic(file_path: str, data: bytes) -> None:
+    """Remplace `file_path` par `data` (fichier temporaire + os.replace)."""
+    fd, tmp = tempfile.mkstemp(prefix=".status-", dir=os.path.dirname(file_path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp crée en 0o600 ; même droits qu'un open() classique
+        os.replace(tmp, file_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+@dataclass(slots=True)
+class CellStats:
+    """Compteurs d'une cellule (attributs à slots plutôt qu'un dict).
+
+    Garde l'accès de l'ancien dict (`cell.stats["messages_sent"]`,
+    `dict(cell.stats)`) pour le code externe : mêmes clés, mêmes valeurs.
+    """
+
+    _KEYS: ClassVar[tuple[str, ...]] = (
+        "messages_received",
+        "messages_sent",
+        "actions_performed",
+        "last_activity",
+    )
+
+    messages_received: int = 0
+    messages_sent: int = 0
+    actions_performed: int = 0
+    # time.monotonic_ns() : converti en date seulement dans to_dict
+    last_activity: int = field(default_factory=time.monotonic_ns)
+
+    def keys(self) -> tuple[str, ...]:
+        return self._KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._KEYS
+
+    def __getitem__(self, key: str) -> int:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        value: int = getattr(self, key)
+        return value
+
+    def __setitem__(self, key: str, value: int) -> None:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def to_dict(self) -> dict:
+        return {
+            "messages_received": self.messages_received,
+            "messages_sent": self.messages_sent,
+            "actions_performed": self.actions_performed,
+            "last_activity": _monotonic_ns_to_iso(self.last_activity),
+        }
+
 
 class CellMessage:
     """
     Représente un message échangé entre les modules cellulaires,
     inspiré par la signalisation entre cellules du système immunitaire.
+
+    Objet à `__slots__` (pas de dict d'instance) : l'horodatage est un
+    entier `time.time_ns()`, l'identifiant et le `datetime` ne sont
+    construits que s'ils sont lus (sérialisation, alertes).
     """
 
+    __slots__ = (
+        "_id",
+        "is_alert",
+        "msg_type",
+        "payload",
+        "priority",
+        "source",
+        "target",
+        "timestamp_ns",
+    )
+
     def __init__(
         self,
         msg_type: str,
@@ -61,32 +216,34 @@ class CellMessage:
             timestamp: Horodatage du message (défaut = maintenant)
         """
         self.msg_type = msg_type
+        # Calculé une fois ici plutôt qu'à chaque passage dans le dispatcher
+        self.is_alert = msg_type.startswith("alert_")
         self.source = source
         self.target = target
         self.payload = payload
         self.priority = max(1, min(5, priority))  # Entre 1 et 5
-        self.timestamp = timestamp or datetime.now()
-        self.id = f"{source}_{self.timestamp.strftime('%Y%m%d%H%M%S%f')}"
+        self.timestamp_ns = (
+            time.time_ns() if timestamp is None else round(timestamp.timestamp() * 1e6) * 1000
+        )
+        self._id: str | None = None
+
+    @property
+    def timestamp(self) -> datetime:
+        """Horodatage du message (heure locale, à la microseconde)."""
+        return datetime.fromtimestamp(self.timestamp_ns // 1000 / 1e6)
+
+    @property
+    def id(self) -> str:
+        """Identifiant `<source>_<YYYYmmddHHMMSSffffff>`, calculé à la première lecture."""
+        if self._id is None:
+            self._id = f"{self.source}_{self.timestamp.strftime('%Y%m%d%H%M%S%f')}"
+        return self._id
 
     def __str__(self):
         return (
             f"Message[{self.msg_type}] de {self.source} → {self.target} (priorité: {self.priority})"
         )
 
-    def __lt__(self, other: "CellMessage") -> bool:
-        """Ordonne par timestamp pour `queue.PriorityQueue`.
-
-        PriorityQueue heappush/pop compare les éléments du tuple
-        `(priority, message)` ; si la priorité est égale, Python compare
-        l'élément suivant (le message). Sans `__lt__`, on a une
-        TypeError "'<' not supported between instances of 'CellMessage'".
-
-        Détecté en daemon réel Phase VALIDATION (1 ERROR dans le log
-        à chaque égalité de priorité — typique au démarrage où plusieurs
-        cellules envoient des messages quasi-simultanés en priorité 1).
-        """
-        return self.timestamp < other.timestamp
-
     def to_dict(self):
         """Convertit le message en dictionnaire pour sérialisation"""
         return {
@@ -100,6 +257,72 @@ class CellMessage:
         }
 
 
+# Sentinelle d'arrêt : déposée dans le bus du noyau ou dans la file d'une
+# cellule, elle réveille le thread bloqué et lui demande de se terminer
+# (priorité minimale : tout ce qui la précède est distribué d'abord).
+_SHUTDOWN = CellMessage("__shutdown__", source="core", target="core", priority=1)
+
+
+class MessageBus:
+    """
+    File de messages du noyau : une `deque` par niveau de priorité (5 → 1).
+
+    `deque.append` / `deque.popleft` sont atomiques sous le GIL : un
+    producteur (n'importe quelle cellule) n'acquiert aucun verrou et ne
+    réveille le consommateur que si celui-ci attend. FIFO à priorité égale,
+    donc aucune comparaison entre messages.
+
+    Conçu pour un seul consommateur (le dispatcher du noyau).
+    """
+
+    def __init__(self):
+        # Index 0 = priorité 5 (la plus haute)
+        self._bands: tuple[deque[CellMessage], ...] = tuple(deque() for _ in range(5))
+        self._nonempty = threading.Event()
+
+    def put(self, message: CellMessage) -> None:
+        """Ajoute un message dans la bande de sa priorité."""
+        self._bands[5 - message.priority].append(message)
+        if not self._nonempty.is_set():
+            self._nonempty.set()
+
+    def get_nowait(self) -> CellMessage:
+        """Retire le message le plus prioritaire, ou lève `queue.Empty`."""
+        for band in self._bands:
+            if band:
+                try:
+                    return band.popleft()
+                except IndexError:
+                    continue
+        raise queue.Empty
+
+    def get(self, timeout: float | None = None) -> CellMessage:
+        """Comme `get_nowait`, mais attend au plus `timeout` secondes."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            self._nonempty.clear()
+            # Re-vérifie après clear() : un put() concurrent a pu voir l'Event
+            # encore levé et ne pas le relever.
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise queue.Empty
+            self._nonempty.wait(remaining)
+
+    def empty(self) -> bool:
+        return not any(self._bands)
+
+    def qsize(self) -> int:
+        return sum(len(band) for band in self._bands)
+
+
 class BiologicalCell:
     """
     Classe de base pour tous les modules cellulaires de BioCybe.
@@ -121,9 +344,20 @@ class BiologicalCell:
         self.logger = logging.getLogger(f"biocybe.{cell_type}.{name}")
         self.status = "initialized"
         self.active = False
-        self.message_queue = queue.PriorityQueue()
+        # Lots de messages remis par le dispatcher, traités par le worker
+        # (_SHUTDOWN = fin du worker, cf. stop())
+        self.message_queue = queue.SimpleQueue()
+        # La file n'accepte des lots que tant que le worker tourne : une fois
+        # sa file vidée à l'arrêt, les lots sont traités en ligne (cf. _enqueue)
+        self._queue_lock = threading.Lock()
+        self._accepting = False
         self.message_handlers = {}
+        # Types de messages gérés (utilisé par le noyau pour ne diffuser
+        # qu'aux cellules abonnées) ; rappel du noyau si la liste change
+        self.handled_types: frozenset[str] = frozenset()
+        self._handlers_changed: Callable[[], None] | None = None
         self._stop_event = threading.Event()
+        self._worker_thread: threading.Thread | None = None
         # Intervalle entre 2 itérations du worker thread (en secondes).
         # Défaut 1.0s = CPU idle négligeable. Une sous-classe qui doit
         # être plus réactive (par ex. b_cell qui dépile sa scan_queue
@@ -137,14 +371,9 @@ class BiologicalCell:
         self.tick_interval = float(self.config.get("tick_interval", 1.0))
 
         # Métriques et statistiques
-        self.stats = {
-            "messages_received": 0,
-            "messages_sent": 0,
-            "actions_performed": 0,
-            "last_activity": datetime.now(),
-        }
+        self.stats = CellStats()
 
-        self.logger.info(f"Cellule {self.cell_type} '{self.name}' initialisée")
+        self.logger.info("Cellule %s '%s' initialisée", self.cell_type, self.name)
 
     def register_message_handler(self, msg_type: str, handler: Callable):
         """
@@ -155,7 +384,10 @@ class BiologicalCell:
             handler: Fonction qui sera appelée avec le message comme paramètre
         """
         self.message_handlers[msg_type] = handler
-        self.logger.debug(f"Gestionnaire enregistré pour les messages de type '{msg_type}'")
+        self.handled_types = frozenset(self.message_handlers)
+        if self._handlers_changed is not None:
+            self._handlers_changed()
+        self.logger.debug("Gestionnaire enregistré pour les messages de type '%s'", msg_type)
 
     def handle_message(self, message: CellMessage):
         """
@@ -167,21 +399,42 @@ class BiologicalCell:
         Returns:
             bool: True si le message a été traité, False sinon
         """
-        self.stats["messages_received"] += 1
-        self.stats["last_activity"] = datetime.now()
+        self.stats.messages_received += 1
+        self.stats.last_activity = time.monotonic_ns()
+        return self._run_handler(message)
 
-        # Si un gestionnaire existe pour ce type de message, l'appeler
-        if message.msg_type in self.message_handlers:
-            try:
-                self.message_handlers[message.msg_type](message)
-                return True
-            except Exception as e:
-                self.logger.error(
-                    f"Erreur dans le gestionnaire de message '{message.msg_type}': {e}"
-                )
-                return False
-        else:
-            self.logger.warning(f"Pas de gestionnaire pour le message de type '{message.msg_type}'")
+    def handle_messages(self, messages: list[CellMessage]) -> int:
+        """
+        Traite un lot de messages destinés à cette cellule, dans l'ordre.
+
+        Les statistiques de réception ne sont mises à jour qu'une fois par lot.
+
+        Args:
+            messages: Messages à traiter
+
+        Returns:
+            int: Nombre de messages effectivement traités
+        """
+        self.stats.messages_received += len(messages)
+        self.stats.last_activity = time.monotonic_ns()
+        return sum(1 for message in messages if self._run_handler(message))
+
+    def _run_handler(self, message: CellMessage) -> bool:
+        """Appelle le gestionnaire enregistré pour le type du message."""
+        handler = self.message_handlers.get(message.msg_type)
+        if handler is None:
+            self.logger.warning(
+                "Pas de gestionnaire pour le message de type '%s'", message.msg_type
+            )
+            return False
+
+        try:
+            handler(message)
+            return True
+        except Exception as e:
+            self.logger.error(
+                "Erreur dans le gestionnaire de message '%s': %s", message.msg_type, e
+            )
             return False
 
     def send_message(
@@ -204,21 +457,107 @@ class BiologicalCell:
         self.logger.warning("Méthode send_message non implémentée (cellule non connectée au noyau)")
         return False
 
+    @property
+    def needs_worker(self) -> bool:
+        """
+        True si la cellule a une activité propre (`_process_cycle` ou
+        `_worker` surchargé). Une cellule purement réactive n'a pas de
+        thread : ses messages sont traités par le dispatcher du noyau.
+        """
+        cls = type(self)
+        return (
+            cls._process_cycle is not BiologicalCell._process_cycle
+            or cls._worker is not BiologicalCell._worker
+        )
+
     def start(self):
         """Démarre l'activité de la cellule"""
         if not self.active:
+            if self.needs_worker:
+                self._worker_thread = threading.Thread(target=self._worker, daemon=True)
+                self._accepting = True
             self.active = True
             self.status = "active"
-            self._worker_thread = threading.Thread(target=self._worker, daemon=True)
-            self._worker_thread.start()
-            self.logger.info(f"Cellule {self.cell_type} '{self.name}' démarrée")
+            if self._worker_thread is not None:
+                self._worker_thread.start()
+            self.logger.info("Cellule %s '%s' démarrée", self.cell_type, self.name)
 
     def stop(self):
         """Arrête l'activité de la cellule"""
-        if self.active:
+        if self.active and self._worker_thread is None:
+            # Cellule réactive : aucun thread à arrêter
+            self.active = False
+            self.status = "stopped"
+            self.logger.info("Cellule %s '%s' arrêtée", self.cell_type, self.name)
+        elif self.active:
+            # L'événement interrompt un _process_cycle en attente ; la
+            # sentinelle réveille le worker bloqué sur sa file
             self._stop_event.set()
+            self.message_queue.put(_SHUTDOWN)
             self.status = "stopping"
-            self.logger.info(f"Arrêt de la cellule {self.cell_type} '{self.name}' demandé")
+            self.logger.info("Arrêt de la cellule %s '%s' demandé", self.cell_type, self.name)
+
+    def _enqueue(self, messages: list[CellMessage]) -> bool:
+        """
+        Dépose un lot dans la file du worker.
+
+        Returns:
+            bool: False si le worker ne consomme plus sa file (arrêté ou en
+            cours d'arrêt) : l'appelant doit alors traiter le lot lui-même
+        """
+        with self._queue_lock:
+            if not self._accepting:
+                return False
+            self.message_queue.put(messages)
+            return True
+
+    def _pause(self, timeout: float) -> bool:
+        """
+        Attend `timeout` secondes en traitant les messages reçus entre-temps.
+
+        À utiliser dans `_process_cycle` à la place de `_stop_event.wait` :
+        les gestionnaires de la cellule restent réactifs pendant le pacing.
+
+        Returns:
+            bool: True si l'arrêt de la cellule a été demandé
+        """
+        deadline = time.monotonic() + timeout
+        while not self._stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                messages = self.message_queue.get(timeout=remaining)
+            except queue.Empty:
+                return False
+            if messages is not _SHUTDOWN:
+                self.handle_messages(messages)
+        return True
+
+    def _drain_queue(self):
+        """
+        Traite les lots déjà remis (dont system_stop) puis ferme la file du worker.
+
+        La file reste ouverte pendant la vidange : un lot remis entre-temps
+        passe derrière les autres. Elle n'est fermée, sous _queue_lock, qu'une
+        fois vide : le dispatcher ne traite en ligne qu'après le dernier lot
+        du worker, jamais en même temps ni dans le désordre.
+        """
+        while True:
+            try:
+                messages = self.message_queue.get_nowait()
+            except queue.Empty:
+                with self._queue_lock:
+                    if self.message_queue.empty():
+                        self._accepting = False
+                        return
+                continue
+            if messages is _SHUTDOWN:
+                continue
+            try:
+                self.handle_messages(messages)
+            except Exception as e:
+                self.logger.error("Erreur lors du traitement des messages: %s", e)
 
     def _worker(self):
         """
@@ -228,22 +567,37 @@ class BiologicalCell:
         self.logger.debug("Thread de travail démarré")
 
         try:
+            next_cycle = time.monotonic()
             while not self._stop_event.is_set():
-                # Logique spécifique à la cellule
-                # À implémenter dans les sous-classes
-                self._process_cycle()
-
-                # Sleep configurable (tick_interval). 1s par défaut.
-                # Interrompu immédiatement quand _stop_event est set.
-                self._stop_event.wait(self.tick_interval)
+                remaining = next_cycle - time.monotonic()
+                if remaining <= 0:
+                    # Logique spécifique à la cellule
+                    # À implémenter dans les sous-classes
+                    self._process_cycle()
+                    next_cycle = time.monotonic() + self.tick_interval
+                    continue
+
+                # Entre deux cycles (tick_interval, 1s par défaut), le thread
+                # dort sur sa file de messages : réveillé dès qu'un lot arrive
+                # ou que stop() est appelé, sans polling.
+                try:
+                    messages = self.message_queue.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+                if messages is _SHUTDOWN:
+                    break
+                self.handle_messages(messages)
 
         except Exception as e:
-            self.logger.error(f"Erreur dans le thread de travail: {e}")
+            self.logger.error("Erreur dans le thread de travail: %s", e)
 
         finally:
+            # Arrêt (éventuellement pendant un cycle) : plus aucun lot n'entre
+            # dans la file, ceux déjà remis sont traités avant de sortir
+            self._drain_queue()
             self.active = False
             self.status = "stopped"
-            self.logger.info(f"Cellule {self.cell_type} '{self.name}' arrêtée")
+            self.logger.info("Cellule %s '%s' arrêtée", self.cell_type, self.name)
 
     def _process_cycle(self):
         """
@@ -262,7 +616,7 @@ class BiologicalCell:
             "type": self.cell_type,
             "status": self.status,
             "active": self.active,
-            "stats": self.stats,
+            "stats": self.stats.to_dict(),
             "last_update": datetime.now().isoformat(),
         }
 
@@ -284,9 +638,16 @@ class BioCybeCore:
         self.config = self._load_config(config_path)
         self.cells = {}  # name -> cell instance
         self.cell_types = {}  # type -> [cells of that type]
-        self.message_bus = queue.PriorityQueue()
+        # (cible, source, type de message) -> destinataires ; rempli à la
+        # demande, vidé à chaque enregistrement de cellule ou de gestionnaire
+        self._recipients_cache: dict[tuple[str, str, str], tuple[BiologicalCell, ...]] = {}
+        self.message_bus = MessageBus()
         self.active = False
-        self._stop_event = threading.Event()
+        # Message dont stop() attend la distribution (cf. _dispatch_batch)
+        self._drain_marker: CellMessage | None = None
+        self._drained = threading.Event()
+        # (échéance monotonic, état) mis en cache par get_status
+        self._status_cache: tuple[float, dict] | None = None
 
         # Statistiques et métriques
         self.stats = {
@@ -298,7 +659,7 @@ class BioCybeCore:
 
         self.logger.info("Noyau BioCybe initialisé")
 
-    def _load_config(self, config_path: str) -> dict:
+    def _load_config(self, config_path: str) -> ChainMap:
         """
         Charge la configuration depuis un fichier YAML.
 
@@ -306,30 +667,16 @@ class BioCybeCore:
             config_path: Chemin vers le fichier de configuration
 
         Returns:
-            Dict: Configuration chargée ou configuration par défaut
+            ChainMap: Configuration chargée, complétée par _DEFAULT_CONFIG
         """
         try:
-            with open(config_path) as f:
-                config = yaml.safe_load(f)
-                self.logger.info(f"Configuration chargée depuis {config_path}")
-                return config
+            loaded = load_yaml_config(config_path)
+            self.logger.info("Configuration chargée depuis %s", config_path)
         except Exception as e:
-            self.logger.warning(f"Erreur lors du chargement de la configuration: {e}")
+            self.logger.warning("Erreur lors du chargement de la configuration: %s", e)
             self.logger.info("Utilisation de la configuration par défaut")
-            return {
-                "core": {"message_retention": 1000, "log_level": "INFO", "xai_enabled": True},
-                "cells": {
-                    "autoload": True,
-                    "enabled_types": [
-                        "macrophage",
-                        "b_cell",
-                        "t_cell",
-                        "nk_cell",
-                        "memory_cell",
-                        "barrier_cell",
-                    ],
-                },
-            }
+            loaded = None
+        return _with_default_config(loaded)
 
     def register_cell(self, cell: BiologicalCell) -> bool:
         """
@@ -341,8 +688,37 @@ class BioCybeCore:
         Returns:
             bool: True si la cellule a été enregistrée, False sinon
         """
+        if not self._attach_cell(cell):
+            return False
+        self.logger.info("Cellule %s '%s' enregistrée", cell.cell_type, cell.name)
+        return True
+
+    def register_cells(self, cells: Iterable[BiologicalCell]) -> int:
+        """
+        Enregistre un lot de cellules auprès du noyau.
+
+        Équivalent à `register_cell` en boucle, avec un seul message de log
+        pour le lot au lieu d'un par cellule.
+
+        Args:
+            cells: Cellules à enregistrer
+
+        Returns:
+            int: Nombre de cellules effectivement enregistrées
+        """
+        registered = [cell for cell in cells if self._attach_cell(cell)]
+        if registered and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "%d cellule(s) enregistrée(s) : %s",
+                len(registered),
+                ", ".join(f"{c.cell_type} '{c.name}'" for c in registered),
+            )
+        return len(registered)
+
+    def _attach_cell(self, cell: BiologicalCell) -> bool:
+        """Branche une cellule sur le bus et l'indexe (sans log de succès)."""
         if cell.name in self.cells:
-            self.logger.warning(f"Une cellule avec le nom '{cell.name}' est déjà enregistrée")
+            self.logger.warning("Une cellule avec le nom '%s' est déjà enregistrée", cell.name)
             return False
 
         # Injecter la méthode d'envoi de messages
@@ -355,26 +731,24 @@ class BioCybeCore:
                 payload=payload,
                 priority=priority,
             )
-            self.message_bus.put(
-                (6 - priority, message)
-            )  # Inversion priorité pour file prioritaire
-            cell.stats["messages_sent"] += 1
-            cell.stats["last_activity"] = datetime.now()
+            self.message_bus.put(message)
+            cell.stats.messages_sent += 1
+            cell.stats.last_activity = time.monotonic_ns()
             return True
 
         # Remplacer la méthode de la cellule
         cell.send_message = send_message_impl
+        cell._handlers_changed = self._recipients_cache.clear
 
         # Enregistrer la cellule
         self.cells[cell.name] = cell
 
         # Enregistrer par type
-        if cell.cell_type not in self.cell_types:
-            self.cell_types[cell.cell_type] = []
-        self.cell_types[cell.cell_type].append(cell.name)
+        self.cell_types.setdefault(cell.cell_type, []).append(cell.name)
+        self._recipients_cache.clear()
+        self._status_cache = None
 
         self.stats["cells_loaded"] += 1
-        self.logger.info(f"Cellule {cell.cell_type} '{cell.name}' enregistrée")
         return True
 
     def start(self):
@@ -389,16 +763,18 @@ class BioCybeCore:
             # Démarrer toutes les cellules
             for name, cell in self.cells.items():
                 cell.start()
+            self._status_cache = None
 
-            self.logger.info(f"Noyau BioCybe démarré avec {len(self.cells)} cellules")
+            self.logger.info("Noyau BioCybe démarré avec %d cellules", len(self.cells))
             # Envoyer un message de démarrage du système
             system_message = CellMessage(
                 msg_type="system_start",
                 source="core",
                 target="broadcast",
                 payload={"timestamp": datetime.now().isoformat()},
+                priority=5,
             )
-            self.message_bus.put((1, system_message))  # Haute priorité
+            self.message_bus.put(system_message)
 
     def stop(self):
         """Arrête le noyau BioCybe et toutes les cellules enregistrées"""
@@ -411,30 +787,34 @@ class BioCybeCore:
                 source="core",
                 target="broadcast",
                 payload={"timestamp": datetime.now().isoformat()},
+                priority=5,
             )
-            self.message_bus.put((1, system_message))  # Haute priorité
+            self._drained.clear()
+            self._drain_marker = system_message
+            self.message_bus.put(system_message)
 
-            # Attendre le traitement du message
-            import time
-
-            time.sleep(1)
+            # Attendre que le dispatcher l'ait distribué (borné à 1s)
+            if not self._drained.wait(timeout=SHUTDOWN_DRAIN_TIMEOUT):
+                self.logger.warning("Message d'arrêt non distribué dans le délai imparti")
+            self._drain_marker = None
 
             # Arrêter toutes les cellules
             for name, cell in self.cells.items():
                 cell.stop()
 
-            # Arrêter le thread de messages
-            self._stop_event.set()
+            # Arrêter le thread de messages (après ce qui est déjà en file)
+            self.message_bus.put(_SHUTDOWN)
 
             # Attendre que tous les threads se terminent
             for name, cell in self.cells.items():
-                if hasattr(cell, "_worker_thread") and cell._worker_thread.is_alive():
+                if cell._worker_thread is not None and cell._worker_thread.is_alive():
                     cell._worker_thread.join(timeout=5)
 
             if hasattr(self, "_message_thread") and self._message_thread.is_alive():
                 self._message_thread.join(timeout=5)
 
             self.active = False
+            self._status_cache = None
             self.logger.info("Noyau BioCybe arrêté")
 
     def _message_dispatcher(self):
@@ -445,35 +825,33 @@ class BioCybeCore:
         self.logger.debug("Dispatcher de messages démarré")
 
         try:
-            while not self._stop_event.is_set():
+            stopping = False
+            while not stopping:
                 try:
-                    # Récupérer un message de la file (avec timeout pour vérifier _stop_event)
-                    try:
-                        _priority, message = self.message_bus.get(timeout=0.5)
-                    except queue.Empty:
-                        continue
-
-                    # Traiter le message
-                    self._dispatch_message(message)
-
-                    # Marquer comme traité
-                    self.message_bus.task_done()
-                    self.stats["messages_processed"] += 1
-
-                    # Si c'est une alerte, la stocker
-                    if message.msg_type.startswith("alert_"):
-                        self.stats["last_alert"] = {
-                            "timestamp": message.timestamp,
-                            "type": message.msg_type,
-                            "source": message.source,
-                            "payload": message.payload,
-                        }
+                    # Attendre sans timeout (stop() dépose _SHUTDOWN dans le
+                    # bus), puis vider sans bloquer ce qui est déjà en file
+                    batch = []
+                    message = self.message_bus.get()
+                    while True:
+                        if message is _SHUTDOWN:
+                            stopping = True
+                            break
+                        batch.append(message)
+                        if len(batch) >= DISPATCH_BATCH_SIZE:
+                            break
+                        try:
+                            message = self.message_bus.get_nowait()
+                        except queue.Empty:
+                            break
+
+                    if batch:
+                        self._dispatch_batch(batch)
 
                 except Exception as e:
-                    self.logger.error(f"Erreur dans le dispatcher de messages: {e}")
+                    self.logger.error("Erreur dans le dispatcher de messages: %s", e)
 
         except Exception as e:
-            self.logger.error(f"Erreur critique dans le thread dispatcher: {e}")
+            self.logger.error("Erreur critique dans le thread dispatcher: %s", e)
 
         finally:
             self.logger.debug("Dispatcher de messages arrêté")
@@ -485,26 +863,112 @@ class BioCybeCore:
         Args:
             message: Message à distribuer
         """
-        # Déterminer les destinataires
-        if message.target == "broadcast":
-            # Message pour toutes les cellules
-            for name, cell in self.cells.items():
-                if name != message.source:  # Éviter de renvoyer à l'expéditeur
-                    cell.handle_message(message)
+        for cell in self._recipients(message):
+            self._deliver(cell, [message])
+
+    def _dispatch_batch(self, batch: list[CellMessage]):
+        """
+        Distribue un lot de messages en une passe.
+
+        Les messages sont regroupés par cellule destinataire (ordre d'arrivée
+        conservé pour chaque cellule), puis chaque cellule reçoit son lot en
+        un seul appel. Les statistiques du noyau sont mises à jour une fois.
+
+        Args:
+            batch: Messages extraits du bus, dans l'ordre de priorité
+        """
+        per_cell: dict[str, tuple[BiologicalCell, list[CellMessage]]] = {}
+        last_alert = None
+        recipients_of = self._recipients
+        for message in batch:
+            for cell in recipients_of(message):
+                entry = per_cell.get(cell.name)
+                if entry is None:
+                    per_cell[cell.name] = (cell, [message])
+                else:
+                    entry[1].append(message)
+            if message.is_alert:
+                last_alert = message
+
+        for cell, messages in per_cell.values():
+            try:
+                self._deliver(cell, messages)
+            except Exception as e:
+                self.logger.error(
+                    "Erreur lors de la distribution à la cellule %s: %s", cell.name, e
+                )
+
+        self.stats["messages_processed"] += len(batch)
+        marker = self._drain_marker
+        if marker is not None and marker in batch:
+            self._drained.set()
+        # Si le lot contient une alerte, stocker la plus récente
+        if last_alert is not None:
+            self.stats["last_alert"] = {
+                "timestamp": last_alert.timestamp,
+                "type": last_alert.msg_type,
+                "source": last_alert.source,
+                "payload": last_alert.payload,
+            }
+
+    @staticmethod
+    def _deliver(cell: BiologicalCell, messages: list[CellMessage]):
+        """
+        Remet un lot de messages à une cellule.
+
+        Une cellule active avec un thread de travail les reçoit dans sa file
+        et les traite dans ce thread ; une cellule réactive, arrêtée, en
+        cours d'arrêt (ou jamais démarrée) les traite immédiatement dans le
+        thread appelant.
+        """
+        if not cell._enqueue(messages):
+            cell.handle_messages(messages)
+
+    def _recipients(self, message: CellMessage) -> tuple[BiologicalCell, ...]:
+        """
+        Détermine les cellules destinataires d'un message.
+
+        Toutes les routes sont résolues une fois par (cible, source, type)
+        puis servies depuis le cache : le chemin courant se réduit à une
+        seule recherche dans un dict, sans analyse de la cible. Les listes
+        de diffusion ("broadcast" et "type:...") ne retiennent que les
+        cellules ayant un gestionnaire pour le type du message ; un message
+        adressé directement à une cellule lui est toujours remis.
+
+        Args:
+            message: Message à distribuer
 
-        elif message.target.startswith("type:"):
+        Returns:
+            tuple: Cellules destinataires (l'expéditeur est exclu des diffusions)
+        """
+        key = (message.target, message.source, message.msg_type)
+        recipients = self._recipients_cache.get(key)
+        if recipients is None:
+            recipients = self._resolve_recipients(*key)
+            if recipients is None:
+                self.logger.warning("Message destiné à une cellule inconnue: %s", key[0])
+                return ()
+            self._recipients_cache[key] = recipients
+        return recipients
+
+    def _resolve_recipients(
+        self, target: str, source: str, msg_type: str
+    ) -> tuple[BiologicalCell, ...] | None:
+        """Calcule les destinataires d'une cible (None si cellule inconnue)."""
+        if target == "broadcast":
+            # Message pour toutes les cellules, sauf l'expéditeur
+            candidates: Iterable[BiologicalCell] = self.cells.values()
+        elif target.startswith("type:"):
             # Message pour un type de cellule spécifique
-            target_type = message.target[5:]  # Enlever "type:"
-            if target_type in self.cell_types:
-                for cell_name in self.cell_types[target_type]:
-                    if cell_name != message.source:
-                        self.cells[cell_name].handle_message(message)
-
-        # Message pour une cellule spécifique
-        elif message.target in self.cells:
-            self.cells[message.target].handle_message(message)
+            target_type = target[5:]  # Enlever "type:"
+            candidates = (self.cells[name] for name in self.cell_types.get(target_type, ()))
         else:
-            self.logger.warning(f"Message destiné à une cellule inconnue: {message.target}")
+            # Message pour une cellule spécifique
+            cell = self.cells.get(target)
+            return None if cell is None else (cell,)
+        return tuple(
+            cell for cell in candidates if cell.name != source and msg_type in cell.handled_types
+        )
 
     def load_cells_from_modules(self, module_path: str = "biocybe.cells"):
         """
@@ -513,29 +977,69 @@ class BioCybeCore:
         Args:
             module_path: Chemin du package Python contenant les modules cellulaires
         """
-        self.logger.info(f"Chargement automatique des cellules depuis {module_path}")
+        self.logger.info("Chargement automatique des cellules depuis %s", module_path)
 
         try:
             package = importlib.import_module(module_path)
-            for _, name, is_pkg in pkgutil.iter_modules(package.__path__, package.__name__ + "."):
-                if is_pkg:
-                    try:
-                        cell_module = importlib.import_module(name)
-                        if hasattr(cell_module, "create_cells"):
-                            cells = cell_module.create_cells(self.config)
-                            for cell in cells:
-                                self.register_cell(cell)
-                    except Exception as e:
-                        self.logger.error(f"Erreur lors du chargement du module {name}: {e}")
+            names = [
+                name
+                for _, name, is_pkg in pkgutil.iter_modules(
+                    package.__path__, package.__name__ + "."
+                )
+                if is_pkg
+            ]
+            if not names:
+                return
+
+            # Imports et construction des cellules en parallèle (E/S disque
+            # au démarrage) ; l'enregistrement reste séquentiel, dans l'ordre
+            # de découverte des modules.
+            with ThreadPoolExecutor(
+                max_workers=min(8, len(names)), thread_name_prefix="biocybe-load"
+            ) as executor:
+                for cells in executor.map(self._build_cells_from_module, names):
+                    self.register_cells(cells)
+
+        except Exception as e:
+            self.logger.error("Erreur lors du chargement automatique des cellules: %s", e)
+
+    def _build_cells_from_module(self, name: str) -> list[BiologicalCell]:
+        """
+        Importe un module cellulaire et construit ses cellules (sans les enregistrer).
+
+        Args:
+            name: Nom complet du module
 
+        Returns:
+            list: Cellules créées par `create_cells`, vide en cas d'erreur
+        """
+        try:
+            cell_module = importlib.import_module(name)
+            if hasattr(cell_module, "create_cells"):
+                return list(cell_module.create_cells(self.config))
         except Exception as e:
-            self.logger.error(f"Erreur lors du chargement automatique des cellules: {e}")
+            self.logger.error("Erreur lors du chargement du module %s: %s", name, e)
+        return []
 
     def get_status(self) -> dict:
         """
         Retourne l'état actuel du noyau et de toutes les cellules.
         Utile pour le monitoring et le débogage.
+
+        L'état est reconstruit au plus toutes les STATUS_CACHE_TTL secondes
+        (ou après un enregistrement / démarrage / arrêt) ; entre-temps, des
+        appels rapprochés reçoivent une copie profonde du dernier état :
+        modifier un résultat ne touche ni le cache ni les appels suivants.
         """
+        now = time.monotonic()
+        cached = self._status_cache
+        if cached is None or now >= cached[0]:
+            cached = (now + STATUS_CACHE_TTL, self._build_status())
+            self._status_cache = cached
+        return copy.deepcopy(cached[1])
+
+    def _build_status(self) -> dict:
+        """Construit l'état complet du noyau et des cellules."""
         # État du noyau
         status = {
             "core": {
@@ -568,18 +1072,18 @@ class BioCybeCore:
             # Récupérer l'état actuel
             status = self.get_status()
 
-            # Sauvegarder dans le fichier — encoding UTF-8 + default=str
-            # pour les datetime non sérialisables nativement par json.
-            # (sinon json.dump plante : "Object of type datetime is not
-            # JSON serializable", détecté en daemon réel Phase VALIDATION).
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(status, f, indent=2, ensure_ascii=False, default=str)
+            # Sérialisé d'un bloc puis écrit en un seul write() dans un
+            # fichier temporaire renommé : un lecteur ne voit jamais d'état
+            # tronqué. default=str pour les objets non sérialisables
+            # nativement (sinon "Object of type ... is not JSON
+            # serializable", détecté en daemon réel Phase VALIDATION).
+            _write_atomic(file_path, _dumps_status(status))
 
-            self.logger.info(f"État du système sauvegardé dans {file_path}")
+            self.logger.info("État du système sauvegardé dans %s", file_path)
             return True
 
         except Exception as e:
-            self.logger.error(f"Erreur lors de la sauvegarde de l'état: {e}")
+            self.logger.error("Erreur lors de la sauvegarde de l'état: %s", e)
             return False
 
 
@@ -596,7 +1100,7 @@ if __name__ == "__main__":
     core = BioCybeCore(config_path)
 
     # Charger les cellules (si spécifié dans la configuration)
-    if core.config.get("cells", {}).get("autoload", True):
+    if core.config["cells"]["autoload"]:
         core.load_cells_from_modules()
 
     # Démarrer le système
@@ -605,8 +1109,6 @@ if __name__ == "__main__":
     try:
         # Maintenir le programme actif
         while core.active:
-            import time
-
             time.sleep(1)
 
     except KeyboardInterrupt:
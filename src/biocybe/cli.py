@@ -18,36 +18,25 @@ import signal
 import sys
 import threading
 import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import yaml
+from .config_loader import load_yaml_config
+from .log_setup import configure_logging
 
-from . import lymphocytes_b, macrophages
-from .biocybe_core import BioCybeCore
+if TYPE_CHECKING:
+    from .biocybe_core import BioCybeCore
 
 # Force UTF-8 sur stdout/stderr (Windows utilise cp1252 par défaut).
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
     sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        # encoding="utf-8" explicite : sinon Windows utilise cp1252 par
-        # défaut et casse les accents — donc logs illisibles dans un
-        # SIEM Linux qui s'attend à de l'UTF-8.
-        logging.FileHandler("biocybe.log", encoding="utf-8"),
-    ],
-)
+configure_logging()
 logger = logging.getLogger("biocybe.cli")
 
-# État global pour le daemon
-_core: BioCybeCore | None = None
-_running = True
-
 DEFAULT_CONFIG_PATH = "config/biocybe.yaml"
 
 _BANNER = """
@@ -64,8 +53,7 @@ Le système immunitaire numérique libre, modulaire et explicable.
 
 def _load_config(config_path: str) -> dict | None:
     try:
-        with open(config_path, encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+        config = load_yaml_config(config_path)
         logger.info("Configuration chargée depuis %s", config_path)
         return config
     except Exception as exc:
@@ -73,9 +61,63 @@ def _load_config(config_path: str) -> dict | None:
         return None
 
 
+_LOG_LEVELS = {
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.FATAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARNING,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+}
+
+
+# Attente maximale d'un tour de la boucle principale du daemon sous Windows
+# (secondes) ; ailleurs, la boucle dort jusqu'à la prochaine échéance
+DAEMON_WAIT_SLICE = 1.0
+
+
+@dataclass(frozen=True)
+class _CoreSettings:
+    """Section `core:` de la config, résolue une fois après le chargement.
+
+    Remplace les `config.get("core", {}).get(...)` répétés du daemon et
+    tolère `core:` vide dans le YAML (None au lieu d'un dict).
+    """
+
+    log_level: str = "INFO"
+    state_save_interval: float = 300.0
+    watch_directories: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        # Un intervalle nul ou négatif ferait tourner la boucle du daemon à vide
+        if not self.state_save_interval > 0:
+            raise ValueError(
+                f"core.state_save_interval doit être > 0 (reçu : {self.state_save_interval})"
+            )
+
+    @classmethod
+    def from_config(cls, config: dict) -> _CoreSettings:
+        core = config.get("core") or {}
+        raw_interval = core.get("state_save_interval", cls.state_save_interval)
+        # ValueError aussi pour une valeur vide (null) ou non numérique,
+        # que cmd_daemon rapporte comme configuration invalide
+        try:
+            interval = float(raw_interval)
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"core.state_save_interval doit être un nombre (reçu : {raw_interval!r})"
+            ) from None
+        return cls(
+            log_level=str(core.get("log_level", cls.log_level)),
+            state_save_interval=interval,
+            watch_directories=tuple(core.get("watch_directories") or ()),
+        )
+
+
 def _setup_logging_from_config(config: dict) -> None:
-    log_level_str = config.get("core", {}).get("log_level", "INFO")
-    log_level = getattr(logging, log_level_str.upper(), logging.INFO)
+    log_level_str = _CoreSettings.from_config(config).log_level
+    log_level = _LOG_LEVELS.get(str(log_level_str).upper(), logging.INFO)
     for handler in logging.root.handlers:
         handler.setLevel(log_level)
     logging.root.setLevel(log_level)
@@ -83,59 +125,58 @@ def _setup_logging_from_config(config: dict) -> None:
     logger.info("Niveau de journalisation défini à %s", log_level_str)
 
 
-def _handle_signal(signum, _frame) -> None:
-    global _running, _core
-    name = {signal.SIGINT: "SIGINT", signal.SIGTERM: "SIGTERM"}.get(signum, str(signum))
-    logger.info("Signal %s reçu, arrêt du système en cours...", name)
-    _running = False
-    if _core:
-        _core.stop()
+# Feuilles uniquement : makedirs crée les parents (db/, models/, rules/...).
+_REQUIRED_DIRECTORIES = (
+    "db/signatures/hashes",
+    "db/signatures/yara",
+    "db/memory",
+    "db/metrics",
+    "logs",
+    "quarantine",
+    "models/behavior",
+    "models/network",
+    "rules/firewall",
+    "rules/yara",
+    "templates/recovery",
+)
 
 
 def _create_required_directories() -> None:
-    for d in (
-        "db",
-        "db/signatures",
-        "db/signatures/hashes",
-        "db/signatures/yara",
-        "db/memory",
-        "db/metrics",
-        "logs",
-        "quarantine",
-        "models",
-        "models/behavior",
-        "models/network",
-        "rules",
-        "rules/firewall",
-        "rules/yara",
-        "templates",
-        "templates/recovery",
-    ):
+    missing = [d for d in _REQUIRED_DIRECTORIES if not os.path.isdir(d)]
+    if not missing:
+        logger.debug("Structure de répertoires déjà présente")
+        return
+    for d in missing:
         os.makedirs(d, exist_ok=True)
-    logger.info("Structure de répertoires créée")
+    logger.info("Structure de répertoires créée (%d dossier(s))", len(missing))
 
 
 def _init_core(config: dict) -> BioCybeCore | None:
+    from .biocybe_core import BioCybeCore
+
     try:
         core = BioCybeCore()
         if config.get("cells", {}).get("autoload", True):
             enabled = config.get("cells", {}).get("enabled_types", [])
+            # Imports paresseux : un type de cellule désactivé ne coûte ni
+            # temps de démarrage ni mémoire (psutil, yara, ...).
             if "macrophage" in enabled:
+                from . import macrophages
+
                 logger.info("Chargement des cellules Macrophages")
-                for cell in macrophages.create_cells(config):
-                    core.register_cell(cell)
+                core.register_cells(macrophages.create_cells(config))
             if "b_cell" in enabled:
+                from . import lymphocytes_b
+
                 logger.info("Chargement des cellules Lymphocytes B")
-                for cell in lymphocytes_b.create_cells(config):
-                    core.register_cell(cell)
+                core.register_cells(lymphocytes_b.create_cells(config))
             if "t_cell" in enabled:
                 # Import paresseux : sklearn n'est pas une dép core.
                 try:
                     from . import lymphocytes_t
 
                     logger.info("Chargement des cellules Lymphocytes T")
-                    for cell in lymphocytes_t.create_cells(config):
-                        core.register_cell(cell)
+                    core.register_cells(lymphocytes_t.create_cells(config))
                 except Exception as exc:  # MLDepsMissing ou autre
                     logger.warning(
                         "Lymphocytes T non chargés : %s. "
@@ -1972,15 +2013,30 @@ def cmd_quarantine_restore(args: argparse.Namespace) -> int:
 
 def cmd_daemon(args: argparse.Namespace) -> int:
     """Démarre le noyau et les cellules en continu jusqu'à Ctrl+C."""
-    global _core, _running
-
     config = _load_config(args.config)
     if not config:
         return 1
 
+    try:
+        settings = _CoreSettings.from_config(config)
+    except ValueError as exc:
+        logger.error("Configuration invalide : %s", exc)
+        return 1
     _setup_logging_from_config(config)
     _create_required_directories()
 
+    # État du daemon local à cet appel : le handler de signal le capture
+    # par closure. L'Event réveille la boucle principale immédiatement.
+    core: BioCybeCore | None = None
+    shutdown_event = threading.Event()
+
+    def _handle_signal(signum, _frame) -> None:
+        name = {signal.SIGINT: "SIGINT", signal.SIGTERM: "SIGTERM"}.get(signum, str(signum))
+        logger.info("Signal %s reçu, arrêt du système en cours...", name)
+        shutdown_event.set()
+        if core:
+            core.stop()
+
     signal.signal(signal.SIGINT, _handle_signal)
     if hasattr(signal, "SIGTERM"):
         signal.signal(signal.SIGTERM, _handle_signal)
@@ -2032,9 +2088,9 @@ def cmd_daemon(args: argparse.Namespace) -> int:
 
     # Watcher temps-réel — démarré AVANT le noyau pour une protection immédiate
     watcher = None
-    watch_dirs: list[str] = list(getattr(args, "watch", []) or [])
+    watch_dirs: list[str | Path] = list(getattr(args, "watch", []) or [])
     if not watch_dirs:
-        watch_dirs = config.get("core", {}).get("watch_directories", []) or []
+        watch_dirs = list(settings.watch_directories)
 
     rt_mode = "ALERT-ONLY"
     if watch_dirs:
@@ -2091,11 +2147,11 @@ def cmd_daemon(args: argparse.Namespace) -> int:
     # La protection fichiers/réseau est DÉJÀ active. On charge maintenant
     # les cellules d'analyse comportementale ; leur init lente n'impacte
     # plus la disponibilité de la protection.
-    _core = _init_core(config)
-    if not _core:
+    core = _init_core(config)
+    if not core:
         return 1
     logger.info("Démarrage du système BioCybe (cellules d'analyse)...")
-    _core.start()
+    core.start()
 
     # ---- Endpoint /metrics du daemon (observabilité runtime) ----
     metrics_server = _build_daemon_metrics_server(
@@ -2108,8 +2164,8 @@ def cmd_daemon(args: argparse.Namespace) -> int:
 
     print(_BANNER)
     print(f"Système démarré à {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Cellules actives : {len(_core.cells)}")
-    print(f"Types de cellules : {', '.join(_core.cell_types.keys())}")
+    print(f"Cellules actives : {len(core.cells)}")
+    print(f"Types de cellules : {', '.join(core.cell_types.keys())}")
     if watch_dirs:
         if args.watch_dry_run:
             rt_mode = "DRY-RUN"
@@ -2139,24 +2195,37 @@ def cmd_daemon(args: argparse.Namespace) -> int:
     print("Appuyez sur Ctrl+C pour arrêter le système")
 
     try:
-        interval = config.get("core", {}).get("state_save_interval", 300)
+        interval = settings.state_save_interval
         # Recharge les feeds IOC toutes les 5 min (peu coûteux : compare
         # un fingerprint des last_update.txt, ne relit que si changé).
         netmon_reload_interval = 300
-        last_save = time.time()
-        last_netmon_reload = time.time()
-        while _running:
-            now = time.time()
-            if now - last_save >= interval:
-                _core.save_status()
-                last_save = now
-            if netmon_service is not None and now - last_netmon_reload >= netmon_reload_interval:
+        next_save = time.monotonic() + interval
+        next_netmon_reload = time.monotonic() + netmon_reload_interval
+        # Dort jusqu'à la prochaine échéance OU jusqu'au signal d'arrêt. Sous
+        # Windows seulement, par tranches d'au plus DAEMON_WAIT_SLICE : Ctrl+C
+        # n'y est pas délivré au thread principal pendant un long Event.wait.
+        # Ailleurs, le handler de signal positionne l'Event et réveille la
+        # boucle : inutile de la réveiller chaque seconde.
+        slice_wait = sys.platform == "win32"
+        while True:
+            deadline = next_save
+            if netmon_service is not None:
+                deadline = min(deadline, next_netmon_reload)
+            remaining = max(0.0, deadline - time.monotonic())
+            if slice_wait:
+                remaining = min(remaining, DAEMON_WAIT_SLICE)
+            if shutdown_event.wait(timeout=remaining):
+                break
+            now = time.monotonic()
+            if now >= next_save:
+                core.save_status()
+                next_save = now + interval
+            if netmon_service is not None and now >= next_netmon_reload:
                 try:
                     netmon_service.maybe_reload()
                 except Exception as exc:
                     logger.error("netmon reload a échoué : %s", exc)
-                last_netmon_reload = now
-            time.sleep(1)
+                next_netmon_reload = now + netmon_reload_interval
     except Exception as exc:
         logger.error("Erreur dans la boucle principale : %s", exc)
     finally:
@@ -2169,9 +2238,9 @@ def cmd_daemon(args: argparse.Namespace) -> int:
             netmon_service.stop()
         if watcher is not None:
             watcher.stop()
-        if _core and _core.active:
+        if core and core.active:
             logger.info("Arrêt du système BioCybe...")
-            _core.stop()
+            core.stop()
         if notify_mgr is not None:
             try:
                 notify_mgr.shutdown(wait=False)
@@ -0,0 +1,106 @@
+"""Chargement du fichier de configuration YAML de BioCybe.
+
+Partagé par le CLI et le noyau :
+  - loader C (libyaml) quand PyYAML a été compilé avec : ~10x plus rapide
+    que le parser pur Python, repli transparent sinon ;
+  - cache JSON du YAML parsé, à côté du fichier source (json se parse
+    ~100x plus vite que YAML en Python, et sans désérialisation exécutable
+    comme pickle). Invalidé dès que mtime ou taille change ; toute anomalie
+    (cache absent, corrompu, dossier en lecture seule) retombe sur le parse
+    YAML.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - dépend du build PyYAML
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+# orjson (extra [perf]) : parse/sérialise le cache en C, sans dispatch
+# Python par clé. Repli stdlib json sinon.
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - dépend de l'extra installé
+    _orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger("biocybe.config")
+
+CONFIG_CACHE_SUFFIX = ".cache.json"
+
+
+def _json_loads(raw: bytes):
+    return _orjson.loads(raw) if _orjson is not None else json.loads(raw)
+
+
+def _json_dumps(obj) -> bytes:
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _read_config_cache(cache_path: str, fingerprint: tuple[int, int]) -> dict | None:
+    try:
+        with open(cache_path, "rb") as f:
+            data = _json_loads(f.read())
+        cached_fp = tuple(data["fingerprint"])
+        config = data["config"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if cached_fp != fingerprint or not isinstance(config, dict):
+        return None
+    return config
+
+
+def _write_config_cache(cache_path: str, fingerprint: tuple[int, int], config: dict) -> None:
+    try:
+        payload = _json_dumps({"fingerprint": list(fingerprint), "config": config})
+    except (TypeError, ValueError):
+        return  # types YAML sans équivalent JSON : pas de cache
+    if _json_loads(payload)["config"] != config:
+        return  # clés non-str (`443:`), dates... : relus différemment, on s'abstient
+    cache_dir = os.path.dirname(cache_path) or "."
+    try:
+        # mkstemp crée le fichier en 0o600 ; os.replace = jamais de cache tronqué
+        fd, tmp = tempfile.mkstemp(prefix=".config-cache-", dir=cache_dir)
+    except OSError as exc:
+        logger.debug("Cache config non écrit (%s) : %s", cache_path, exc)
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, cache_path)
+    except Exception as exc:
+        logger.debug("Cache config non écrit (%s) : %s", cache_path, exc)
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def load_yaml_config(config_path: str) -> Any:
+    """Charge `config_path` (YAML), depuis le cache JSON quand il est à jour.
+
+    Lève l'exception d'origine (OSError, yaml.YAMLError) si le fichier est
+    absent ou invalide : à l'appelant de choisir le repli.
+    """
+    st = os.stat(config_path)
+    fingerprint = (st.st_mtime_ns, st.st_size)
+    cache_path = config_path + CONFIG_CACHE_SUFFIX
+    config = _read_config_cache(cache_path, fingerprint)
+    if config is None:
+        with open(config_path, encoding="utf-8") as f:
+            config = yaml.load(f, Loader=_YamlLoader)
+        if isinstance(config, dict):
+            _write_config_cache(cache_path, fingerprint, config)
+    return config
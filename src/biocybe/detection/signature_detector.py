@@ -6,16 +6,25 @@ Fonctionne comme les anticorps du système immunitaire en identifiant
 des signatures spécifiques de malwares.
 """
 
+import functools
 import hashlib
 import json
 import logging
+import math
 import os
-import queue
+import sqlite3
+import stat
+import tempfile
 import threading
-from datetime import datetime, timedelta
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # python-magic (libmagic) est dans l'extra [fileanalysis], pas en core.
 # Import optionnel : ce module héritage n'est pas branché au pipeline
@@ -30,10 +39,199 @@ except ImportError:
     _MAGIC_AVAILABLE = False
 import yara
 
+from ..severity import severity_rank
+
+# numpy (extra [ml]) : histogramme des octets en un appel C vectorisé.
+# Repli sur Counter (boucle C également, mais plus lente) sinon.
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'extra installé
+    np = None  # type: ignore[assignment]
+
 # Configuration du logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Taille des blocs lus pour le hachage et l'entropie : la mémoire par scan
+# reste bornée quelle que soit la taille du fichier.
+READ_CHUNK_SIZE = 1 << 20
+
+# Contextes de hachage vierges, copiés pour chaque fichier : copy() duplique
+# l'état interne sans repasser par la résolution de l'algorithme côté
+# OpenSSL (~2x moins cher que hashlib.sha256()). Jamais mis à jour, donc
+# partageables entre threads sans threading.local.
+_MD5_SEED = hashlib.md5()
+_SHA256_SEED = hashlib.sha256()
+
+# Cache des résultats de scan : LRU borné, entrées valables RESULTS_CACHE_TTL
+# secondes. La clé inclut mtime et taille : un fichier modifié est réanalysé.
+RESULTS_CACHE_SIZE = 10_000
+RESULTS_CACHE_TTL = 600.0
+
+# Règles « en-tête » : placées dans ce sous-dossier du répertoire de règles,
+# elles ne testent que les HEADER_SCAN_SIZE premiers octets (magic, offsets
+# fixes, `$x at 0`). Elles sont appliquées à ce seul tampon ; `filesize` y
+# vaut donc la taille du tampon, pas celle du fichier.
+HEADER_RULES_DIR = "header"
+HEADER_SCAN_SIZE = 64 * 1024
+
+# Règles compilées conservées dans la base de signatures, sous un nom dérivé
+# du répertoire de règles puis de l'empreinte des sources
+# (rules_<répertoire>_<sources>.yarc) : rechargées par yara.load() (quelques
+# ms) tant que les fichiers de règles et la version de yara ne changent pas.
+# Le nettoyage ne touche que les caches du même répertoire de règles.
+RULES_CACHE_PREFIX = "rules_"
+RULES_CACHE_SUFFIX = ".yarc"
+
+# Parcours du répertoire de règles : dossiers lus en parallèle (utile sur
+# cache froid ou montage réseau, où chaque readdir est un aller-retour).
+RULES_WALK_WORKERS = 8
+
+# VirusTotal : nouvelles tentatives (backoff exponentiel) sur erreur serveur
+# ou coupure réseau. Le 204 de quota dépassé de l'API publique n'est pas rejoué.
+VIRUSTOTAL_URL = "https://www.virustotal.com/vtapi/v2/file/report"
+VIRUSTOTAL_RETRIES = 3
+
+# Analyses soumises mais pas terminées, par thread du pool : au-delà,
+# scan_file() bloque l'appelant (la file interne du pool est non bornée).
+SCAN_BACKLOG_PER_WORKER = 4
+
+# scan_files : en dessous de ce nombre de fichiers, le coût de répartition
+# sur le pool dépasse le gain, le lot est analysé dans le thread appelant.
+PARALLEL_BATCH_MIN = 8
+
+
+def _iter_file_chunks(f):
+    """Parcourt le fichier ouvert `f` par tranches de READ_CHUNK_SIZE octets.
+
+    Les tranches sont lues par readinto() dans un tampon unique réutilisé : pas
+    d'allocation ni de copie par bloc. Contrairement à une projection mmap, un
+    fichier tronqué pendant l'analyse ne provoque pas de SIGBUS (qui tuerait
+    le processus) et le fichier n'est pas verrouillé (suppression et mise en
+    quarantaine possibles sous Windows). Chaque tranche est une vue valable
+    jusqu'à la suivante.
+    """
+    buffer = bytearray(READ_CHUNK_SIZE)
+    with memoryview(buffer) as view:
+        while n := f.readinto(view):
+            with view[:n] as chunk:
+                yield chunk
+
+
+def _scan_rules_dir(path):
+    """Lit un dossier : (fichiers de règles, sous-dossiers à parcourir)"""
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.is_symlink():  # comme os.walk : liens non suivis
+                        subdirs.append(entry.path)
+                elif entry.name.endswith((".yar", ".yara")):
+                    files.append(entry.path)
+    except OSError as e:
+        logger.warning(f"Dossier de règles illisible ({path}): {e}")
+    return files, subdirs
+
+
+def _find_rule_files(rules_path):
+    """Liste les fichiers .yar/.yara sous `rules_path`, dossiers lus en parallèle"""
+    rule_files = []
+    with ThreadPoolExecutor(
+        max_workers=RULES_WALK_WORKERS, thread_name_prefix="rules-walk"
+    ) as pool:
+        pending = {pool.submit(_scan_rules_dir, rules_path)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                rule_files.extend(files)
+                pending.update(pool.submit(_scan_rules_dir, d) for d in subdirs)
+    return sorted(rule_files)
+
+
+def _rules_fingerprint(rule_files) -> str:
+    """Empreinte des sources de règles : chemins triés, tailles, mtimes, version yara"""
+    h = hashlib.sha256()
+    h.update(f"yara_version={yara.__version__}\n".encode())
+    for path in sorted(rule_files):
+        st = os.stat(path)
+        h.update(f"{path}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def _rules_cache_prefix(rules_path) -> str:
+    """Préfixe des caches compilés d'un répertoire de règles (empreinte du chemin absolu)"""
+    digest = hashlib.sha256(os.path.abspath(rules_path).encode()).hexdigest()[:16]
+    return f"{RULES_CACHE_PREFIX}{digest}_"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_or_compile_rules(cache_path, rule_files):
+    """Règles compilées pour `rule_files`, partagées dans tout le processus.
+
+    `cache_path` contient l'empreinte des sources : la clé change dès qu'une
+    règle est modifiée. Tant qu'elle est stable, tous les détecteurs du
+    processus partagent le même automate (yara autorise des match()
+    concurrents sur un même objet Rules). Chargé depuis le cache disque
+    s'il existe, sinon compilé puis sauvegardé.
+    """
+    if os.path.isfile(cache_path):
+        try:
+            return yara.load(cache_path)
+        except yara.Error as e:
+            logger.warning(f"Cache de règles YARA illisible ({e}), recompilation")
+
+    filepaths = {f"rule_{i}": path for i, path in enumerate(rule_files)}
+    rules = yara.compile(filepaths=filepaths)
+    try:
+        # Fichier temporaire + os.replace : jamais de cache tronqué
+        fd, tmp = tempfile.mkstemp(prefix=".rules-", dir=os.path.dirname(cache_path))
+        os.close(fd)
+    except OSError as e:
+        logger.warning(f"Sauvegarde du cache de règles YARA échouée: {e}")
+        return rules
+    try:
+        rules.save(tmp)
+        os.replace(tmp, cache_path)
+    except (OSError, yara.Error) as e:
+        logger.warning(f"Sauvegarde du cache de règles YARA échouée: {e}")
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+    return rules
+
+
+class _ByteHistogram:
+    """Histogramme des 256 valeurs d'octet, alimenté bloc par bloc."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts = np.zeros(256, dtype=np.int64) if np is not None else Counter()
+
+    def update(self, chunk):
+        if np is not None:
+            self.counts += np.bincount(np.frombuffer(chunk, dtype=np.uint8), minlength=256)
+        else:
+            self.counts.update(chunk)
+
+    def entropy(self) -> float:
+        """Entropie de Shannon (bits par octet, entre 0 et 8)."""
+        if np is not None:
+            total = int(self.counts.sum())
+            if not total:
+                return 0.0
+            probs = self.counts[self.counts > 0] / total
+            return float(-(probs * np.log2(probs)).sum())
+        total = sum(self.counts.values())
+        entropy = 0.0
+        for count in self.counts.values():
+            probability = count / total
+            entropy -= probability * math.log2(probability)
+        return entropy
+
 
 class SignatureResult:
     """Classe représentant le résultat d'une analyse de signatures"""
@@ -67,92 +265,154 @@ class SignatureResult:
         }
 
 
+_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (hash TEXT PRIMARY KEY, info TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS yara_rules (name TEXT PRIMARY KEY, info TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def _dumps_info(info):
+    return json.dumps(info, separators=(",", ":"))
+
+
 class SignatureDatabase:
-    """Gère la base de données de signatures (analogue à la mémoire immunitaire)"""
+    """Gère la base de données de signatures (analogue à la mémoire immunitaire)
+
+    Stockage SQLite (`signatures.db`) : chaque ajout est une écriture
+    atomique d'une ligne, chaque vérification une recherche sur clé
+    primaire. Plus de réécriture complète d'un gros JSON à la sauvegarde.
+
+    La connexion est partagée par les threads d'analyse : toute utilisation
+    (lectures comprises) passe par `update_lock`, un objet Connection
+    sqlite3 n'étant pas sûr en accès concurrent.
+    """
+
+    DB_FILE = "signatures.db"
 
     def __init__(self, db_path="db/signatures"):
         self.db_path = db_path
-        self.signatures = {}  # hash -> info
-        self.yara_rules = {}  # rule_name -> info
         self.last_update = None
         self.update_lock = threading.Lock()
 
         # Création du répertoire si nécessaire
         os.makedirs(db_path, exist_ok=True)
 
+        sqlite_path = os.path.join(db_path, self.DB_FILE)
+        is_new = not os.path.exists(sqlite_path)
+        self._conn = sqlite3.connect(sqlite_path, check_same_thread=False, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self.update_lock:
+            self._conn.executescript(_DB_SCHEMA)
+            self._conn.commit()
+
         # Chargement initial
+        if is_new:
+            self._import_legacy_json()
         self.load_database()
 
-    def load_database(self):
-        """Charge la base de données depuis le disque"""
+    def _import_legacy_json(self):
+        """Importe les anciens fichiers JSON dans une base SQLite neuve"""
         try:
             sig_path = os.path.join(self.db_path, "hash_signatures.json")
             if os.path.exists(sig_path):
                 with open(sig_path) as f:
-                    self.signatures = json.load(f)
-                logger.info(f"Chargement de {len(self.signatures)} signatures hash")
+                    self.add_hash_signatures(json.load(f))
 
             yara_path = os.path.join(self.db_path, "yara_info.json")
             if os.path.exists(yara_path):
                 with open(yara_path) as f:
-                    self.yara_rules = json.load(f)
-                logger.info(
-                    f"Chargement de {len(self.yara_rules)} informations sur les règles YARA"
-                )
+                    rules = json.load(f)
+                with self.update_lock, self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO yara_rules (name, info) VALUES (?, ?)",
+                        ((name, _dumps_info(info)) for name, info in rules.items()),
+                    )
 
-            # Dernière mise à jour
             update_path = os.path.join(self.db_path, "last_update.txt")
             if os.path.exists(update_path):
                 with open(update_path) as f:
-                    self.last_update = datetime.fromisoformat(f.read().strip())
+                    self._set_meta("last_update", f.read().strip())
+        except Exception as e:
+            logger.error(f"Erreur lors de l'import des signatures JSON: {e}")
+
+    def load_database(self):
+        """Charge les métadonnées de la base (les signatures restent sur disque)"""
+        try:
+            row = self._fetchone("SELECT value FROM meta WHERE key = 'last_update'")
+            if row:
+                self.last_update = datetime.fromisoformat(row[0])
                 logger.info(f"Dernière mise à jour: {self.last_update}")
         except Exception as e:
             logger.error(f"Erreur lors du chargement de la base de données: {e}")
 
-    def save_database(self):
-        """Sauvegarde la base de données sur le disque"""
-        try:
-            # Sauvegarde des signatures hash
-            sig_path = os.path.join(self.db_path, "hash_signatures.json")
-            with open(sig_path, "w") as f:
-                json.dump(self.signatures, f, indent=2)
+    def _fetchone(self, sql, params=()):
+        """Exécute une requête de lecture sous le verrou de la connexion"""
+        with self.update_lock:
+            return self._conn.execute(sql, params).fetchone()
 
-            # Sauvegarde des infos YARA
-            yara_path = os.path.join(self.db_path, "yara_info.json")
-            with open(yara_path, "w") as f:
-                json.dump(self.yara_rules, f, indent=2)
+    def _set_meta(self, key, value):
+        with self.update_lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
 
-            # Dernière mise à jour
-            update_path = os.path.join(self.db_path, "last_update.txt")
+    def save_database(self):
+        """Enregistre la date de mise à jour (les ajouts sont déjà persistés)"""
+        try:
             self.last_update = datetime.now()
-            with open(update_path, "w") as f:
-                f.write(self.last_update.isoformat())
-
+            self._set_meta("last_update", self.last_update.isoformat())
             logger.info("Base de données de signatures sauvegardée")
         except Exception as e:
             logger.error(f"Erreur lors de la sauvegarde de la base de données: {e}")
 
+    def close(self):
+        """Ferme la connexion SQLite"""
+        with self.update_lock:
+            self._conn.close()
+
     def add_hash_signature(self, file_hash, info):
         """Ajoute une signature hash à la base de données"""
-        with self.update_lock:
-            self.signatures[file_hash] = info
+        with self.update_lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hashes (hash, info) VALUES (?, ?)",
+                (file_hash, _dumps_info(info)),
+            )
+
+    def add_hash_signatures(self, signatures):
+        """Ajoute un lot de signatures hash (hash -> info) en une transaction"""
+        with self.update_lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO hashes (hash, info) VALUES (?, ?)",
+                ((file_hash, _dumps_info(info)) for file_hash, info in signatures.items()),
+            )
 
     def add_yara_rule_info(self, rule_name, info):
         """Ajoute des informations sur une règle YARA"""
-        with self.update_lock:
-            self.yara_rules[rule_name] = info
+        with self.update_lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO yara_rules (name, info) VALUES (?, ?)",
+                (rule_name, _dumps_info(info)),
+            )
+
+    def has_hash_signatures(self):
+        """Indique si la base contient au moins une signature hash"""
+        return self._fetchone("SELECT 1 FROM hashes LIMIT 1") is not None
 
     def check_hash(self, file_hash):
         """Vérifie si un hash est dans la base de données"""
-        return file_hash in self.signatures
+        return self._fetchone("SELECT 1 FROM hashes WHERE hash = ?", (file_hash,)) is not None
 
     def get_hash_info(self, file_hash):
         """Récupère les informations associées à un hash"""
-        return self.signatures.get(file_hash, None)
+        row = self._fetchone("SELECT info FROM hashes WHERE hash = ?", (file_hash,))
+        return json.loads(row[0]) if row else None
 
     def get_yara_rule_info(self, rule_name):
         """Récupère les informations associées à une règle YARA"""
-        return self.yara_rules.get(rule_name, None)
+        row = self._fetchone("SELECT info FROM yara_rules WHERE name = ?", (rule_name,))
+        return json.loads(row[0]) if row else None
 
     def update_from_external(self, api_key=None, source="virustotal"):
         """Met à jour la base de données depuis une source externe"""
@@ -169,6 +429,13 @@ class SignatureDetector:
         """Initialisation du détecteur de signatures"""
         self.config = self._load_config(config_path)
         self.rules = None
+        self.rules_header = None
+        # (namespace, règle) -> métadonnées, un cache par jeu compilé : un
+        # seul dict par règle, partagé par tous les résultats (lecture seule)
+        # au lieu d'une copie par correspondance. Chaque fichier de règles a
+        # son namespace (rule_N) : deux règles homonymes ne se confondent pas.
+        self._rule_meta = {}
+        self._header_rule_meta = {}
         self.db = SignatureDatabase()
         self.external_apis = {}
 
@@ -178,13 +445,23 @@ class SignatureDetector:
         # Configuration des API externes
         self._setup_external_apis()
 
-        # File d'attente pour les analyses
-        self.scan_queue = queue.Queue()
-        self.results_cache = {}  # path -> result
-
-        # Démarrage du thread de scan
-        self.scan_thread = threading.Thread(target=self._scan_worker, daemon=True)
-        self.scan_thread.start()
+        # Pool borné d'analyses : yara (match) et hashlib relâchent le GIL,
+        # les scans progressent donc réellement en parallèle sur N cœurs.
+        workers = self.config.get("signatures", {}).get("scan_workers") or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="signature-scan")
+        self._backlog = threading.BoundedSemaphore(workers * SCAN_BACKLOG_PER_WORKER)
+        # Session HTTP partagée par les threads d'analyse : connexions TLS
+        # réutilisées vers VirusTotal (une poignée de main par connexion du
+        # pool, pas une par fichier).
+        self._vt_session = self._make_http_session(workers)
+        # (path, mtime_ns, size) -> (expiration monotonic, result), ordre LRU
+        self.results_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # libmagic : une instance par thread d'analyse (un handle magic n'est
+        # pas thread-safe), créée au premier usage puis réutilisée. Instancier
+        # Magic recharge toute la base magic (plusieurs Mo).
+        self._magic_tls = threading.local()
 
     def _load_config(self, config_path):
         """Charge la configuration depuis un fichier YAML"""
@@ -205,10 +482,7 @@ class SignatureDetector:
             # Liste des fichiers de règles
             rule_files = []
             if os.path.isdir(rules_path):
-                for root, _, files in os.walk(rules_path):
-                    for file in files:
-                        if file.endswith((".yar", ".yara")):
-                            rule_files.append(os.path.join(root, file))
+                rule_files = _find_rule_files(rules_path)
             elif os.path.exists(rules_path) and rules_path.endswith((".yar", ".yara")):
                 rule_files.append(rules_path)
 
@@ -216,14 +490,74 @@ class SignatureDetector:
                 logger.warning(f"Aucun fichier de règles YARA trouvé dans {rules_path}")
                 return
 
-            # Compilation des règles
-            filepaths = {f"rule_{i}": path for i, path in enumerate(rule_files)}
-            self.rules = yara.compile(filepaths=filepaths)
+            # Compilation en deux jeux : règles d'en-tête et règles complètes
+            header_prefix = os.path.join(rules_path, HEADER_RULES_DIR) + os.sep
+            header_files = [p for p in rule_files if p.startswith(header_prefix)]
+            full_files = [p for p in rule_files if not p.startswith(header_prefix)]
+            cache_prefix = _rules_cache_prefix(rules_path)
+            self.rules_header = self._compile_rule_files(cache_prefix, header_files)
+            self.rules = self._compile_rule_files(cache_prefix, full_files)
+            self._rule_meta = {}
+            self._header_rule_meta = {}
+            self._prune_rules_cache(cache_prefix, header_files, full_files)
 
             logger.info(f"Chargement de {len(rule_files)} fichiers de règles YARA")
         except Exception as e:
             logger.error(f"Erreur lors du chargement des règles YARA: {e}")
 
+    def _rules_cache_path(self, cache_prefix, rule_files):
+        """Chemin du cache compilé correspondant à un jeu de fichiers de règles"""
+        name = f"{cache_prefix}{_rules_fingerprint(rule_files)}{RULES_CACHE_SUFFIX}"
+        return os.path.join(self.db.db_path, name)
+
+    def _compile_rule_files(self, cache_prefix, rule_files):
+        """Compile une liste de fichiers de règles (None si elle est vide)"""
+        if not rule_files:
+            return None
+        return _load_or_compile_rules(
+            self._rules_cache_path(cache_prefix, rule_files), tuple(rule_files)
+        )
+
+    def _prune_rules_cache(self, cache_prefix, *rule_sets):
+        """Supprime les caches compilés obsolètes de ce répertoire de règles
+
+        Les caches d'autres répertoires de règles partageant la même base de
+        signatures (préfixe différent) ne sont pas touchés.
+        """
+        keep = {
+            os.path.basename(self._rules_cache_path(cache_prefix, files))
+            for files in rule_sets
+            if files
+        }
+        for entry in os.scandir(self.db.db_path):
+            name = entry.name
+            if (
+                name.startswith(cache_prefix)
+                and name.endswith(RULES_CACHE_SUFFIX)
+                and name not in keep
+            ):
+                try:
+                    os.unlink(entry.path)
+                except OSError as e:
+                    logger.debug(f"Cache de règles obsolète non supprimé ({name}): {e}")
+
+    def _match_yara(self, file_path):
+        """Applique les règles YARA : l'en-tête d'abord, le fichier complet si besoin
+
+        Retourne les correspondances et le cache de métadonnées du jeu de
+        règles qui les a produites.
+        """
+        if self.rules_header is not None:
+            with open(file_path, "rb") as f:
+                header = f.read(HEADER_SCAN_SIZE)
+            matches = self.rules_header.match(data=header)
+            if matches:
+                # décisif : inutile de parcourir tout le fichier
+                return matches, self._header_rule_meta
+        if self.rules is not None:
+            return self.rules.match(file_path), self._rule_meta
+        return [], self._rule_meta
+
     def _setup_external_apis(self):
         """Configure les API externes pour la vérification de fichiers"""
         api_configs = self.config.get("signatures", {}).get("external_sources", {})
@@ -236,51 +570,96 @@ class SignatureDetector:
                 }
                 logger.info(f"API externe configurée: {api_name}")
 
-    def _scan_worker(self):
-        """Thread travailleur pour traiter la file d'attente d'analyses"""
-        while True:
-            try:
-                # Récupération d'une tâche
-                task = self.scan_queue.get()
-                if task is None:
-                    break
-
-                file_path, callback = task
-
-                # Analyse du fichier
-                result = self._scan_file_internal(file_path)
+    def _cache_get(self, key):
+        """Retourne le résultat en cache pour `key`, ou None s'il est absent/expiré"""
+        with self._cache_lock:
+            entry = self.results_cache.get(key)
+            if entry is None:
+                return None
+            expires, result = entry
+            if expires <= time.monotonic():
+                del self.results_cache[key]
+                return None
+            self.results_cache.move_to_end(key)
+            return result
 
-                # Cache du résultat
-                self.results_cache[file_path] = result
+    def _cache_put(self, key, result):
+        """Met un résultat en cache en évinçant les entrées les moins récentes"""
+        with self._cache_lock:
+            self.results_cache[key] = (time.monotonic() + RESULTS_CACHE_TTL, result)
+            self.results_cache.move_to_end(key)
+            while len(self.results_cache) > RESULTS_CACHE_SIZE:
+                self.results_cache.popitem(last=False)
 
-                # Appel du callback si fourni
-                if callback:
-                    callback(result)
+    def _scan_and_cache(self, file_path, key):
+        """Analyse un fichier depuis le pool et met le résultat en cache
 
-                # Marquer la tâche comme terminée
-                self.scan_queue.task_done()
-            except Exception as e:
-                logger.error(f"Erreur dans le thread de scan: {e}")
+        Un résultat en erreur n'est pas mis en cache : l'analyse suivante du
+        même fichier est retentée.
+        """
+        result = self._scan_file_internal(file_path)
+        if key is not None and "error" not in result.metadata:
+            self._cache_put(key, result)
+        return result
+
+    @staticmethod
+    def _notify(callback, future):
+        """Transmet le résultat d'une analyse terminée au callback"""
+        try:
+            callback(future.result())
+        except Exception as e:
+            logger.error(f"Erreur dans le callback de scan: {e}")
 
     def scan_file(self, file_path, callback=None):
         """
-        Analyse un fichier de manière asynchrone.
+        Analyse un fichier de manière asynchrone et retourne un Future.
         Si callback est fourni, il sera appelé avec le résultat.
+        Bloque tant que le pool a déjà SCAN_BACKLOG_PER_WORKER analyses en
+        cours ou en attente par thread (contre-pression sur le producteur).
         """
-        # Vérifier si le résultat est dans le cache
-        if file_path in self.results_cache:
-            if (datetime.now() - self.results_cache[file_path].scan_time) < timedelta(minutes=10):
-                if callback:
-                    callback(self.results_cache[file_path])
-                return self.results_cache[file_path]
-
-        # Ajouter à la file d'attente
-        self.scan_queue.put((file_path, callback))
+        # Vérifier si le résultat est dans le cache (même fichier, même version)
+        try:
+            stats = os.stat(file_path)
+            key = (file_path, stats.st_mtime_ns, stats.st_size)
+        except OSError:
+            key = None  # l'analyse rapportera l'erreur, rien à mettre en cache
+        cached = self._cache_get(key) if key is not None else None
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+        else:
+            future = self._submit(self._scan_and_cache, file_path, key)
+        if callback:
+            future.add_done_callback(lambda f: self._notify(callback, f))
+        return future
 
     def scan_file_sync(self, file_path):
         """Analyse un fichier de manière synchrone et retourne le résultat"""
         return self._scan_file_internal(file_path)
 
+    def scan_files(self, file_paths):
+        """
+        Analyse un lot de fichiers de manière synchrone.
+        Retourne les résultats dans l'ordre de `file_paths` ; les lots d'au
+        moins PARALLEL_BATCH_MIN fichiers sont répartis sur le pool.
+        """
+        file_paths = list(file_paths)
+        if len(file_paths) < PARALLEL_BATCH_MIN:
+            return [self._scan_file_internal(path) for path in file_paths]
+        futures = [self._submit(self._scan_file_internal, path) for path in file_paths]
+        return [future.result() for future in futures]
+
+    def _submit(self, fn, *args):
+        """Soumet une analyse au pool, en bloquant si le backlog est plein"""
+        self._backlog.acquire()
+        try:
+            future = self._pool.submit(fn, *args)
+        except BaseException:
+            self._backlog.release()
+            raise
+        future.add_done_callback(lambda _f: self._backlog.release())
+        return future
+
     def _scan_file_internal(self, file_path):
         """Effectue l'analyse complète d'un fichier"""
         # Initialisation du résultat
@@ -288,16 +667,20 @@ class SignatureDetector:
         result.scan_time = datetime.now()
 
         try:
-            # Vérification de l'existence du fichier
-            if not os.path.exists(file_path) or not os.path.isfile(file_path):
-                raise FileNotFoundError(f"Le fichier n'existe pas: {file_path}")
+            # Vérification de l'existence du fichier : un seul stat, réutilisé
+            # pour les informations du fichier (FileNotFoundError si absent)
+            stats = os.stat(file_path)
+            if not stat.S_ISREG(stats.st_mode):
+                raise ValueError(f"Pas un fichier régulier: {file_path}")
 
-            # Collecte d'informations sur le fichier
-            file_info = self._get_file_info(file_path)
+            # Informations de base et md5 d'abord (md5 absent si la base n'a
+            # pas de signatures de hash)
+            file_info = self._basic_file_info(file_path, stats)
             result.file_info = file_info
 
-            # Vérification du hash
-            if self.db.check_hash(file_info["md5"]):
+            # Vérification du hash : sur correspondance, ni sha256, ni entropie,
+            # ni analyse YARA
+            if "md5" in file_info and self.db.check_hash(file_info["md5"]):
                 hash_info = self.db.get_hash_info(file_info["md5"])
                 result.is_malicious = True
                 result.malware_family = hash_info.get("family", "unknown")
@@ -307,6 +690,8 @@ class SignatureDetector:
                 result.metadata["hash_match"] = hash_info
                 return result
 
+            self._complete_file_info(file_path, file_info)
+
             # Si le fichier est trop gros, on ne fait pas d'analyse YARA
             max_size = self.config.get("static_analysis", {}).get("max_file_size", 100000000)
             if file_info["size"] > max_size:
@@ -314,57 +699,56 @@ class SignatureDetector:
                 return result
 
             # Analyse YARA
-            if self.rules:
-                yara_matches = self.rules.match(file_path)
+            if self.rules or self.rules_header:
+                yara_matches, meta_cache = self._match_yara(file_path)
                 if yara_matches:
                     result.is_malicious = True
 
-                    # Traitement des correspondances
-                    severities = []
-                    families = []
+                    # Traitement des correspondances, en un seul passage : la
+                    # sévérité la plus haute et la confiance maximale sont
+                    # suivies au fil de l'eau, les familles comptées
+                    best_severity, best_rank = None, -1
+                    family_counts = {}
                     confidence = 0.0
 
                     for match in yara_matches:
                         rule_name = match.rule
                         result.matched_rules.append(rule_name)
 
-                        # Récupération des métadonnées de la règle
-                        rule_meta = match.meta
+                        # Récupération des métadonnées de la règle (partagées)
+                        meta_key = (match.namespace, rule_name)
+                        rule_meta = meta_cache.get(meta_key)
+                        if rule_meta is None:
+                            rule_meta = meta_cache.setdefault(meta_key, match.meta)
                         if "severity" in rule_meta:
-                            severities.append(rule_meta["severity"])
+                            severity = rule_meta["severity"]
+                            rank = severity_rank(severity)
+                            if rank > best_rank:
+                                best_severity, best_rank = severity, rank
 
+                        family = None
                         if "category" in rule_meta and rule_meta["category"] == "ransomware":
-                            families.append("ransomware")
+                            family = "ransomware"
                         elif "family" in rule_meta:
-                            families.append(rule_meta["family"])
+                            family = rule_meta["family"]
+                        if family is not None:
+                            family_counts[family] = family_counts.get(family, 0) + 1
 
                         # Stockage des métadonnées
                         result.metadata[rule_name] = rule_meta
 
                         # Confiance basée sur le nombre de chaînes correspondantes
                         match_confidence = min(1.0, len(match.strings) / 10.0)
-                        confidence = max(confidence, match_confidence)
-
-                    # Détermination de la famille de malware
-                    if families:
-                        # Prendre la famille la plus fréquente
-                        from collections import Counter
-
-                        family_counts = Counter(families)
-                        result.malware_family = family_counts.most_common(1)[0][0]
-
-                    # Détermination de la sévérité
-                    if severities:
-                        # Ordre de priorité
-                        severity_order = {
-                            "critical": 4,
-                            "high": 3,
-                            "medium": 2,
-                            "low": 1,
-                            "unknown": 0,
-                        }
-                        highest_severity = max(severities, key=lambda s: severity_order.get(s, 0))
-                        result.severity = highest_severity
+                        if match_confidence > confidence:
+                            confidence = match_confidence
+
+                    # Famille la plus fréquente : max() sur les familles distinctes
+                    # retient la première rencontrée en cas d'égalité
+                    if family_counts:
+                        result.malware_family = max(family_counts, key=family_counts.get)
+
+                    if best_severity is not None:
+                        result.severity = best_severity
 
                     # Confiance globale
                     result.confidence = min(0.95, confidence)
@@ -396,47 +780,8 @@ class SignatureDetector:
 
     def _get_file_info(self, file_path):
         """Collecte les informations de base sur un fichier"""
-        info = {}
         try:
-            # Taille et timestamps
-            stats = os.stat(file_path)
-            info["size"] = stats.st_size
-            info["created"] = datetime.fromtimestamp(stats.st_ctime).isoformat()
-            info["modified"] = datetime.fromtimestamp(stats.st_mtime).isoformat()
-            info["accessed"] = datetime.fromtimestamp(stats.st_atime).isoformat()
-
-            # Type de fichier (si python-magic dispo, sinon "unknown")
-            if _MAGIC_AVAILABLE:
-                info["mime"] = magic.Magic(mime=True).from_file(file_path)
-            else:
-                info["mime"] = "unknown"
-
-            # Calcul des hashes
-            with open(file_path, "rb") as f:
-                content = f.read()
-                info["md5"] = hashlib.md5(content).hexdigest()
-                info["sha1"] = hashlib.sha1(content).hexdigest()
-                info["sha256"] = hashlib.sha256(content).hexdigest()
-
-            # Entropie (mesure du caractère aléatoire/chiffré)
-            import math
-
-            entropy = 0.0
-            if content:
-                byte_counts = {}
-                for byte in content:
-                    if byte in byte_counts:
-                        byte_counts[byte] += 1
-                    else:
-                        byte_counts[byte] = 1
-
-                for count in byte_counts.values():
-                    probability = count / len(content)
-                    entropy -= probability * math.log2(probability)
-
-            info["entropy"] = entropy
-
-            return info
+            return self._collect_file_info(file_path)
         except Exception as e:
             logger.error(
                 f"Erreur lors de la collecte d'informations sur le fichier {file_path}: {e}"
@@ -445,19 +790,104 @@ class SignatureDetector:
                 "error": str(e),
                 "size": 0,
                 "md5": "",
-                "sha1": "",
                 "sha256": "",
                 "mime": "unknown",
                 "entropy": 0.0,
             }
 
+    def _collect_file_info(self, file_path, stats=None):
+        """Taille, dates, type MIME, md5, sha256 et entropie
+
+        `stats` : résultat d'un os.stat déjà fait par l'appelant, pour ne pas
+        refaire l'appel système.
+        """
+        return self._complete_file_info(file_path, self._basic_file_info(file_path, stats))
+
+    def _basic_file_info(self, file_path, stats=None):
+        """Taille, dates, type MIME et, si la base a des signatures de hash, md5
+
+        md5 ne sert qu'à la recherche dans la base : sans signature de hash,
+        il n'est pas calculé et `info["md5"]` n'est pas renseigné. Avec, le
+        fichier est haché avant tout le reste, pour que l'analyse s'arrête
+        sur une correspondance sans calculer sha256 ni l'entropie.
+        """
+        info = {}
+        # Taille et timestamps
+        if stats is None:
+            stats = os.stat(file_path)
+        info["size"] = stats.st_size
+        info["created"] = datetime.fromtimestamp(stats.st_ctime).isoformat()
+        info["modified"] = datetime.fromtimestamp(stats.st_mtime).isoformat()
+        info["accessed"] = datetime.fromtimestamp(stats.st_atime).isoformat()
+
+        # Type de fichier (si python-magic dispo, sinon "unknown")
+        info["mime"] = self._mime_type(file_path)
+
+        if self.db.has_hash_signatures():
+            md5 = _MD5_SEED.copy()
+            with open(file_path, "rb") as f:
+                for chunk in _iter_file_chunks(f):
+                    md5.update(chunk)
+            info["md5"] = md5.hexdigest()
+        return info
+
+    def _complete_file_info(self, file_path, info):
+        """Ajoute sha256 et l'entropie à `info`, en une lecture par blocs
+
+        Chaque bloc alimente le hachage et l'histogramme d'octets. Si md5 a
+        déjà été calculé, c'est une deuxième lecture, servie en pratique par
+        le cache de pages du système. sha256 (VirusTotal) passe par OpenSSL,
+        qui utilise les instructions SHA-NI quand le CPU les a. sha1 n'est
+        consommé nulle part.
+        """
+        sha256 = _SHA256_SEED.copy()
+        histogram = _ByteHistogram()
+        with open(file_path, "rb") as f:
+            for chunk in _iter_file_chunks(f):
+                sha256.update(chunk)
+                histogram.update(chunk)
+        info["sha256"] = sha256.hexdigest()
+
+        # Entropie (mesure du caractère aléatoire/chiffré)
+        info["entropy"] = histogram.entropy()
+        return info
+
+    def _mime_type(self, file_path):
+        """Type MIME via libmagic, "unknown" si python-magic est absent ou échoue
+
+        Un échec de libmagic ne doit pas interrompre l'analyse : le type MIME
+        est informatif, les hachages et les règles YARA restent appliqués.
+        """
+        if not _MAGIC_AVAILABLE:
+            return "unknown"
+        try:
+            detector = getattr(self._magic_tls, "magic", None)
+            if detector is None:
+                detector = self._magic_tls.magic = magic.Magic(mime=True)
+            return detector.from_file(file_path)
+        except Exception as e:
+            logger.warning(f"Type MIME indéterminé pour {file_path}: {e}")
+            return "unknown"
+
+    @staticmethod
+    def _make_http_session(pool_size):
+        """Session requests avec pool de connexions et nouvelles tentatives"""
+        retry = Retry(
+            total=VIRUSTOTAL_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        return session
+
     def _check_virustotal(self, file_hash, api_key):
         """Vérifie un hash sur VirusTotal"""
         try:
-            url = "https://www.virustotal.com/vtapi/v2/file/report"
             params = {"apikey": api_key, "resource": file_hash}
 
-            response = requests.get(url, params=params, timeout=15)
+            response = self._vt_session.get(VIRUSTOTAL_URL, params=params, timeout=15)
             if response.status_code == 200:
                 result = response.json()
                 return result
@@ -487,12 +917,13 @@ class SignatureDetector:
 
     def shutdown(self):
         """Arrête proprement le détecteur"""
-        # Arrêt du thread de scan
-        self.scan_queue.put(None)
-        self.scan_thread.join(timeout=5)
+        # Arrêt du pool : les analyses déjà soumises vont à leur terme
+        self._pool.shutdown(wait=True)
+        self._vt_session.close()
 
         # Sauvegarde des données
         self.db.save_database()
+        self.db.close()
 
         logger.info("Détecteur de signatures arrêté")
 
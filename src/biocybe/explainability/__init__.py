@@ -1,10 +1,13 @@
 """Explicabilité et cadre éthique BioCybe — partiellement héritage.
 
-`ethical_framework` (EthicalFramework, DataProcessingActivity) est pur
+`ethical_framework` (EthicalFramework, DataProcessingActivity,
+ExplanationLevel) est pur
 stdlib et toujours importable. `explainer` (ExplainableDecision,
 DecisionVisualizer) repose sur des dépendances lourdes (lime, shap,
 captum, matplotlib) NON déclarées en core — importé en lazy pour ne pas
-faire crasher `import biocybe.explainability`.
+faire crasher `import biocybe.explainability`. Le module lui-même n'exige
+que numpy : les dépendances XAI ne sont chargées qu'à la construction des
+explainers et aux tracés.
 
 Note : ce module est historique (XAI non branché au pipeline actif). La
 détection comportementale en production passe par `biocybe.lymphocytes_t`
@@ -14,13 +17,14 @@ détection comportementale en production passe par `biocybe.lymphocytes_t`
 from __future__ import annotations
 
 # Classes légères (stdlib) — import direct sûr.
-from .ethical_framework import DataProcessingActivity, EthicalFramework
+from .ethical_framework import DataProcessingActivity, EthicalFramework, ExplanationLevel
 
 __all__ = [
     "DataProcessingActivity",
     "DecisionVisualizer",
     "EthicalFramework",
     "ExplainableDecision",
+    "ExplanationLevel",
 ]
 
 # Classes XAI lourdes — chargées à la demande (PEP 562).
@@ -34,8 +38,8 @@ def __getattr__(name: str):
         except ImportError as exc:
             raise ImportError(
                 "biocybe.explainability.explainer (XAI héritage) nécessite "
-                "lime + shap + captum + matplotlib : `pip install lime shap "
-                "captum matplotlib`. NB : la détection comportementale active "
+                "numpy, puis lime + shap + captum + matplotlib à l'usage : "
+                "`pip install lime shap captum matplotlib`. NB : la détection comportementale active "
                 "de BioCybe est expliquée par z-scores via `biocybe tcell`."
             ) from exc
         return getattr(explainer, name)
@@ -7,20 +7,128 @@ Ce module implémente le cadre éthique de BioCybe pour assurer la conformité R
 et garantir une utilisation éthique de l'IA dans la cyberdéfense.
 """
 
+import atexit
+import bisect
+import functools
+import gzip
 import hashlib
+import hmac
 import json
 import logging
 import os
-from dataclasses import dataclass
+import queue
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from enum import IntEnum
+from types import MappingProxyType
+from typing import Any, BinaryIO
+
+try:  # sérialisation JSON en C si l'extra `perf` est installé
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - dépend de l'extra installé
+    _orjson = None  # type: ignore[assignment]
+
+# blake3 (extra [perf]) : pseudonymes à clé via BLAKE3 (SIMD). Repli sur
+# BLAKE2s à clé (hashlib) sinon.
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:  # pragma: no cover - dépend de l'extra installé
+    _blake3 = None
+
+# numpy (extra [ml]) : colonnes numériques anonymisées en un appel vectorisé
+# par anonymize_batch. Le module reste utilisable sans.
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'extra installé
+    np = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+# Valeur neutre des champs numériques anonymisés (démonstration)
+_NEUTRAL = 0
 
-@dataclass
+# Un pseudonyme = 4 premiers octets du condensat, soit 8 caractères hex
+PSEUDONYM_BYTES = 4
+PSEUDONYM_KEY_BYTES = 32
+
+
+def _sha256_pseudonyms(values: list[str]) -> list[str]:
+    """
+    Calcule en une passe les pseudonymes SHA-256 d'un lot de chaînes.
+
+    Seuls les PSEUDONYM_BYTES premiers octets du condensat sont encodés :
+    même résultat que `hexdigest()[:8]` sans construire la chaîne hex complète.
+    """
+    sha256 = hashlib.sha256
+    return [sha256(v.encode()).digest()[:PSEUDONYM_BYTES].hex() for v in values]
+
+
+def _keyed_pseudonyms(seed: Any, values: list[str]) -> list[str]:
+    """
+    Calcule les pseudonymes d'un lot de chaînes avec un contexte BLAKE3 ou BLAKE2s à clé.
+
+    `seed` est un contexte vierge déjà initialisé avec la clé : il est cloné
+    pour chaque valeur, jamais modifié.
+    """
+    pseudonyms = []
+    for v in values:
+        h = seed.copy()
+        h.update(v.encode())
+        pseudonyms.append(h.digest()[:PSEUDONYM_BYTES].hex())
+    return pseudonyms
+
+
+def _keyed_seed(key: bytes) -> Any:
+    """Contexte de hachage vierge à clé : BLAKE3 si disponible, BLAKE2s sinon."""
+    if _blake3 is not None:
+        return _blake3(key=key)
+    return hashlib.blake2s(digest_size=PSEUDONYM_BYTES, key=key)
+
+
+# Chaînes des catégories, mesures et sous-traitants, canonisées entre
+# activités ("Chiffrement", "Logs système"... reviennent dans la plupart).
+# Pool borné : au-delà de STR_POOL_MAX_SIZE chaînes, les nouvelles valeurs
+# sont gardées telles quelles (le vocabulaire usuel tient largement dedans).
+STR_POOL_MAX_SIZE = 4096
+_STR_POOL: dict[str, str] = {}
+
+
+def _shared_strings(values: list[str]) -> list[str]:
+    """Remplace chaque chaîne par son instance canonique du pool, s'il y a place."""
+    pool = _STR_POOL
+    shared = []
+    for value in values:
+        canonical = pool.get(value)
+        if canonical is None:
+            canonical = value
+            if len(pool) < STR_POOL_MAX_SIZE:
+                pool[value] = value
+        shared.append(canonical)
+    return shared
+
+
+class ExplanationLevel(IntEnum):
+    """Niveaux de détail de format_explanation."""
+
+    TECHNICAL = 0
+    INTERMEDIATE = 1
+    SIMPLIFIED = 2
+
+
+_LEVELS_BY_NAME = {level.name.lower(): level for level in ExplanationLevel}
+
+
+@dataclass(slots=True)
 class DataProcessingActivity:
-    """Représente une activité de traitement des données personnelles selon le RGPD."""
+    """
+    Représente une activité de traitement des données personnelles selon le RGPD.
+
+    Instances à slots (pas de __dict__) ; non gelées pour que as_dict() puisse
+    mettre son résultat en cache.
+    """
 
     name: str
     purpose: str
@@ -32,9 +140,37 @@ class DataProcessingActivity:
     cross_border_transfer: bool = False
     transfer_safeguards: str | None = None
     processors: list[str] = None
+    # Dictionnaire sérialisé, construit au premier as_dict()
+    _cached_dict: dict[str, Any] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Vocabulaire partagé entre activités : une seule instance par chaîne
+        self.data_categories = _shared_strings(self.data_categories)
+        self.security_measures = _shared_strings(self.security_measures)
+        if self.processors is not None:
+            self.processors = _shared_strings(self.processors)
 
-    def as_dict(self) -> dict[str, Any]:
-        """Convertit l'activité en dictionnaire."""
+    def as_dict(self, last_updated: str | None = None) -> dict[str, Any]:
+        """
+        Convertit l'activité en dictionnaire.
+
+        Le dictionnaire est construit une seule fois puis réutilisé (appeler
+        `invalidate()` après une modification) ; chaque appel en renvoie une
+        copie superficielle, que l'appelant peut modifier sans toucher au cache.
+
+        Args:
+            last_updated: Horodatage ISO à appliquer au dictionnaire renvoyé
+                (par défaut: celui de la construction du dictionnaire)
+        """
+        if self._cached_dict is None:
+            self._cached_dict = self._build_dict()
+        result = dict(self._cached_dict)
+        if last_updated is not None:
+            result["last_updated"] = last_updated
+        return result
+
+    def _build_dict(self) -> dict[str, Any]:
+        """Construit le dictionnaire mis en cache, horodaté maintenant."""
         return {
             "name": self.name,
             "purpose": self.purpose,
@@ -49,12 +185,250 @@ class DataProcessingActivity:
             "last_updated": datetime.now().isoformat(),
         }
 
+    def invalidate(self) -> None:
+        """Oublie le dictionnaire mis en cache après une modification de l'activité."""
+        self._cached_dict = None
+
+
+# Champs du registre, dans l'ordre de DataProcessingActivity.as_dict()
+PROCESSING_ACTIVITY_FIELDS = (
+    "name",
+    "purpose",
+    "data_categories",
+    "legal_basis",
+    "retention_period",
+    "security_measures",
+    "responsible_person",
+    "cross_border_transfer",
+    "transfer_safeguards",
+    "processors",
+    "last_updated",
+)
+
+
+def _loads(raw: bytes) -> Any:
+    """Désérialise un document JSON (orjson si disponible)."""
+    return _orjson.loads(raw) if _orjson is not None else json.loads(raw)
+
+
+def _dumps_indented(obj: Any) -> bytes:
+    """Sérialise un objet en JSON indenté (UTF-8)."""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_compact(obj: Any) -> bytes:
+    """Sérialise un objet en JSON compact sur une ligne (UTF-8)."""
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Consentement empaqueté dans un entier : bit 0 = accordé, bits suivants =
+# horodatage time_ns() signé (décalage arithmétique : dates avant 1970 et
+# après 2262 conservées)
+CONSENT_GRANTED_BIT = 1
+CONSENT_TS_SHIFT = 1
+
+
+def _datetime_to_ns(dt: datetime) -> int:
+    """Convertit un datetime en horodatage epoch en nanosecondes (sans flottant)."""
+    return int(dt.replace(microsecond=0).timestamp()) * 1_000_000_000 + dt.microsecond * 1000
+
+
+def _ns_to_iso(ns: int) -> str:
+    """Convertit un horodatage epoch en nanosecondes en date ISO locale."""
+    seconds, rest = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=rest // 1000).isoformat()
+
+
+# Tampon d'écriture de l'export NDJSON
+NDJSON_BUFFER_SIZE = 1 << 20
+
+# Clés de configuration jamais exportées
+SECRET_CONFIG_KEYS = frozenset({"pseudonym_seed", "audit_log_key"})
+
+# Journal d'audit : taille max d'un lot, délai max d'attente pour le
+# compléter, et taille du fichier au-delà de laquelle il est archivé
+AUDIT_BATCH_SIZE = 256
+AUDIT_BATCH_DELAY = 0.05
+AUDIT_LOG_MAX_BYTES = 10 * 1024 * 1024
+AUDIT_INITIAL_MAC = "0" * 64
+
+_AUDIT_STOP = object()
+
+
+def _audit_mac(key: bytes, prev_mac: str, batch: int, payload: bytes) -> str:
+    """HMAC-SHA256 d'un lot, chaîné au MAC du lot précédent et à son numéro."""
+    message = prev_mac.encode() + batch.to_bytes(8, "big") + payload
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+def _audit_record(entry: dict[str, Any]) -> dict[str, Any]:
+    """Entrée prête à sérialiser : horodatage reçu en ns formaté en ISO."""
+    timestamp = entry.get("timestamp")
+    if isinstance(timestamp, int):
+        return {**entry, "timestamp": _ns_to_iso(timestamp)}
+    return entry
+
+
+class ConsentAuditLog:
+    """
+    Journal d'audit append-only (JSONL) des consentements et demandes RGPD.
+
+    Les appelants ne font qu'empiler les entrées dans une file (horodatage
+    `timestamp` en ns epoch, formaté en ISO à l'écriture) ; un thread
+    dédié les regroupe par lots (AUDIT_BATCH_SIZE entrées ou AUDIT_BATCH_DELAY
+    secondes), écrit chaque lot en un seul `os.write` suivi d'une ligne de
+    scellement `{"batch", "entries", "prev", "mac"}`, puis fait un seul fsync.
+    Le MAC (HMAC-SHA256) couvre le lot, son numéro et le MAC précédent :
+    supprimer, modifier ou réordonner un lot casse la chaîne (voir
+    `verify_audit_log`). Au-delà de `max_bytes`, le fichier est archivé sous
+    `<path>.<numéro du lot suivant>` et la chaîne continue dans un nouveau fichier.
+
+    Le thread d'écriture est un démon : close() est enregistré auprès
+    d'atexit pour que les entrées en attente soient scellées même si
+    l'appelant oublie de fermer le journal.
+    """
+
+    def __init__(self, path: str, key: bytes, max_bytes: int = AUDIT_LOG_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._key = key
+        self._batch = 0
+        self._prev_mac = AUDIT_INITIAL_MAC
+        self._fd = self._open()
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        # Ordonne append() et close() : aucune entrée derrière la sentinelle
+        self._state_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="ethics-audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, entry: dict[str, Any]) -> None:
+        """
+        Empile une entrée ; aucune E/S dans le thread appelant.
+
+        Raises:
+            RuntimeError: si le journal est fermé (l'entrée ne serait jamais écrite)
+        """
+        with self._state_lock:
+            if self._closed:
+                raise RuntimeError(f"Consent audit log is closed: {self.path}")
+            self._queue.put(entry)
+
+    def close(self) -> None:
+        """Écrit les entrées en attente puis ferme le journal."""
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_AUDIT_STOP)
+        atexit.unregister(self.close)
+        self._thread.join()
+        os.close(self._fd)
+
+    def _open(self) -> int:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            entry = self._queue.get()
+            if entry is _AUDIT_STOP:
+                break
+            batch = [entry]
+            deadline = time.monotonic() + AUDIT_BATCH_DELAY
+            while len(batch) < AUDIT_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is _AUDIT_STOP:
+                    stop = True
+                    break
+                batch.append(entry)
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error("Error writing consent audit log batch: %s", e)
+
+    def _write_batch(self, entries: list[dict[str, Any]]) -> None:
+        payload = b"".join(_dumps_compact(_audit_record(entry)) + b"\n" for entry in entries)
+        self._batch += 1
+        mac = _audit_mac(self._key, self._prev_mac, self._batch, payload)
+        seal = {"batch": self._batch, "entries": len(entries), "prev": self._prev_mac, "mac": mac}
+        os.write(self._fd, payload + _dumps_compact(seal) + b"\n")
+        os.fsync(self._fd)
+        self._prev_mac = mac
+        if os.fstat(self._fd).st_size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        os.close(self._fd)
+        os.replace(self.path, f"{self.path}.{self._batch + 1}")
+        self._fd = self._open()
+
+
+def verify_audit_log(path: str, key: bytes, prev_mac: str | None = None) -> bool:
+    """
+    Vérifie la chaîne de MAC d'un fichier produit par ConsentAuditLog.
+
+    Args:
+        path: Fichier à vérifier
+        key: Clé HMAC du journal
+        prev_mac: MAC attendu avant le premier lot (par défaut: celui
+            annoncé par le premier scellement, pour un fichier archivé)
+
+    Returns:
+        bool: True si tous les lots sont scellés et chaînés correctement
+    """
+    with open(path, "rb") as f:
+        lines = f.read().splitlines(keepends=True)
+
+    pending = []
+    last_batch = None
+    for line in lines:
+        record = json.loads(line)
+        if set(record) != {"batch", "entries", "prev", "mac"}:
+            pending.append(line)
+            continue
+        if prev_mac is None:
+            prev_mac = record["prev"]
+        if record["prev"] != prev_mac or record["entries"] != len(pending):
+            return False
+        if last_batch is not None and record["batch"] != last_batch + 1:
+            return False
+        expected = _audit_mac(key, prev_mac, record["batch"], b"".join(pending))
+        if not hmac.compare_digest(expected, record["mac"]):
+            return False
+        prev_mac, last_batch, pending = record["mac"], record["batch"], []
+
+    # Des entrées après le dernier scellement n'ont jamais été scellées
+    return not pending
+
 
 class EthicalFramework:
     """
     Implémente le cadre éthique de BioCybe pour une IA explicable et respectueuse de la vie privée.
     """
 
+    # Textes fixes de format_explanation ; les sens de contribution sont
+    # indexés par `importance > 0`
+    _TECHNICAL_HEADER = "Caractéristiques contributives:"
+    _INTERMEDIATE_HEADER = "Les facteurs les plus importants sont:"
+    _RISK_DIRECTIONS = ("diminué", "augmenté")
+    _IMPACT_DIRECTIONS = ("négatif", "positif")
+    _DEFAULT_EXPLANATION = "La décision est basée sur l'analyse des motifs détectés."
+
     def __init__(self, config_path: str | None = None):
         """
         Initialise le cadre éthique.
@@ -62,14 +436,24 @@ class EthicalFramework:
         Args:
             config_path: Chemin vers le fichier de configuration du cadre éthique (JSON)
         """
-        self.processing_activities = []
-        self.consent_log = {}
-        self.data_subject_requests = {}
-        self.config = {
+        # Registre en colonnes (une liste par champ) : les clés ne sont pas
+        # dupliquées par activité
+        self._pa_columns: dict[str, list[Any]] = {name: [] for name in PROCESSING_ACTIVITY_FIELDS}
+        # Consentements : user_id -> {consent_type: horodatage ns | bit accordé}
+        self._consents: dict[str, dict[str, int]] = {}
+        # Demandes RGPD ; created_at / completed_at en ns epoch, formatés en ISO
+        # seulement à la lecture de data_subject_requests
+        self._requests: dict[str, dict[str, Any]] = {}
+        # Index des demandes par statut : listes triées de (création ns, request_id)
+        self._requests_by_status: dict[str, list[tuple[int, str]]] = {}
+        self._request_keys: dict[str, tuple[str, int]] = {}
+        self.config: dict[str, dict[str, Any]] = {
             "privacy": {
                 "data_minimization": True,
                 "local_processing": True,
                 "anonymization": True,
+                # SHA-256 (sans clé) pour les pseudonymes au lieu de BLAKE3/BLAKE2s à clé
+                "crypto_pseudonyms": False,
                 "max_retention_days": 30,
             },
             "explainability": {
@@ -92,15 +476,81 @@ class EthicalFramework:
         # Charger la configuration si spécifiée
         if config_path and os.path.exists(config_path):
             try:
-                with open(config_path) as f:
-                    loaded_config = json.load(f)
-                    # Mettre à jour la configuration avec les valeurs chargées
-                    for section, settings in loaded_config.items():
-                        if section in self.config:
-                            self.config[section].update(settings)
-                logger.info(f"Ethical framework configuration loaded from {config_path}")
+                with open(config_path, "rb") as f:
+                    loaded_config = _loads(f.read())
+                # Mettre à jour la configuration avec les valeurs chargées
+                for section, settings in loaded_config.items():
+                    if section in self.config:
+                        self.config[section].update(settings)
+                logger.info("Ethical framework configuration loaded from %s", config_path)
             except Exception as e:
-                logger.error(f"Error loading ethical framework configuration: {e!s}")
+                logger.error("Error loading ethical framework configuration: %s", e)
+
+        self.reload()
+
+        # Formateurs de format_explanation, indexés par ExplanationLevel
+        self._format_dispatch = (
+            self._format_technical,
+            self._format_intermediate,
+            self._format_simplified,
+        )
+
+        # Clé des pseudonymes : dérivée de `privacy.pseudonym_seed` si fourni
+        # (pseudonymes stables d'une exécution à l'autre), aléatoire sinon
+        seed = self.config["privacy"].get("pseudonym_seed")
+        if seed is None:
+            key = os.urandom(PSEUDONYM_KEY_BYTES)
+        else:
+            key = hashlib.blake2s(str(seed).encode(), digest_size=PSEUDONYM_KEY_BYTES).digest()
+        self._pseudonym_seed = _keyed_seed(key)
+
+        # Journal d'audit des consentements et demandes, si `privacy.audit_log_path`
+        # est fourni. Sans `privacy.audit_log_key`, la clé est aléatoire : le
+        # journal n'est alors vérifiable que pendant la vie du processus.
+        self._audit_log = None
+        audit_path = self.config["privacy"].get("audit_log_path")
+        if audit_path:
+            audit_key = self.config["privacy"].get("audit_log_key")
+            if audit_key is None:
+                logger.warning("No audit_log_key configured, using an ephemeral audit key")
+                audit_key = os.urandom(32)
+            elif isinstance(audit_key, str):
+                audit_key = audit_key.encode()
+            self._audit_log = ConsentAuditLog(
+                audit_path,
+                audit_key,
+                int(self.config["privacy"].get("audit_log_max_bytes", AUDIT_LOG_MAX_BYTES)),
+            )
+
+    def reload(self) -> None:
+        """
+        Recalcule les options lues sur les chemins chauds à partir de `self.config`.
+
+        À appeler après toute modification de `self.config`.
+        """
+        privacy = self.config["privacy"]
+        explainability = self.config["explainability"]
+        self._data_min = bool(privacy["data_minimization"])
+        self._anon = bool(privacy["anonymization"])
+        self._crypto_pseudonyms = bool(privacy["crypto_pseudonyms"])
+        levels = frozenset(explainability["explanation_levels"])
+        # Niveaux activés, indexés par ExplanationLevel
+        self._levels_enabled = tuple(level.name.lower() in levels for level in ExplanationLevel)
+        self._required_score = float(explainability["required_explainability_score"])
+
+    @property
+    def processing_activities(self) -> tuple[Mapping[str, Any], ...]:
+        """Activités enregistrées, reconstruites ligne par ligne depuis les colonnes.
+
+        Vue en lecture seule : une modification lève TypeError au lieu d'être
+        perdue. Passer par register_processing_activity pour ajouter une activité.
+        """
+        return tuple(MappingProxyType(row) for row in self._iter_processing_activities())
+
+    def _iter_processing_activities(self) -> Iterator[dict[str, Any]]:
+        """Reconstruit les activités une à une, sans matérialiser la liste."""
+        for row in zip(*self._pa_columns.values(), strict=True):
+            yield dict(zip(PROCESSING_ACTIVITY_FIELDS, row, strict=True))
 
     def register_processing_activity(self, activity: DataProcessingActivity) -> bool:
         """
@@ -113,13 +563,40 @@ class EthicalFramework:
             bool: True si l'activité a été enregistrée avec succès
         """
         try:
-            self.processing_activities.append(activity.as_dict())
-            logger.info(f"Registered processing activity: {activity.name}")
+            self._append_activity(activity.as_dict())
+            logger.info("Registered processing activity: %s", activity.name)
             return True
         except Exception as e:
-            logger.error(f"Error registering processing activity: {e!s}")
+            logger.error("Error registering processing activity: %s", e)
             return False
 
+    def register_processing_activities(self, activities: list[DataProcessingActivity]) -> int:
+        """
+        Enregistre un lot d'activités de traitement avec un horodatage commun.
+
+        Args:
+            activities: Les activités de traitement à enregistrer
+
+        Returns:
+            int: Nombre d'activités enregistrées
+        """
+        now = datetime.now().isoformat()
+        registered = 0
+        for activity in activities:
+            try:
+                self._append_activity(activity.as_dict(now))
+                registered += 1
+            except Exception as e:
+                logger.error("Error registering processing activity: %s", e)
+
+        logger.info("Registered %s processing activities", registered)
+        return registered
+
+    def _append_activity(self, row: dict[str, Any]) -> None:
+        """Ajoute une activité sérialisée aux colonnes du registre."""
+        for name, column in self._pa_columns.items():
+            column.append(row[name])
+
     def check_data_minimization(
         self, required_data_fields: list[str], available_fields: list[str]
     ) -> list[str]:
@@ -133,49 +610,161 @@ class EthicalFramework:
         Returns:
             List[str]: Liste des champs conformes au principe de minimisation
         """
-        if not self.config["privacy"]["data_minimization"]:
+        if not self._data_min:
             return available_fields
 
-        # Ne conserver que les champs nécessaires
-        minimized_fields = [field for field in available_fields if field in required_data_fields]
+        # Ne conserver que les champs nécessaires (test d'appartenance en O(1))
+        required = frozenset(required_data_fields)
+        minimized_fields = [name for name in available_fields if name in required]
 
         # Loguer l'action de minimisation
-        excluded_fields = set(available_fields) - set(minimized_fields)
-        if excluded_fields:
-            logger.info(f"Data minimization applied: excluded {len(excluded_fields)} fields")
+        excluded_count = len(available_fields) - len(minimized_fields)
+        if excluded_count:
+            logger.info("Data minimization applied: excluded %s fields", excluded_count)
 
         return minimized_fields
 
-    def anonymize_data(self, data: dict[str, Any], sensitive_fields: list[str]) -> dict[str, Any]:
+    def anonymize_data(
+        self, data: dict[str, Any], sensitive_fields: list[str], inplace: bool = False
+    ) -> dict[str, Any]:
         """
         Anonymise les données sensibles.
 
         Args:
             data: Dictionnaire de données à anonymiser
             sensitive_fields: Liste des champs sensibles à anonymiser
+            inplace: Modifier `data` directement au lieu d'en renvoyer une copie
 
         Returns:
-            Dict[str, Any]: Données anonymisées
+            Dict[str, Any]: Données anonymisées (`data` lui-même si aucun champ
+                n'est à modifier ou si `inplace`)
         """
-        if not self.config["privacy"]["anonymization"]:
+        if not self._anon:
             return data
 
-        anonymized_data = data.copy()
-
-        for field in sensitive_fields:
-            if field in anonymized_data:
-                # Remplacer par un hash ou une valeur anonymisée selon le type
-                if isinstance(anonymized_data[field], str):
-                    # Hash simple pour les chaînes
-                    anonymized_data[field] = hashlib.sha256(
-                        anonymized_data[field].encode()
-                    ).hexdigest()[:8]
-                elif isinstance(anonymized_data[field], (int, float)):
+        # Pré-passe : ne retenir que les champs présents à modifier ; les
+        # chaînes sont regroupées pour être hachées en un seul lot
+        changes: dict[str, Any] = {}
+        string_fields: list[str] = []
+        for key in sensitive_fields:
+            if key in data:
+                value = data[key]
+                if isinstance(value, str):
+                    string_fields.append(key)
+                elif isinstance(value, (int, float)):
                     # Bruit pour les valeurs numériques
-                    anonymized_data[field] = 0  # Valeur neutre pour les démonstrations
+                    changes[key] = _NEUTRAL
+
+        # Hash simple pour les chaînes
+        if string_fields:
+            pseudonyms = self._pseudonymize([data[f] for f in string_fields])
+            changes.update(zip(string_fields, pseudonyms, strict=True))
+
+        logger.info("Data anonymized for %s sensitive fields", len(sensitive_fields))
 
-        logger.info(f"Data anonymized for {len(sensitive_fields)} sensitive fields")
-        return anonymized_data
+        # Copie à l'écriture : seules les données réellement modifiées sont copiées
+        if not changes:
+            return data
+        if inplace:
+            data.update(changes)
+            return data
+        return {**data, **changes}
+
+    def anonymize_batch(self, records: Any, sensitive_fields: list[str]) -> Any:
+        """
+        Anonymise un lot d'enregistrements en hachant toutes leurs chaînes en un seul lot.
+
+        Args:
+            records: Liste de dictionnaires, ou dictionnaire de colonnes (listes
+                ou tableaux numpy) indexé par nom de champ
+            sensitive_fields: Liste des champs sensibles à anonymiser
+
+        Returns:
+            Le lot anonymisé, dans la même forme que `records` (les
+            enregistrements sans champ à modifier ne sont pas copiés)
+        """
+        if not self._anon:
+            return records
+
+        result: dict[str, Any] | list[dict[str, Any]]
+        if isinstance(records, dict):
+            # Colonnes : chaque colonne sensible est remplacée d'un bloc
+            result = dict(records)
+            for key in sensitive_fields:
+                if key in result:
+                    result[key] = self._anonymize_column(result[key])
+        else:
+            # Lignes : pseudonymes de toutes les lignes calculés en un appel
+            changes: list[dict[str, Any]] = [{} for _ in records]
+            refs = []
+            values = []
+            for i, record in enumerate(records):
+                for key in sensitive_fields:
+                    if key in record:
+                        value = record[key]
+                        if isinstance(value, str):
+                            refs.append((i, key))
+                            values.append(value)
+                        elif isinstance(value, (int, float)):
+                            changes[i][key] = _NEUTRAL
+            for (i, key), pseudonym in zip(refs, self._pseudonymize(values), strict=True):
+                changes[i][key] = pseudonym
+            result = [
+                {**record, **change} if change else record
+                for record, change in zip(records, changes, strict=True)
+            ]
+
+        logger.info("Data anonymized for %s records", len(records))
+        return result
+
+    def _anonymize_column(self, column: Any) -> Any:
+        """Anonymise une colonne de valeurs (liste ou tableau numpy)."""
+        if np is not None and isinstance(column, np.ndarray):
+            if column.dtype.kind in "biuf":
+                return np.zeros_like(column)
+            values = self._anonymize_values(column.tolist())
+            return np.array(values, dtype=object if column.dtype.kind == "O" else None)
+        return self._anonymize_values(list(column))
+
+    def _anonymize_values(self, values: list[Any]) -> list[Any]:
+        """Anonymise une liste de valeurs : chaînes hachées en un lot, nombres neutralisés."""
+        result = [_NEUTRAL if isinstance(v, (int, float)) else v for v in values]
+        indexes = [i for i, v in enumerate(values) if isinstance(v, str)]
+        for i, pseudonym in zip(
+            indexes, self._pseudonymize([values[i] for i in indexes]), strict=True
+        ):
+            result[i] = pseudonym
+        return result
+
+    def _pseudonymize(self, values: list[str]) -> list[str]:
+        """Pseudonymes d'un lot de chaînes (SHA-256 ou hachage à clé selon la config)."""
+        if self._crypto_pseudonyms:
+            return _sha256_pseudonyms(values)
+        return _keyed_pseudonyms(self._pseudonym_seed, values)
+
+    @property
+    def consent_log(self) -> Mapping[str, Mapping[str, Mapping[str, Any]]]:
+        """Consentements par utilisateur et par type : {"granted", "timestamp" ISO}.
+
+        Vue en lecture seule, reconstruite depuis le stockage empaqueté :
+        passer par log_consent pour enregistrer un choix.
+        """
+        return MappingProxyType(
+            {
+                user_id: MappingProxyType(
+                    {
+                        consent_type: MappingProxyType(
+                            {
+                                "granted": bool(packed & CONSENT_GRANTED_BIT),
+                                "timestamp": _ns_to_iso(packed >> CONSENT_TS_SHIFT),
+                            }
+                        )
+                        for consent_type, packed in consents.items()
+                    }
+                )
+                for user_id, consents in self._consents.items()
+            }
+        )
 
     def log_consent(
         self, user_id: str, consent_type: str, granted: bool, timestamp: datetime | None = None
@@ -189,15 +778,45 @@ class EthicalFramework:
             granted: Si le consentement a été accordé
             timestamp: Horodatage du consentement (par défaut: maintenant)
         """
-        if user_id not in self.consent_log:
-            self.consent_log[user_id] = {}
+        ts_ns = _datetime_to_ns(timestamp) if timestamp is not None else time.time_ns()
+        self._store_consent(user_id, consent_type, granted, ts_ns)
 
-        self.consent_log[user_id][consent_type] = {
-            "granted": granted,
-            "timestamp": (timestamp or datetime.now()).isoformat(),
-        }
+        logger.info(
+            "Consent logged for user %s, type %s, granted: %s", user_id, consent_type, granted
+        )
 
-        logger.info(f"Consent logged for user {user_id}, type {consent_type}, granted: {granted}")
+    def log_consents(self, entries: list[tuple[str, str, bool]]) -> None:
+        """
+        Enregistre un lot de consentements avec un horodatage commun.
+
+        Args:
+            entries: Tuples (user_id, consent_type, granted)
+        """
+        now = time.time_ns()
+        for user_id, consent_type, granted in entries:
+            self._store_consent(user_id, consent_type, granted, now)
+
+        logger.info("Consents logged: %s entries", len(entries))
+
+    def _store_consent(self, user_id: str, consent_type: str, granted: bool, ts_ns: int) -> None:
+        """Mémorise un consentement sous forme d'entier : horodatage (ns) | bit accordé."""
+        packed = (ts_ns << CONSENT_TS_SHIFT) | (CONSENT_GRANTED_BIT if granted else 0)
+        consents = self._consents.get(user_id)
+        if consents is None:
+            self._consents[user_id] = {consent_type: packed}
+        else:
+            consents[consent_type] = packed
+
+        if self._audit_log is not None:
+            self._audit_log.append(
+                {
+                    "event": "consent",
+                    "user_id": user_id,
+                    "consent_type": consent_type,
+                    "granted": granted,
+                    "timestamp": ts_ns,
+                }
+            )
 
     def check_consent(self, user_id: str, consent_type: str) -> bool:
         """
@@ -210,11 +829,11 @@ class EthicalFramework:
         Returns:
             bool: True si le consentement a été accordé, False sinon
         """
-        if user_id in self.consent_log and consent_type in self.consent_log[user_id]:
-            return self.consent_log[user_id][consent_type]["granted"]
-
-        # Par défaut, considérer qu'il n'y a pas de consentement
-        return False
+        try:
+            return bool(self._consents[user_id][consent_type] & CONSENT_GRANTED_BIT)
+        except KeyError:
+            # Par défaut, considérer qu'il n'y a pas de consentement
+            return False
 
     def register_data_subject_request(
         self, request_id: str, user_id: str, request_type: str, details: str
@@ -228,17 +847,53 @@ class EthicalFramework:
             request_type: Type de demande ('access', 'erasure', 'portability', etc.)
             details: Détails de la demande
         """
-        self.data_subject_requests[request_id] = {
+        created_ns = time.time_ns()
+        self._index_request(request_id, "pending", created_ns)
+        self._requests[request_id] = {
             "user_id": user_id,
             "request_type": request_type,
             "details": details,
             "status": "pending",
-            "created_at": datetime.now().isoformat(),
+            "created_at": created_ns,
             "completed_at": None,
             "response": None,
         }
 
-        logger.info(f"Data subject request registered: {request_type} for user {user_id}")
+        if self._audit_log is not None:
+            self._audit_log.append(
+                {
+                    "event": "data_subject_request",
+                    "request_id": request_id,
+                    "user_id": user_id,
+                    "request_type": request_type,
+                    "status": "pending",
+                    "timestamp": created_ns,
+                }
+            )
+
+        logger.info("Data subject request registered: %s for user %s", request_type, user_id)
+
+    @property
+    def data_subject_requests(self) -> Mapping[str, Mapping[str, Any]]:
+        """Demandes RGPD par identifiant, horodatages formatés en ISO.
+
+        Vue en lecture seule : passer par update_data_subject_request pour
+        changer le statut d'une demande.
+        """
+        return MappingProxyType(
+            {
+                request_id: MappingProxyType(
+                    {
+                        **request,
+                        "created_at": _ns_to_iso(request["created_at"]),
+                        "completed_at": (
+                            _ns_to_iso(request["completed_at"]) if request["completed_at"] else None
+                        ),
+                    }
+                )
+                for request_id, request in self._requests.items()
+            }
+        )
 
     def update_data_subject_request(
         self, request_id: str, status: str, response: str | None = None
@@ -254,73 +909,127 @@ class EthicalFramework:
         Returns:
             bool: True si la mise à jour a réussi
         """
-        if request_id not in self.data_subject_requests:
-            logger.warning(f"Data subject request {request_id} not found")
+        request = self._requests.get(request_id)
+        if request is None:
+            logger.warning("Data subject request %s not found", request_id)
             return False
 
-        self.data_subject_requests[request_id]["status"] = status
+        now = time.time_ns()
+        request["status"] = status
+        self._index_request(request_id, status, request["created_at"])
 
         if status in ("completed", "rejected"):
-            self.data_subject_requests[request_id]["completed_at"] = datetime.now().isoformat()
+            request["completed_at"] = now
 
         if response:
-            self.data_subject_requests[request_id]["response"] = response
+            request["response"] = response
+
+        if self._audit_log is not None:
+            self._audit_log.append(
+                {
+                    "event": "data_subject_request_update",
+                    "request_id": request_id,
+                    "status": status,
+                    "timestamp": now,
+                }
+            )
 
-        logger.info(f"Data subject request {request_id} updated to status: {status}")
+        logger.info("Data subject request %s updated to status: %s", request_id, status)
         return True
 
-    def format_explanation(self, explanation: dict[str, Any], level: str = "intermediate") -> str:
+    def list_requests(
+        self, status: str, since_ns: int | None = None, until_ns: int | None = None
+    ) -> list[str]:
+        """
+        Liste les demandes d'un statut donné, par date de création croissante.
+
+        Args:
+            status: Statut recherché ('pending', 'completed', 'rejected', etc.)
+            since_ns: Création au plus tôt (epoch en nanosecondes, incluse)
+            until_ns: Création au plus tard (epoch en nanosecondes, incluse)
+
+        Returns:
+            List[str]: Identifiants des demandes
+        """
+        entries = self._requests_by_status.get(status, [])
+        lo = 0 if since_ns is None else bisect.bisect_left(entries, (since_ns,))
+        hi = len(entries) if until_ns is None else bisect.bisect_left(entries, (until_ns + 1,))
+        return [request_id for _, request_id in entries[lo:hi]]
+
+    def _index_request(self, request_id: str, status: str, created_ns: int) -> None:
+        """Place une demande dans l'index trié de son statut (en la retirant de l'ancien)."""
+        previous = self._request_keys.get(request_id)
+        if previous is not None:
+            entries = self._requests_by_status[previous[0]]
+            entries.pop(bisect.bisect_left(entries, (previous[1], request_id)))
+        bisect.insort(self._requests_by_status.setdefault(status, []), (created_ns, request_id))
+        self._request_keys[request_id] = (status, created_ns)
+
+    def format_explanation(
+        self, explanation: dict[str, Any], level: ExplanationLevel | int | str = "intermediate"
+    ) -> str:
         """
         Formate une explication selon le niveau de détail demandé.
 
         Args:
             explanation: Dictionnaire contenant les données d'explication
-            level: Niveau de détail ('technical', 'intermediate', 'simplified')
+            level: Niveau de détail (ExplanationLevel, son entier, ou son nom :
+                'technical', 'intermediate', 'simplified')
 
         Returns:
             str: Explication formatée
         """
-        if level not in self.config["explainability"]["explanation_levels"]:
-            level = "intermediate"  # Niveau par défaut
+        if isinstance(level, str):
+            level = _LEVELS_BY_NAME.get(level, ExplanationLevel.INTERMEDIATE)
+        if not 0 <= level < len(self._levels_enabled) or not self._levels_enabled[level]:
+            level = ExplanationLevel.INTERMEDIATE  # Niveau par défaut
 
         # Extraire les éléments pertinents
         method = explanation.get("method", "unknown")
         features = explanation.get("features", [])
 
-        # Formater selon le niveau
-        if level == "technical":
-            # Explication technique détaillée
-            lines = [f"Méthode d'explication: {method}"]
-            lines.append("Caractéristiques contributives:")
-
-            for i, feature in enumerate(features):
-                lines.append(f"  {i + 1}. {feature['feature']}: {feature['importance']:.6f}")
-
-                # Ajouter des détails techniques supplémentaires si disponibles
-                if "value" in feature:
-                    lines.append(f"     Valeur: {feature['value']}")
-
-            return "\n".join(lines)
-
-        if level == "intermediate":
-            # Niveau intermédiaire avec un équilibre d'informations
-            lines = [f"Cette décision a été prise en utilisant la méthode {method}."]
-            lines.append("Les facteurs les plus importants sont:")
-
-            for i, feature in enumerate(features[:5]):  # Top 5 seulement
-                direction = "augmenté" if feature["importance"] > 0 else "diminué"
-                lines.append(f"  • {feature['feature']} a {direction} le niveau de risque")
-
-            return "\n".join(lines)
-
-        # simplified
-        # Version très simple
+        return self._format_dispatch[level](method, features)
+
+    def _format_technical(self, method: str, features: list[dict[str, Any]]) -> str:
+        """Explication technique détaillée, valeur ajoutée si disponible."""
+        return "\n".join(
+            [
+                f"Méthode d'explication: {method}",
+                self._TECHNICAL_HEADER,
+                *(
+                    f"  {i}. {feature['feature']}: {feature['importance']:.6f}"
+                    + (f"\n     Valeur: {feature['value']}" if "value" in feature else "")
+                    for i, feature in enumerate(features, 1)
+                ),
+            ]
+        )
+
+    def _format_intermediate(self, method: str, features: list[dict[str, Any]]) -> str:
+        """Niveau intermédiaire avec un équilibre d'informations (top 5 seulement)."""
+        directions = self._RISK_DIRECTIONS
+        return "\n".join(
+            [
+                f"Cette décision a été prise en utilisant la méthode {method}.",
+                self._INTERMEDIATE_HEADER,
+                *(
+                    f"  • {feature['feature']} a "
+                    f"{directions[feature['importance'] > 0]} le niveau de risque"
+                    for feature in features[:5]
+                ),
+            ]
+        )
+
+    def _format_simplified(self, method: str, features: list[dict[str, Any]]) -> str:
+        """Version très simple : le facteur principal seulement."""
         if features:
-            top_feature = features[0]["feature"]
-            direction = "positif" if features[0]["importance"] > 0 else "négatif"
-            return f"Cette décision est principalement due à un impact {direction} du facteur '{top_feature}'."
+            top = features[0]
+            direction = self._IMPACT_DIRECTIONS[top["importance"] > 0]
+            return (
+                f"Cette décision est principalement due à un impact {direction} "
+                f"du facteur '{top['feature']}'."
+            )
 
-        return "La décision est basée sur l'analyse des motifs détectés."
+        return self._DEFAULT_EXPLANATION
 
     def validate_model_explainability(self, explainability_metrics: dict[str, float]) -> bool:
         """
@@ -332,63 +1041,90 @@ class EthicalFramework:
         Returns:
             bool: True si le modèle est suffisamment explicable
         """
-        required_score = self.config["explainability"]["required_explainability_score"]
-
-        # Vérifier si le score global est suffisant
-        if "global_score" in explainability_metrics:
-            meets_threshold = explainability_metrics["global_score"] >= required_score
-
-            if not meets_threshold:
-                logger.warning(
-                    f"Model does not meet explainability threshold: "
-                    f"{explainability_metrics['global_score']:.2f} < {required_score:.2f}"
-                )
+        # Score global s'il est fourni, sinon moyenne des scores spécifiques
+        score = explainability_metrics.get("global_score")
+        if score is None:
+            if not explainability_metrics:
+                logger.error("No explainability metrics provided")
+                return False
+            score = sum(explainability_metrics.values()) / len(explainability_metrics)
+
+        # Cas courant : seuil atteint, aucun message à formater
+        if score >= self._required_score:
+            return True
 
-            return meets_threshold
+        # Formatage différé : rien n'est construit si WARNING est filtré
+        logger.warning(
+            "Model does not meet explainability threshold: %.2f < %.2f",
+            score,
+            self._required_score,
+        )
+        return False
 
-        # Si pas de score global, vérifier les scores spécifiques
-        if not explainability_metrics:
-            logger.error("No explainability metrics provided")
-            return False
+    def export_processing_register(self, output_path: str) -> bool:
+        """
+        Exporte le registre des activités de traitement au format JSON.
 
-        # Moyenner les scores disponibles
-        avg_score = sum(explainability_metrics.values()) / len(explainability_metrics)
-        meets_threshold = avg_score >= required_score
+        Args:
+            output_path: Chemin du fichier d'export
 
-        if not meets_threshold:
-            logger.warning(
-                f"Model does not meet explainability threshold: "
-                f"{avg_score:.2f} < {required_score:.2f}"
+        Returns:
+            bool: True si l'export a réussi
+        """
+        try:
+            data = _dumps_indented(
+                {
+                    "processing_activities": list(self._iter_processing_activities()),
+                    "generated_at": datetime.now().isoformat(),
+                    "framework_version": "1.0.0",
+                }
             )
+            with open(output_path, "wb") as f:
+                f.write(data)
 
-        return meets_threshold
+            logger.info("Processing activities register exported to %s", output_path)
+            return True
+        except Exception as e:
+            logger.error("Error exporting processing register: %s", e)
+            return False
 
-    def export_processing_register(self, output_path: str) -> bool:
+    def export_processing_register_ndjson(self, output_path: str, compress: bool = False) -> bool:
         """
-        Exporte le registre des activités de traitement au format JSON.
+        Exporte le registre en flux NDJSON : une ligne d'en-tête puis une activité par ligne.
+
+        Adapté aux gros registres : rien n'est matérialisé en mémoire et le
+        fichier peut être lu ligne à ligne.
 
         Args:
             output_path: Chemin du fichier d'export
+            compress: Compresser en gzip (niveau 1 : vitesse plutôt que taux)
 
         Returns:
             bool: True si l'export a réussi
         """
         try:
-            with open(output_path, "w") as f:
-                json.dump(
-                    {
-                        "processing_activities": self.processing_activities,
-                        "generated_at": datetime.now().isoformat(),
-                        "framework_version": "1.0.0",
-                    },
-                    f,
-                    indent=2,
+            f: gzip.GzipFile | BinaryIO
+            if compress:
+                f = gzip.open(output_path, "wb", compresslevel=1)
+            else:
+                f = open(output_path, "wb", buffering=NDJSON_BUFFER_SIZE)
+            with f:
+                f.write(
+                    _dumps_compact(
+                        {
+                            "framework_version": "1.0.0",
+                            "generated_at": datetime.now().isoformat(),
+                        }
+                    )
+                    + b"\n"
                 )
+                for activity in self._iter_processing_activities():
+                    f.write(_dumps_compact(activity) + b"\n")
 
-            logger.info(f"Processing activities register exported to {output_path}")
+            logger.info("Processing activities register exported to %s", output_path)
             return True
         except Exception as e:
-            logger.error(f"Error exporting processing register: {e!s}")
+            logger.error("Error exporting processing register: %s", e)
             return False
 
     def export_config(self, output_path: str) -> bool:
@@ -402,51 +1138,79 @@ class EthicalFramework:
             bool: True si l'export a réussi
         """
         try:
-            with open(output_path, "w") as f:
-                json.dump(
-                    {
-                        "config": self.config,
-                        "exported_at": datetime.now().isoformat(),
-                        "framework_version": "1.0.0",
-                    },
-                    f,
-                    indent=2,
-                )
+            data = _dumps_indented(
+                {
+                    "config": self._exportable_config(),
+                    "exported_at": datetime.now().isoformat(),
+                    "framework_version": "1.0.0",
+                }
+            )
+            with open(output_path, "wb") as f:
+                f.write(data)
 
-            logger.info(f"Ethical framework configuration exported to {output_path}")
+            logger.info("Ethical framework configuration exported to %s", output_path)
             return True
         except Exception as e:
-            logger.error(f"Error exporting ethical framework configuration: {e!s}")
+            logger.error("Error exporting ethical framework configuration: %s", e)
             return False
 
+    def _exportable_config(self) -> dict[str, Any]:
+        """Configuration sans les secrets (graine des pseudonymes, clé d'audit)."""
+        return {
+            section: {k: v for k, v in settings.items() if k not in SECRET_CONFIG_KEYS}
+            for section, settings in self.config.items()
+        }
 
-# Définition de quelques activités de traitement préenregistrées pour BioCybe
-DEFAULT_PROCESSING_ACTIVITIES = [
-    DataProcessingActivity(
-        name="Détection de comportements suspects",
-        purpose="Identification d'activités potentiellement malveillantes sur les systèmes",
-        data_categories=["Logs système", "Comportement utilisateur", "Activité réseau"],
-        legal_basis="Intérêt légitime",
-        retention_period="30 jours",
-        security_measures=["Chiffrement", "Contrôle d'accès", "Anonymisation"],
-        responsible_person="Responsable Sécurité",
-    ),
-    DataProcessingActivity(
-        name="Amélioration des modèles de détection",
-        purpose="Affiner les algorithmes pour réduire les faux positifs",
-        data_categories=["Alertes historiques", "Données d'apprentissage anonymisées"],
-        legal_basis="Consentement",
-        retention_period="1 an",
-        security_measures=["Anonymisation", "Agrégation", "Contrôle d'accès renforcé"],
-        responsible_person="Responsable IA",
-    ),
-    DataProcessingActivity(
-        name="Analyse forensique post-incident",
-        purpose="Investigation approfondie suite à un incident de sécurité confirmé",
-        data_categories=["Logs système", "Communication réseau", "Fichiers système"],
-        legal_basis="Intérêt légitime / Obligation légale",
-        retention_period="5 ans",
-        security_measures=["Chiffrement", "Cloisonnement", "Journalisation des accès"],
-        responsible_person="Équipe CERT",
-    ),
-]
+    def close(self) -> None:
+        """Écrit les entrées d'audit en attente et ferme le journal d'audit."""
+        if self._audit_log is not None:
+            self._audit_log.close()
+
+    def __enter__(self) -> "EthicalFramework":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+# Définition de quelques activités de traitement préenregistrées pour BioCybe,
+# construites au premier appel seulement
+@functools.cache
+def default_processing_activities() -> tuple[DataProcessingActivity, ...]:
+    """Activités de traitement préenregistrées de BioCybe (tuple partagé)."""
+    return (
+        DataProcessingActivity(
+            name="Détection de comportements suspects",
+            purpose="Identification d'activités potentiellement malveillantes sur les systèmes",
+            data_categories=["Logs système", "Comportement utilisateur", "Activité réseau"],
+            legal_basis="Intérêt légitime",
+            retention_period="30 jours",
+            security_measures=["Chiffrement", "Contrôle d'accès", "Anonymisation"],
+            responsible_person="Responsable Sécurité",
+        ),
+        DataProcessingActivity(
+            name="Amélioration des modèles de détection",
+            purpose="Affiner les algorithmes pour réduire les faux positifs",
+            data_categories=["Alertes historiques", "Données d'apprentissage anonymisées"],
+            legal_basis="Consentement",
+            retention_period="1 an",
+            security_measures=["Anonymisation", "Agrégation", "Contrôle d'accès renforcé"],
+            responsible_person="Responsable IA",
+        ),
+        DataProcessingActivity(
+            name="Analyse forensique post-incident",
+            purpose="Investigation approfondie suite à un incident de sécurité confirmé",
+            data_categories=["Logs système", "Communication réseau", "Fichiers système"],
+            legal_basis="Intérêt légitime / Obligation légale",
+            retention_period="5 ans",
+            security_measures=["Chiffrement", "Cloisonnement", "Journalisation des accès"],
+            responsible_person="Équipe CERT",
+        ),
+    )
+
+
+def __getattr__(name: str):
+    # Compatibilité : DEFAULT_PROCESSING_ACTIVITIES n'est plus construit à l'import
+    if name == "DEFAULT_PROCESSING_ACTIVITIES":
+        return list(default_processing_activities())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
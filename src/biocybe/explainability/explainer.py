@@ -5,20 +5,182 @@ BioCybe - Explications des décisions d'IA
 
 Ce module fournit des classes pour rendre les décisions d'IA explicables
 et interprétables, en s'inspirant des principes de l'IA explicable (XAI).
+
+shap, lime, captum et matplotlib sont importés à la demande (construction
+des explainers, tracés) : l'import du module et le chemin des explications
+textuelles ne chargent que numpy.
 """
 
+import ctypes
+import functools
+import hashlib
 import logging
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
 
-import lime
-import lime.lime_tabular
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-import shap
-from captum.attr import DeepLift, GradientShap, IntegratedGradients
 
 logger = logging.getLogger(__name__)
 
+# Valeurs SHAP mémoïsées par contenu d'entrée (entrées LRU, taille max d'une entrée)
+SHAP_CACHE_SIZE = 1024
+SHAP_CACHE_MAX_BYTES = 64 * 1024
+
+
+@functools.cache
+def _cuda_device_available():
+    """
+    Vrai si un GPU CUDA est utilisable, détecté une seule fois par processus.
+
+    CUDA_PATH n'est en général pas défini sur les hôtes Linux : on interroge
+    cupy (dépendance de GPUTreeShap et cuML) s'il est installé, torch s'il est
+    déjà chargé (on ne paie pas son import), sinon directement le pilote
+    (libcuda / nvcuda) via cuInit et cuDeviceGetCount.
+    """
+    try:
+        import cupy
+
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception as e:
+        logger.debug(f"cupy CUDA probe failed: {e!s}")
+
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        try:
+            return bool(torch.cuda.is_available())
+        except Exception as e:
+            logger.debug(f"torch CUDA probe failed: {e!s}")
+
+    for name in ("libcuda.so.1", "libcuda.so", "nvcuda.dll"):
+        try:
+            driver = ctypes.CDLL(name)
+        except OSError:
+            continue
+        count = ctypes.c_int(0)
+        try:
+            return driver.cuInit(0) == 0 and (
+                driver.cuDeviceGetCount(ctypes.byref(count)) == 0 and count.value > 0
+            )
+        except Exception as e:
+            logger.debug(f"CUDA driver probe failed: {e!s}")
+            return False
+    return False
+
+
+def _make_tree_explainer(model, algorithm="v2"):
+    """
+    Construit l'explainer SHAP le plus rapide disponible pour un modèle d'arbres.
+
+    GPUTreeShap (shap.GPUTreeExplainer, puis cuML) n'est essayé que si un GPU
+    CUDA est détecté (voir _cuda_device_available) ; un échec de construction
+    retombe sur le CPU. Sur CPU,
+    FastTreeSHAP (`algorithm` : "v2" réutilise les calculs par chemin, "v1" a
+    l'empreinte mémoire de TreeSHAP) est préféré à shap.TreeExplainer.
+
+    Returns:
+        tuple: (explainer, nom du backend)
+    """
+    import shap
+
+    if _cuda_device_available():
+        try:
+            return shap.GPUTreeExplainer(model), "shap-gpu"
+        except Exception as e:
+            logger.debug(f"shap.GPUTreeExplainer unavailable: {e!s}")
+        try:
+            from cuml.explainer import TreeExplainer as CumlTreeExplainer
+
+            return CumlTreeExplainer(model=model), "cuml"
+        except Exception as e:
+            logger.debug(f"cuml TreeExplainer unavailable: {e!s}")
+
+    try:
+        from fasttreeshap import TreeExplainer as FastTreeExplainer
+
+        return FastTreeExplainer(model, algorithm=algorithm, n_jobs=-1), f"fasttreeshap-{algorithm}"
+    except Exception as e:
+        logger.debug(f"fasttreeshap unavailable: {e!s}")
+
+    return shap.TreeExplainer(model), "shap-cpu"
+
+
+def _as_float32(X):
+    """
+    Convertit une matrice float64 en float32 pour les explainers.
+
+    Les calculs par chemin (Tree/Deep SHAP) sont limités par la bande passante
+    mémoire : float32 divise le trafic par deux, sans effet notable sur le
+    classement des caractéristiques (les arbres sklearn travaillent déjà en
+    float32).
+    """
+    X = np.asarray(X)
+    if X.dtype == np.float64:
+        return X.astype(np.float32, copy=False)
+    return X
+
+
+def _model_fingerprint(model, explainer, background):
+    """
+    Empreinte du modèle, de l'explainer et du fond, préfixe des clés du cache SHAP.
+
+    Calculée à la construction des explainers : des modèles différents (ou un
+    modèle réentraîné) partageant un cache_dir ne se servent pas les valeurs
+    l'un de l'autre. None si le modèle n'est pas sérialisable.
+    """
+    try:
+        blob = pickle.dumps((type(explainer).__qualname__, model), pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        logger.warning(f"Model not picklable, SHAP disk cache disabled: {e!s}")
+        return None
+    digest = hashlib.sha256(blob)
+    digest.update(np.ascontiguousarray(background).tobytes())
+    return digest.hexdigest()
+
+
+def _first_class(shap_values):
+    """Valeurs SHAP de la première classe (liste par classe ou tableau (n, M, classes))."""
+    if isinstance(shap_values, list):
+        # Classification multi-classe
+        return shap_values[0]  # On prend la première classe pour simplifier
+    if getattr(shap_values, "ndim", 0) == 3:
+        return shap_values[..., 0]
+    return shap_values
+
+
+def _lime_features(lime_exp, num_features):
+    """Caractéristiques LIME (libellé discrétisé, poids signé), triées par |poids|."""
+    return [
+        {"feature": feature, "importance": weight}
+        for feature, weight in lime_exp.as_list()[:num_features]
+    ]
+
+
+def _top_feature_lines(features, k=5):
+    """
+    (rang, nom, direction, |importance| formatée) des k premières caractéristiques.
+
+    Les explications sont déjà classées par importance décroissante : leur ordre
+    est conservé, seuls valeur absolue, signe et précision d'affichage sont
+    calculés d'un bloc avec NumPy.
+    """
+    top = features[:k]
+    importance = np.fromiter((f["importance"] for f in top), dtype=np.float64, count=len(top))
+    magnitude = np.abs(importance)
+    # Direction de l'impact (positif ou négatif)
+    directions = np.where(importance > 0, "augmenté", "diminué").tolist()
+    # Formatage de l'importance pour la lisibilité
+    decimals = np.where(magnitude < 0.01, 6, 4).tolist()
+    return [
+        (rank, feature["feature"], direction, f"{value:.{digits}f}")
+        for rank, feature, direction, value, digits in zip(
+            range(1, len(top) + 1), top, directions, magnitude.tolist(), decimals, strict=True
+        )
+    ]
+
 
 class ExplainableDecision:
     """
@@ -27,7 +189,17 @@ class ExplainableDecision:
     pour l'expliquer.
     """
 
-    def __init__(self, model, model_type, feature_names=None):
+    def __init__(
+        self,
+        model,
+        model_type,
+        feature_names=None,
+        tree_algorithm="v2",
+        lime_num_samples=1000,
+        background_data=None,
+        cache_dir=None,
+        kernel_nsamples=256,
+    ):
         """
         Initialiser un objet ExplainableDecision.
 
@@ -35,46 +207,128 @@ class ExplainableDecision:
             model: Le modèle d'IA à expliquer
             model_type: Le type de modèle ('neural_network', 'tree', 'ensemble', etc.)
             feature_names: Liste des noms des fonctionnalités du modèle
+            tree_algorithm: Algorithme FastTreeSHAP des modèles d'arbres ("v2" le
+                plus rapide, "v1" si la mémoire est contrainte)
+            lime_num_samples: Nombre de perturbations LIME par explication (le
+                coût est linéaire ; 1000 suffit à stabiliser le classement des
+                premières caractéristiques)
+            background_data: Échantillon représentatif des données d'entrée
+                (résumé par shap.kmeans/shap.sample pour SHAP, brut pour les
+                intervalles de discrétisation LIME) ; à défaut, une ligne de zéros
+            cache_dir: Répertoire où persister les valeurs SHAP (fichiers .npy,
+                clés préfixées par l'empreinte du modèle)
+            kernel_nsamples: Nombre de coalitions échantillonnées par KernelSHAP
+                (None : 2M + 2048 de shap)
         """
         self.model = model
         self.model_type = model_type
         self.feature_names = feature_names
+        self.tree_algorithm = tree_algorithm
+        self.lime_num_samples = lime_num_samples
+        self.background_data = background_data
+        self.cache_dir = cache_dir
+        self.kernel_nsamples = kernel_nsamples
         self.explainers = {}
+        self._shap_cache = OrderedDict()
+        self._shap_cache_lock = threading.Lock()
+        # Empreinte du modèle pour le cache disque (None : cache disque inactif)
+        self._model_fingerprint = None
+        # Backend de l'explainer SHAP des modèles d'arbres (GPU ou CPU)
+        self.shap_backend = None
+        # KernelSHAP accepte nsamples/l1_reg, pas les autres explainers
+        self._kernel_shap = False
+        # Tree/Deep SHAP vérifient l'additivité, trop stricte pour des entrées float32
+        self._check_additivity_option = False
         self._initialize_explainers()
 
+    def __getstate__(self):
+        # Le verrou n'est pas sérialisable : une copie (worker joblib) repart d'un cache vide
+        state = self.__dict__.copy()
+        del state["_shap_cache_lock"]
+        state["_shap_cache"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shap_cache_lock = threading.Lock()
+
     def _initialize_explainers(self):
         """Initialise les explainers appropriés selon le type de modèle."""
+        if self.background_data is None:
+            logger.warning(
+                "No background_data provided: explainers use a single zero row, "
+                "Shapley estimates will be degenerate"
+            )
+            background = np.zeros((1, len(self.feature_names)))
+        else:
+            background = np.asarray(self.background_data)
+
         try:
             if "neural_network" in self.model_type:
                 # Explainers for neural networks
                 if hasattr(self.model, "predict"):
+                    import shap
+
                     self.explainers["shap"] = shap.DeepExplainer(
-                        self.model, np.zeros((1, len(self.feature_names)))
+                        self.model, shap.sample(_as_float32(background), 100)
                     )
+                    self._check_additivity_option = True
 
                     # Captum explainers (pour les modèles PyTorch)
                     if "torch" in str(type(self.model)):
+                        from captum.attr import DeepLift, GradientShap, IntegratedGradients
+
                         self.explainers["integrated_gradients"] = IntegratedGradients(self.model)
                         self.explainers["deep_lift"] = DeepLift(self.model)
                         self.explainers["gradient_shap"] = GradientShap(self.model)
 
             elif "tree" in self.model_type or "ensemble" in self.model_type:
                 # TreeExplainer for tree-based models (Random Forest, XGBoost, etc.)
-                self.explainers["shap"] = shap.TreeExplainer(self.model)
+                self.explainers["shap"], self.shap_backend = _make_tree_explainer(
+                    self.model, self.tree_algorithm
+                )
+                self._check_additivity_option = self.shap_backend != "cuml"
+                logger.info(f"Tree SHAP backend: {self.shap_backend}")
+
+            elif hasattr(self.model, "coef_") and hasattr(self.model, "intercept_"):
+                # LinearExplainer pour les modèles linéaires (GLM, SVM linéaire) :
+                # valeurs exactes en O(M), sans échantillonnage de coalitions
+                import shap
+
+                # Masker Impute (dépendance aux corrélations) : exige un vrai
+                # échantillon de fond, sinon caractéristiques indépendantes
+                if len(background) > 1:
+                    masker = shap.maskers.Impute(background)
+                else:
+                    masker = shap.maskers.Independent(background)
+                self.explainers["shap"] = shap.LinearExplainer(self.model, masker)
 
             else:
                 # KernelExplainer as a fallback for all models
+                import shap
+
+                # Résumé k-means : chaque coalition n'évalue le modèle que sur 10 centres
                 self.explainers["shap"] = shap.KernelExplainer(
-                    self.model.predict, np.zeros((1, len(self.feature_names)))
+                    self.model.predict, shap.kmeans(background, min(10, len(background)))
                 )
+                self._kernel_shap = True
+
+            # LIME explainer for all models : pas de sélection lasso_path/forward_selection,
+            # toutes les caractéristiques sont pondérées et le top-K est tronqué ensuite
+            import lime.lime_tabular
 
-            # LIME explainer for all models
             self.explainers["lime"] = lime.lime_tabular.LimeTabularExplainer(
-                np.zeros((1, len(self.feature_names))),
+                background,
                 feature_names=self.feature_names,
                 discretize_continuous=True,
+                feature_selection="none",
             )
 
+            if self.cache_dir:
+                self._model_fingerprint = _model_fingerprint(
+                    self.model, self.explainers.get("shap"), background
+                )
+
             logger.info(
                 f"Initialized explainers for {self.model_type} model: {list(self.explainers.keys())}"
             )
@@ -95,47 +349,27 @@ class ExplainableDecision:
             Un dictionnaire contenant les informations d'explication
         """
         explanation = {"method": method, "features": []}
+        input_data = np.asarray(input_data)
 
         try:
             if method == "shap" and "shap" in self.explainers:
                 # Calcul des valeurs SHAP
-                shap_values = self.explainers["shap"].shap_values(input_data)
-
-                # Format des données d'explication
-                if isinstance(shap_values, list):
-                    # Classification multi-classe
-                    shap_values = shap_values[0]  # On prend la première classe pour simplifier
-
-                # Création d'un DataFrame avec les valeurs d'importance
-                importance_df = pd.DataFrame(
-                    {
-                        "feature": self.feature_names,
-                        "importance": np.abs(shap_values).mean(axis=0)
-                        if len(shap_values.shape) > 1
-                        else np.abs(shap_values),
-                        "value": input_data[0] if input_data.ndim > 1 else input_data,
-                    }
-                )
-
-                # Tri par importance décroissante
-                importance_df = importance_df.sort_values("importance", ascending=False).head(
-                    num_features
-                )
+                shap_values = self._shap_values(input_data, num_features)
 
                 # Ajout à l'explication
-                explanation["features"] = importance_df.to_dict(orient="records")
-
-            elif method == "lime" and "lime" in self.explainers:
-                # Explication LIME
-                lime_exp = self.explainers["lime"].explain_instance(
+                explanation["features"] = self._rank_features(
+                    np.abs(shap_values).mean(axis=0)
+                    if len(shap_values.shape) > 1
+                    else np.abs(shap_values),
                     input_data[0] if input_data.ndim > 1 else input_data,
-                    self.model.predict_proba,
-                    num_features=num_features,
+                    num_features,
                 )
 
-                # Extraction des caractéristiques les plus importantes
-                features = lime_exp.as_list()
-                explanation["features"] = [{"feature": f[0], "importance": f[1]} for f in features]
+            elif method == "lime" and "lime" in self.explainers:
+                lime_exp = self._lime_explanation(
+                    input_data[0] if input_data.ndim > 1 else input_data, num_features
+                )
+                explanation["features"] = _lime_features(lime_exp, num_features)
 
             else:
                 raise ValueError(f"Unsupported explanation method: {method}")
@@ -150,6 +384,166 @@ class ExplainableDecision:
             explanation["error"] = str(e)
             return explanation
 
+    def explain_batch(self, X, method="shap", num_features=10):
+        """
+        Explique un lot de prédictions en un seul passage.
+
+        SHAP reçoit toute la matrice en un appel et vectorise sur les lignes
+        (FastTreeSHAP réutilise alors ses calculs par chemin) ; LIME explique
+        chaque ligne avec un seul appel predict_proba sur toutes ses
+        perturbations. L'importance globale du lot est agrégée en un seul
+        appel NumPy (moyenne des valeurs absolues).
+
+        Args:
+            X: Matrice des données d'entrée (une ligne par prédiction)
+            method: La méthode d'explication à utiliser ('shap' ou 'lime')
+            num_features: Nombre de caractéristiques par explication
+
+        Returns:
+            Un dictionnaire avec l'importance agrégée ('features') et une
+            explication par ligne ('rows', identique à explain_prediction sur
+            cette ligne : poids LIME signés et libellés discrétisés compris)
+        """
+        X = np.asarray(X)
+        batch = {"method": method, "features": [], "rows": []}
+
+        try:
+            if method == "shap" and "shap" in self.explainers:
+                importance = np.abs(self._shap_values(X, num_features))
+                rows = [
+                    self._rank_features(imp, row, num_features)
+                    for imp, row in zip(importance, X, strict=True)
+                ]
+
+            elif method == "lime" and "lime" in self.explainers:
+                # |poids| LIME replacés par indice de caractéristique (0 si non
+                # retenue) pour l'agrégat ; chaque ligne garde le format LIME
+                importance = np.zeros(X.shape, dtype=float)
+                rows = []
+                for i, row in enumerate(X):
+                    lime_exp = self._lime_explanation(row, num_features)
+                    weights = next(iter(lime_exp.as_map().values()))[:num_features]
+                    for index, weight in weights:
+                        importance[i, index] = abs(weight)
+                    rows.append(_lime_features(lime_exp, num_features))
+
+            else:
+                raise ValueError(f"Unsupported explanation method: {method}")
+
+            batch["features"] = self._rank_features(
+                importance.mean(axis=0), X.mean(axis=0), num_features
+            )
+            batch["rows"] = [{"method": method, "features": features} for features in rows]
+            logger.info(f"Generated {len(batch['rows'])} {method} explanations in one batch")
+            return batch
+
+        except Exception as e:
+            logger.error(f"Error generating batch explanation: {e!s}")
+            batch["error"] = str(e)
+            return batch
+
+    def _lime_explanation(self, row, num_features):
+        """Explication LIME d'une ligne (un seul appel predict_proba sur les perturbations)."""
+        return self.explainers["lime"].explain_instance(
+            row,
+            self.model.predict_proba,
+            num_features=num_features,
+            num_samples=self.lime_num_samples,
+        )
+
+    def _shap_options(self, num_features):
+        """
+        Options passées à shap_values selon l'explainer.
+
+        KernelSHAP : nsamples borne le nombre de coalitions ; l1_reg="num_features(K)"
+        ne résout la régression pondérée que sur les K caractéristiques retenues.
+        Tree/Deep SHAP : check_additivity=False, la tolérance float32 étant plus
+        lâche que celle du contrôle d'additivité.
+        """
+        if self._check_additivity_option:
+            return {"check_additivity": False}
+        if not self._kernel_shap:
+            return {}
+        options = {}
+        if self.kernel_nsamples is not None:
+            options["nsamples"] = self.kernel_nsamples
+        if num_features < len(self.feature_names):
+            options["l1_reg"] = f"num_features({num_features})"
+        return options
+
+    def _shap_values(self, X, num_features):
+        """
+        Valeurs SHAP de X (première classe), mémoïsées par contenu.
+
+        Une entrée déjà expliquée (avec les mêmes options KernelSHAP) est servie
+        depuis le cache LRU en mémoire puis, si cache_dir est défini, depuis un
+        fichier .npy relu sans pickle (allow_pickle=False). Les matrices de plus
+        de SHAP_CACHE_MAX_BYTES ne sont pas mises en cache. Seule la copie
+        passée à l'explainer est convertie en float32 : les valeurs rapportées
+        par les explications restent celles de l'appelant.
+        """
+        X = _as_float32(X)
+        options = self._shap_options(num_features)
+        if X.nbytes > SHAP_CACHE_MAX_BYTES:
+            return _first_class(self.explainers["shap"].shap_values(X, **options))
+
+        key = hashlib.sha256(
+            f"{self._model_fingerprint}{X.dtype.str}{X.shape}{sorted(options.items())}".encode()
+            + X.tobytes()
+        ).hexdigest()
+        with self._shap_cache_lock:
+            values = self._shap_cache.get(key)
+            if values is not None:
+                self._shap_cache.move_to_end(key)
+                return values
+
+        path = None
+        if self.cache_dir and self._model_fingerprint is not None:
+            path = Path(self.cache_dir) / f"shap-{key}.npy"
+        if path is not None and path.is_file():
+            values = np.load(path, allow_pickle=False)
+        else:
+            values = np.asarray(
+                _first_class(self.explainers["shap"].shap_values(X, **options)), dtype=np.float64
+            )
+            if path is not None:
+                # Écriture atomique : un lecteur concurrent ne voit jamais de fichier partiel
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+                with open(tmp, "wb") as f:
+                    np.save(f, values, allow_pickle=False)
+                os.replace(tmp, path)
+
+        with self._shap_cache_lock:
+            self._shap_cache[key] = values
+            while len(self._shap_cache) > SHAP_CACHE_SIZE:
+                self._shap_cache.popitem(last=False)
+        return values
+
+    def _rank_features(self, importance, values, num_features):
+        """
+        Caractéristiques triées par importance décroissante (les num_features premières).
+
+        Sélection du top-K par argpartition (O(M)) puis tri des seuls K retenus,
+        sans passer par un DataFrame pandas.
+        """
+        importance = np.asarray(importance, dtype=np.float64)
+        if num_features <= 0:
+            return []
+        if num_features < len(importance):
+            idx = np.argpartition(-importance, num_features - 1)[:num_features]
+        else:
+            idx = np.arange(len(importance))
+        idx = idx[np.argsort(-importance[idx], kind="stable")]
+        return [
+            {
+                "feature": self.feature_names[i],
+                "importance": float(importance[i]),
+                "value": float(values[i]),
+            }
+            for i in idx.tolist()
+        ]
+
     def generate_explanation_text(self, explanation):
         """
         Génère une explication en langage naturel à partir des données d'explication.
@@ -172,22 +566,12 @@ class ExplainableDecision:
             # Ajoute les caractéristiques les plus importantes
             text.append("Facteurs les plus importants dans cette décision:")
 
-            for i, feature in enumerate(explanation["features"][:5]):  # Top 5 features
-                importance = abs(feature["importance"])
-                feature_name = feature["feature"]
-
-                # Formatage de l'importance pour la lisibilité
-                if importance < 0.01:
-                    importance_str = f"{importance:.6f}"
-                else:
-                    importance_str = f"{importance:.4f}"
-
-                # Direction de l'impact (positif ou négatif)
-                direction = "augmenté" if feature["importance"] > 0 else "diminué"
-
-                text.append(
-                    f"  {i + 1}. {feature_name}: a {direction} le risque (importance: {importance_str})"
+            text.extend(
+                f"  {rank}. {name}: a {direction} le risque (importance: {importance_str})"
+                for rank, name, direction, importance_str in _top_feature_lines(
+                    explanation["features"]
                 )
+            )
 
             return "\n".join(text)
 
@@ -213,6 +597,8 @@ class DecisionVisualizer:
 
     def _set_plot_style(self):
         """Configure le style des graphiques selon le mode."""
+        import matplotlib.pyplot as plt
+
         if self.dark_mode:
             plt.style.use("dark_background")
         else:
@@ -232,6 +618,8 @@ class DecisionVisualizer:
         Returns:
             matplotlib.figure.Figure: La figure générée
         """
+        import matplotlib.pyplot as plt
+
         try:
             fig, ax = plt.subplots(figsize=figsize)
 
@@ -264,21 +652,28 @@ class DecisionVisualizer:
             )
             return fig
 
-    def plot_shap_summary(self, explainer, X_sample, max_display=20):
+    def plot_shap_summary(self, explainer, X_sample, shap_values=None, max_display=20):
         """
         Génère un résumé SHAP pour un ensemble de données.
 
         Args:
             explainer: Un explainer SHAP initialisé
             X_sample: Échantillon de données pour l'explication
+            shap_values: Valeurs SHAP déjà calculées pour X_sample (évite un
+                second calcul, coûteux avec KernelSHAP) ; calculées si None
             max_display: Nombre maximum de caractéristiques à afficher
 
         Returns:
             matplotlib.figure.Figure: La figure générée
         """
+        import matplotlib.pyplot as plt
+
         try:
-            # Calcul des valeurs SHAP
-            shap_values = explainer.shap_values(X_sample)
+            import shap
+
+            # Calcul des valeurs SHAP (sauf si déjà fournies)
+            if shap_values is None:
+                shap_values = explainer.shap_values(X_sample)
 
             # Création de la figure
             fig = plt.figure(figsize=(10, 8))
@@ -322,6 +717,8 @@ class DecisionVisualizer:
         Returns:
             matplotlib.figure.Figure: La figure générée
         """
+        import matplotlib.pyplot as plt
+
         try:
             from sklearn.tree import plot_tree
 
@@ -357,7 +754,15 @@ class ThreatExplainer:
     Classe spécialisée pour expliquer les détections de menaces.
     """
 
-    def __init__(self, detection_model, feature_names, threshold=0.5):
+    def __init__(
+        self,
+        detection_model,
+        feature_names,
+        threshold=0.5,
+        background_data=None,
+        explainable_decision=None,
+        model_type="neural_network",
+    ):
         """
         Initialise l'expliqueur de menaces.
 
@@ -365,13 +770,21 @@ class ThreatExplainer:
             detection_model: Le modèle de détection de menaces
             feature_names: Noms des caractéristiques utilisées par le modèle
             threshold: Seuil de décision pour la classification des menaces
+            background_data: Échantillon représentatif du trafic (voir ExplainableDecision)
+            explainable_decision: ExplainableDecision déjà construite pour ce
+                modèle, partagée entre expliqueurs pour ne pas reconstruire ses
+                explainers (à recréer si le modèle est réentraîné)
+            model_type: Type du modèle de détection ('tree', 'neural_network',
+                'linear', etc.), ignoré si explainable_decision est fourni
         """
         self.model = detection_model
         self.feature_names = feature_names
         self.threshold = threshold
-        self.explainable_decision = ExplainableDecision(
-            detection_model, "neural_network", feature_names
-        )
+        if explainable_decision is None:
+            explainable_decision = ExplainableDecision(
+                detection_model, model_type, feature_names, background_data=background_data
+            )
+        self.explainable_decision = explainable_decision
 
     def explain_threat_detection(self, input_data, explanation_method="shap"):
         """
@@ -419,6 +832,34 @@ class ThreatExplainer:
 
         return threat_explanation
 
+    def batch_explain_threats(self, X, explanation_method="shap", n_jobs=-1):
+        """
+        Explique un lot de détections en parallèle, une tâche joblib par ligne.
+
+        Les explainers SHAP d'arbres libèrent le GIL : les lignes sont réparties
+        sur des threads qui partagent modèle et explainers. KernelSHAP, DeepSHAP
+        et LIME bouclent en Python autour de predict : les lignes partent dans
+        des processus loky, au prix d'une copie du modèle et des explainers
+        (et d'un cache SHAP vide) par worker.
+
+        Args:
+            X: Matrice des données d'entrée (une ligne par détection)
+            explanation_method: Méthode d'explication à utiliser
+            n_jobs: Nombre de workers joblib (-1 : tous les cœurs)
+
+        Returns:
+            list: Une explication (format explain_threat_detection) par ligne
+        """
+        from joblib import Parallel, delayed
+
+        X = np.asarray(X)
+        tree_shap = explanation_method == "shap" and self.explainable_decision.shap_backend
+        prefer = "threads" if tree_shap else "processes"
+        return Parallel(n_jobs=n_jobs, prefer=prefer)(
+            delayed(self.explain_threat_detection)(X[i : i + 1], explanation_method)
+            for i in range(len(X))
+        )
+
     def generate_threat_explanation_text(self, threat_explanation):
         """
         Génère une explication en langage naturel pour une détection de menace.
@@ -447,12 +888,12 @@ class ThreatExplainer:
             ]
 
         # Ajouter les facteurs les plus importants
-        for i, feature in enumerate(threat_explanation["explanation"]["features"][:5]):
-            feature_name = feature["feature"]
-            importance = feature["importance"]
-            direction = "augmenté" if importance > 0 else "diminué"
-
-            text.append(f"  {i + 1}. {feature_name}: a {direction} le niveau de risque")
+        text.extend(
+            f"  {rank}. {name}: a {direction} le niveau de risque"
+            for rank, name, direction, _ in _top_feature_lines(
+                threat_explanation["explanation"]["features"]
+            )
+        )
 
         # Ajouter des conseils si c'est une menace
         if is_threat:
@@ -0,0 +1,195 @@
+"""Journalisation par défaut de BioCybe (console + biocybe.log).
+
+Les threads applicatifs (dispatcher du noyau, workers des cellules, watcher)
+ne font jamais d'E/S de log eux-mêmes : le logger racine porte un
+`QueueHandler` qui se contente d'empiler le record, et un `QueueListener`
+dédié possède les vrais handlers (console et fichier).
+
+Côté fichier, les records sont tamponnés puis écrits par lots :
+  - un seul `writev()` par lot sur un descripteur O_APPEND ;
+  - flush immédiat pour WARNING et plus (les alertes partent tout de suite
+    vers le SIEM), et au plus tard `flush_interval` secondes après le plus
+    ancien record en attente — y compris si plus aucun record n'arrive :
+    le listener vide alors le tampon à l'expiration du délai ;
+  - vidage complet à la sortie du processus (atexit).
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import time
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DEFAULT_LOG_FILE = "biocybe.log"
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter texte qui n'appelle strftime qu'une fois par seconde.
+
+    Sortie identique à `logging.Formatter` (asctime = "YYYY-mm-dd HH:MM:SS,mmm") :
+    seul le préfixe à la seconde est mis en cache, les millisecondes sont
+    ajoutées à chaque record.
+    """
+
+    def __init__(self, fmt: str | None = None):
+        super().__init__(fmt)
+        # (seconde, préfixe) remplacé d'un bloc : lecture cohérente entre threads
+        self._time_cache: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        if datefmt is not None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached = self._time_cache
+        if cached[0] != second:
+            cached = (second, time.strftime(self.default_time_format, self.converter(second)))
+            self._time_cache = cached
+        if self.default_msec_format:
+            return self.default_msec_format % (cached[1], record.msecs)
+        return cached[1]
+
+
+class BufferedLogHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler qui écrit par lots, sans retarder les alertes.
+
+    Flush quand le tampon est plein, dès qu'un record >= flushLevel arrive,
+    ou quand le plus ancien record en attente a plus de `flush_interval`
+    secondes (un `tail -f` ne reste jamais muet longtemps).
+    """
+
+    def __init__(self, capacity, flushLevel, target, flush_interval: float = 1.0):
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self.flush_interval = flush_interval
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return (
+            super().shouldFlush(record)
+            or record.created - self.buffer[0].created >= self.flush_interval
+        )
+
+    def flush(self) -> None:
+        emit_batch = getattr(self.target, "emit_batch", None)
+        if emit_batch is None:
+            super().flush()
+            return
+        self.acquire()
+        try:
+            if self.buffer:
+                emit_batch(self.buffer)
+                self.buffer.clear()
+        finally:
+            self.release()
+
+
+class WritevFileHandler(logging.FileHandler):
+    """FileHandler qui écrit un lot de records en un seul appel système.
+
+    Le fichier est ouvert en mode "a" (O_APPEND) : chaque writev() est ajouté
+    d'un bloc en fin de fichier, sans entrelacement avec un autre écrivain.
+    Repli sur un unique os.write() des données concaténées là où writev
+    n'existe pas (Windows).
+    """
+
+    def emit_batch(self, records: list[logging.LogRecord]) -> None:
+        chunks = []
+        for record in records:
+            if not self.filter(record):
+                continue
+            try:
+                line = self.format(record) + self.terminator
+                chunks.append(line.encode(self.encoding or "utf-8", self.errors or "strict"))
+            except Exception:
+                self.handleError(record)
+        if not chunks:
+            return
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.flush()  # rien ne doit rester dans le tampon texte
+            write_all(self.stream.fileno(), chunks)
+        except Exception:
+            self.handleError(records[-1])
+        finally:
+            self.release()
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener qui vide les tampons quand la file reste inactive.
+
+    Sans record entrant, `BufferedLogHandler.shouldFlush` n'est jamais
+    réévalué : des lignes INFO resteraient en mémoire indéfiniment. Tant
+    qu'un handler a un tampon non vide, l'attente sur la file est bornée à
+    `flush_interval` ; sinon le thread dort sans timeout (aucun réveil
+    périodique à vide).
+    """
+
+    def __init__(self, log_queue, *handlers, respect_handler_level=False, flush_interval=1.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        if not block:
+            return self.queue.get(block)
+        while True:
+            pending = [h for h in self.handlers if getattr(h, "buffer", None)]
+            try:
+                return self.queue.get(timeout=self.flush_interval if pending else None)
+            except queue.Empty:
+                for handler in pending:
+                    handler.flush()
+
+
+def write_all(fd: int, chunks: list[bytes]) -> None:
+    """Écrit `chunks` sur `fd` en un writev(), complété si l'écriture est partielle."""
+    if hasattr(os, "writev"):
+        written = os.writev(fd, chunks)
+        total = sum(len(c) for c in chunks)
+        if written == total:
+            return
+        # Écriture partielle (disque plein, signal...) : on complète
+        data = memoryview(b"".join(chunks))[written:]
+    else:
+        data = memoryview(b"".join(chunks))
+    while data:
+        data = data[os.write(fd, data) :]
+
+
+def configure_logging(
+    log_file: str = DEFAULT_LOG_FILE, level: int = logging.INFO
+) -> logging.handlers.QueueListener | None:
+    """Installe la journalisation BioCybe sur le logger racine.
+
+    Comme `logging.basicConfig`, sans effet si le logger racine a déjà des
+    handlers (application hôte, pytest, second appel). Retourne le
+    `QueueListener` démarré, ou None si rien n'a été installé.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return None
+
+    formatter = CachedTimeFormatter(LOG_FORMAT)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    # encoding="utf-8" explicite : sinon Windows utilise cp1252 par défaut et
+    # casse les accents — donc logs illisibles dans un SIEM Linux qui s'attend
+    # à de l'UTF-8.
+    file_handler = WritevFileHandler(log_file, encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    buffered = BufferedLogHandler(256, flushLevel=logging.WARNING, target=file_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = FlushingQueueListener(
+        log_queue, stream_handler, buffered, respect_handler_level=True
+    )
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    listener.start()
+    # atexit est LIFO : ce stop() (vide la file) passe avant logging.shutdown(),
+    # qui flushe ensuite le tampon fichier.
+    atexit.register(listener.stop)
+    return listener
@@ -23,6 +23,7 @@ import yara  # Nécessite l'installation de yara-python
 
 # Import des classes du noyau BioCybe
 from ..biocybe_core import BiologicalCell, CellMessage
+from ..severity import severity_rank
 
 # Configuration du logger
 logger = logging.getLogger("biocybe.b_cell")
@@ -598,9 +599,9 @@ class BCell(BiologicalCell):
                 if is_malicious_yara:
                     result.is_malicious = True
 
-                    # Analyse des résultats YARA
-                    severities = []
-                    families = []
+                    # Analyse des résultats YARA, en un seul passage
+                    best_severity, best_rank = None, -1
+                    family_counts: dict[str, int] = {}
 
                     for match in yara_matches:
                         result.matched_rules.append(match)
@@ -608,29 +609,22 @@ class BCell(BiologicalCell):
                         # Extraction des métadonnées
                         meta = match.get("meta", {})
                         if "severity" in meta:
-                            severities.append(meta["severity"])
+                            severity = meta["severity"]
+                            rank = severity_rank(severity)
+                            if rank > best_rank:
+                                best_severity, best_rank = severity, rank
 
                         if "family" in meta:
-                            families.append(meta["family"])
-
-                    # Détermination de la famille
-                    if families:
-                        # Prendre la famille la plus fréquente
-                        from collections import Counter
-
-                        family_counts = Counter(families)
-                        result.malware_family = family_counts.most_common(1)[0][0]
-
-                    # Détermination de la sévérité
-                    if severities:
-                        severity_order = {
-                            "critical": 4,
-                            "high": 3,
-                            "medium": 2,
-                            "low": 1,
-                            "unknown": 0,
-                        }
-                        result.severity = max(severities, key=lambda s: severity_order.get(s, 0))
+                            family = meta["family"]
+                            family_counts[family] = family_counts.get(family, 0) + 1
+
+                    # Famille la plus fréquente : max() sur les familles distinctes
+                    # retient la première rencontrée en cas d'égalité
+                    if family_counts:
+                        result.malware_family = max(family_counts, key=family_counts.__getitem__)
+
+                    if best_severity is not None:
+                        result.severity = best_severity
 
                     # Confiance basée sur le nombre de règles correspondantes
                     result.confidence = min(0.95, len(yara_matches) / 10.0 + 0.5)
@@ -703,7 +697,7 @@ class BCell(BiologicalCell):
             f"Alerte malware émise pour {file_path}: {result.malware_family} "
             f"(Sévérité: {result.severity}, Confiance: {result.confidence:.2f})"
         )
-        self.stats["actions_performed"] += 1
+        self.stats.actions_performed += 1
 
     def _handle_scan_request(self, message: CellMessage):
         """
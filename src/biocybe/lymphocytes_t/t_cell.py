@@ -528,12 +528,12 @@ class TCell(BiologicalCell):
           - state=armed : collecte, évalue, alerte si anomalie + cooldown OK.
           - state=disarmed : ne fait rien (laisse l'opérateur intervenir).
 
-        Le pacing est fait via _stop_event.wait(scan_interval) pour réagir
-        immédiatement à un stop.
+        Le pacing est fait via _pause(scan_interval) : réaction immédiate à
+        un stop, et messages reçus traités sans attendre le cycle suivant.
         """
         try:
             if self.state == "disarmed":
-                self._stop_event.wait(self.scan_interval)
+                self._pause(self.scan_interval)
                 return
 
             sample = self.collect_one()
@@ -557,7 +557,7 @@ class TCell(BiologicalCell):
         except Exception as exc:
             self.logger.error("Cycle TCell %s : %s", self.name, exc)
         finally:
-            self._stop_event.wait(self.scan_interval)
+            self._pause(self.scan_interval)
 
     def _maybe_alert(self, explanation: AnomalyExplanation) -> None:
         """Envoie une alerte au bus, avec cooldown anti-storm."""
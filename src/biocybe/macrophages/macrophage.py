@@ -474,13 +474,13 @@ class MacrophageCell(BiologicalCell):
 
                 # Stocker les anomalies trouvées
                 self.anomalies_found.extend(anomalies)
-                self.stats["actions_performed"] += 1
+                self.stats.actions_performed += 1
 
             else:
                 self.logger.debug("Aucune anomalie détectée")
 
                 # Périodiquement, envoyer un rapport de santé
-                if self.stats["actions_performed"] % 10 == 0:
+                if self.stats.actions_performed % 10 == 0:
                     self.send_message(
                         msg_type="system_health",
                         target="broadcast",
@@ -533,7 +533,7 @@ class MacrophageCell(BiologicalCell):
             },
         )
 
-        self.stats["actions_performed"] += 1
+        self.stats.actions_performed += 1
         self.last_scan_time = datetime.now()
 
     def _handle_system_start(self, message: CellMessage):
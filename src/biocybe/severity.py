@@ -0,0 +1,16 @@
+"""Niveaux de sévérité des signatures, partagés par les détecteurs.
+
+Module sans dépendance ni effet de bord à l'import : les Lymphocytes B et
+le détecteur de signatures héritage s'appuient sur le même classement pour
+retenir la sévérité la plus haute parmi les règles correspondantes.
+"""
+
+from __future__ import annotations
+
+# Rang des niveaux de sévérité (valeur inconnue : 0), pour retenir la plus haute
+SEVERITY_ORDER = {"critical": 4, "high": 3, "medium": 2, "low": 1, "unknown": 0}
+
+
+def severity_rank(severity: str) -> int:
+    """Rang d'un niveau de sévérité (0 si inconnu)."""
+    return SEVERITY_ORDER.get(severity, 0)
@@ -0,0 +1,225 @@
+"""Tests des helpers de démarrage du CLI (config, arborescence, niveau de log).
+
+Tests réels :
+  - premier chargement : parse YAML + écriture du cache à côté du fichier
+  - second chargement : servi depuis le cache (YAML non relu)
+  - modification du YAML : cache invalidé (fingerprint mtime+taille)
+  - cache corrompu : repli silencieux sur le parse YAML
+  - dossier non inscriptible / fichier absent : jamais fatal
+  - arborescence de travail : créée une fois, no-op ensuite
+  - niveau de log et section `core:` résolus depuis la config, intervalle de
+    sauvegarde nul, négatif, vide ou non numérique refusé (le daemon rapporte
+    une configuration invalide)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    p = tmp_path / "biocybe.yaml"
+    p.write_text("core:\n  log_level: INFO\n  state_save_interval: 42\n", encoding="utf-8")
+    return p
+
+
+def _cache_path(config_file: Path) -> Path:
+    from biocybe.config_loader import CONFIG_CACHE_SUFFIX
+
+    return Path(str(config_file) + CONFIG_CACHE_SUFFIX)
+
+
+def test_first_load_parses_and_writes_cache(config_file):
+    from biocybe.cli import _load_config
+
+    cfg = _load_config(str(config_file))
+    assert cfg == {"core": {"log_level": "INFO", "state_save_interval": 42}}
+    assert _cache_path(config_file).exists()
+
+
+def test_second_load_served_from_cache(config_file, monkeypatch):
+    from biocybe import cli, config_loader
+
+    first = cli._load_config(str(config_file))
+
+    def _boom(*_a, **_kw):
+        raise AssertionError("le YAML ne doit pas être reparsé")
+
+    monkeypatch.setattr(config_loader.yaml, "load", _boom)
+    assert cli._load_config(str(config_file)) == first
+
+
+def test_cache_invalidated_when_yaml_changes(config_file):
+    from biocybe.cli import _load_config
+
+    _load_config(str(config_file))
+    config_file.write_text("core:\n  state_save_interval: 7\n", encoding="utf-8")
+    # Force un mtime différent même sur les FS à faible résolution
+    st = config_file.stat()
+    os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert _load_config(str(config_file)) == {"core": {"state_save_interval": 7}}
+
+
+def test_corrupted_cache_falls_back_to_yaml(config_file):
+    from biocybe.cli import _load_config
+
+    _load_config(str(config_file))
+    _cache_path(config_file).write_bytes(b"pas un cache valide")
+    assert _load_config(str(config_file))["core"]["state_save_interval"] == 42
+
+
+def test_cache_is_plain_json(config_file):
+    from biocybe.cli import _load_config
+
+    _load_config(str(config_file))
+    data = json.loads(_cache_path(config_file).read_text(encoding="utf-8"))
+    assert data["config"]["core"]["state_save_interval"] == 42
+    assert len(data["fingerprint"]) == 2
+
+
+def test_cache_roundtrip_without_orjson(config_file, monkeypatch):
+    from biocybe import cli, config_loader
+
+    monkeypatch.setattr(config_loader, "_orjson", None)
+    first = cli._load_config(str(config_file))
+    monkeypatch.setattr(config_loader.yaml, "load", lambda *_a, **_kw: pytest.fail("YAML reparsé"))
+    assert cli._load_config(str(config_file)) == first
+
+
+def test_yaml_without_json_equivalent_is_not_cached(tmp_path):
+    from biocybe.cli import _load_config
+
+    p = tmp_path / "ports.yaml"
+    p.write_text("ports:\n  443: https\nsince: 2024-01-01\n", encoding="utf-8")
+    cfg = _load_config(str(p))
+    assert cfg["ports"] == {443: "https"}
+    assert not _cache_path(p).exists()
+    # Rechargement : toujours les types YAML d'origine
+    assert _load_config(str(p))["ports"] == {443: "https"}
+
+
+def test_missing_config_returns_none(tmp_path):
+    from biocybe.cli import _load_config
+
+    assert _load_config(str(tmp_path / "absent.yaml")) is None
+
+
+def test_unwritable_cache_dir_is_not_fatal(config_file, monkeypatch):
+    from biocybe import cli, config_loader
+
+    def _deny(*_a, **_kw):
+        raise PermissionError("lecture seule")
+
+    monkeypatch.setattr(config_loader.tempfile, "mkstemp", _deny)
+    assert cli._load_config(str(config_file))["core"]["log_level"] == "INFO"
+    assert not _cache_path(config_file).exists()
+
+
+# --------------------------------------------------------------------- #
+# Arborescence de travail du daemon
+# --------------------------------------------------------------------- #
+
+
+def test_required_directories_created_with_parents(tmp_path, monkeypatch):
+    from biocybe.cli import _REQUIRED_DIRECTORIES, _create_required_directories
+
+    monkeypatch.chdir(tmp_path)
+    _create_required_directories()
+    for d in (*_REQUIRED_DIRECTORIES, "db", "db/signatures", "models", "rules", "templates"):
+        assert (tmp_path / d).is_dir(), d
+
+
+def test_required_directories_noop_when_present(tmp_path, monkeypatch):
+    from biocybe import cli
+
+    monkeypatch.chdir(tmp_path)
+    cli._create_required_directories()
+
+    def _boom(*_a, **_kw):
+        raise AssertionError("makedirs ne doit pas être appelé")
+
+    monkeypatch.setattr(cli.os, "makedirs", _boom)
+    cli._create_required_directories()
+
+
+# --------------------------------------------------------------------- #
+# Section core : niveau de log, réglages du daemon
+# --------------------------------------------------------------------- #
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("debug", logging.DEBUG), ("WARN", logging.WARNING), ("bogus", logging.INFO)],
+)
+def test_setup_logging_level_from_config(value, expected, monkeypatch):
+    from biocybe import cli
+
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    previous = (root.level, cli.logger.level)
+    try:
+        cli._setup_logging_from_config({"core": {"log_level": value}})
+        assert root.level == expected
+    finally:
+        root.setLevel(previous[0])
+        cli.logger.setLevel(previous[1])
+
+
+def test_core_settings_resolved_once_and_frozen():
+    import dataclasses
+
+    from biocybe.cli import _CoreSettings
+
+    s = _CoreSettings.from_config(
+        {"core": {"state_save_interval": 30, "watch_directories": ["/a", "/b"]}}
+    )
+    assert s.state_save_interval == 30.0
+    assert s.watch_directories == ("/a", "/b")
+    assert s.log_level == "INFO"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        s.log_level = "DEBUG"
+
+
+def test_core_settings_tolerates_empty_core_section():
+    from biocybe.cli import _CoreSettings
+
+    assert _CoreSettings.from_config({"core": None}) == _CoreSettings()
+    assert _CoreSettings.from_config({}) == _CoreSettings()
+
+
+@pytest.mark.parametrize("interval", [0, -5])
+def test_core_settings_rejects_non_positive_save_interval(interval):
+    from biocybe.cli import _CoreSettings
+
+    with pytest.raises(ValueError, match="state_save_interval"):
+        _CoreSettings.from_config({"core": {"state_save_interval": interval}})
+
+
+@pytest.mark.parametrize("interval", [None, "souvent", [5]])
+def test_core_settings_rejects_non_numeric_save_interval(interval):
+    from biocybe.cli import _CoreSettings
+
+    with pytest.raises(ValueError, match="state_save_interval"):
+        _CoreSettings.from_config({"core": {"state_save_interval": interval}})
+
+
+def test_daemon_reports_null_save_interval_as_invalid_config(tmp_path, caplog):
+    import argparse
+
+    from biocybe.cli import cmd_daemon
+
+    config_file = tmp_path / "biocybe.yaml"
+    config_file.write_text("core:\n  state_save_interval:\n", encoding="utf-8")
+    with caplog.at_level(logging.ERROR):
+        assert cmd_daemon(argparse.Namespace(config=str(config_file))) == 1
+    assert "state_save_interval" in caplog.text
@@ -0,0 +1,608 @@
+"""Tests du noyau BioCybe : enregistrement des cellules et bus de messages.
+
+Tests réels :
+  - register_cells : lot enregistré, index par type, doublons ignorés
+  - les cellules enregistrées envoient réellement sur le bus du noyau
+  - bus : ordre priorité puis FIFO, attente bornée, réveil inter-threads
+  - distribution par lots : regroupement par cellule, ordre conservé, alertes
+  - listes de diffusion limitées aux abonnés, mises en cache et invalidées
+  - worker : messages traités dans le thread de la cellule, arrêt immédiat,
+    réactif pendant le pacing (_pause), lots remis pendant la vidange
+    finale traités par le worker dans l'ordre, lots tardifs traités en ligne ;
+    cellule purement réactive : aucun thread
+  - save_status : JSON valide (orjson ou stdlib), écriture atomique
+  - get_status : polls rapprochés servis depuis le cache, invalidé au besoin ;
+    modifier un résultat ne touche pas les appels suivants
+  - chargement des modules : modules en erreur ignorés, ordre conservé
+  - arrêt : system_stop distribué avant l'arrêt des cellules, sans attente fixe
+  - configuration : chargeur partagé avec le CLI (cache JSON), défauts sinon
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+
+@pytest.fixture
+def core(tmp_path):
+    from biocybe.biocybe_core import BioCybeCore
+
+    return BioCybeCore(config_path=str(tmp_path / "absent.yaml"))
+
+
+def _cell(name: str, cell_type: str = "test"):
+    from biocybe.biocybe_core import BiologicalCell
+
+    return BiologicalCell(name, cell_type)
+
+
+def _busy_cell(name: str):
+    """Cellule avec une activité propre (donc un thread de travail)."""
+    from biocybe.biocybe_core import BiologicalCell
+
+    class _Busy(BiologicalCell):
+        def _process_cycle(self):
+            pass
+
+    cell = _Busy(name, "test")
+    cell.tick_interval = 60.0  # aucun cycle ne doit réveiller le worker
+    return cell
+
+
+# --------------------------------------------------------------------- #
+# Enregistrement
+# --------------------------------------------------------------------- #
+
+
+def test_register_cells_bulk(core):
+    n = core.register_cells([_cell("a"), _cell("b"), _cell("c", "other")])
+    assert n == 3
+    assert set(core.cells) == {"a", "b", "c"}
+    assert core.cell_types == {"test": ["a", "b"], "other": ["c"]}
+    assert core.stats["cells_loaded"] == 3
+
+
+def test_register_cells_skips_duplicates(core):
+    core.register_cell(_cell("a"))
+    n = core.register_cells(_cell(name) for name in ("a", "b", "b"))
+    assert n == 1
+    assert core.cell_types["test"] == ["a", "b"]
+
+
+def test_registered_cell_sends_on_core_bus(core):
+    cell = _cell("a")
+    core.register_cells([cell])
+    assert cell.send_message("ping", payload={"x": 1}) is True
+    message = core.message_bus.get_nowait()
+    assert message.msg_type == "ping"
+    assert message.source == "a"
+    assert cell.stats.messages_sent == 1
+
+
+# --------------------------------------------------------------------- #
+# Bus de messages
+# --------------------------------------------------------------------- #
+
+
+def _msg(msg_type: str, priority: int = 1):
+    from biocybe.biocybe_core import CellMessage
+
+    return CellMessage(msg_type=msg_type, source="t", priority=priority)
+
+
+def test_bus_orders_by_priority_then_fifo():
+    from biocybe.biocybe_core.core import MessageBus
+
+    bus = MessageBus()
+    for t, p in (("low1", 1), ("high", 5), ("low2", 1), ("mid", 3)):
+        bus.put(_msg(t, p))
+    assert bus.qsize() == 4
+    assert [bus.get_nowait().msg_type for _ in range(4)] == ["high", "mid", "low1", "low2"]
+    assert bus.empty()
+
+
+def test_bus_never_compares_messages():
+    from biocybe.biocybe_core.core import MessageBus
+
+    a, b = _msg("a", 2), _msg("b", 2)
+    with pytest.raises(TypeError):
+        _ = a < b  # plus d'ordre implicite entre messages
+    bus = MessageBus()
+    bus.put(a)
+    bus.put(b)
+    assert [bus.get_nowait(), bus.get_nowait()] == [a, b]
+
+
+def test_bus_get_times_out_when_empty():
+    import queue
+
+    from biocybe.biocybe_core.core import MessageBus
+
+    with pytest.raises(queue.Empty):
+        MessageBus().get(timeout=0.01)
+    with pytest.raises(queue.Empty):
+        MessageBus().get_nowait()
+
+
+def test_bus_get_wakes_on_put_from_other_thread():
+    import threading
+
+    from biocybe.biocybe_core.core import MessageBus
+
+    bus = MessageBus()
+    timer = threading.Timer(0.05, bus.put, args=(_msg("late"),))
+    timer.start()
+    try:
+        assert bus.get(timeout=5).msg_type == "late"
+    finally:
+        timer.cancel()
+
+
+# --------------------------------------------------------------------- #
+# Distribution par lots
+# --------------------------------------------------------------------- #
+
+
+def _recording_cell(name: str, cell_type: str = "test"):
+    cell = _cell(name, cell_type)
+    cell.seen = []
+    for msg_type in ("ping", "alert_x"):
+        cell.register_message_handler(msg_type, cell.seen.append)
+    return cell
+
+
+def test_dispatch_batch_groups_per_cell_in_order(core):
+    from biocybe.biocybe_core import CellMessage
+
+    a, b = _recording_cell("a"), _recording_cell("b", "other")
+    core.register_cells([a, b])
+    batch = [
+        CellMessage("ping", source="a", payload=1),
+        CellMessage("ping", source="x", target="b", payload=2),
+        CellMessage("ping", source="x", target="type:test", payload=3),
+        CellMessage("ping", source="x", payload=4),
+    ]
+    core._dispatch_batch(batch)
+    assert [m.payload for m in a.seen] == [3, 4]
+    assert [m.payload for m in b.seen] == [1, 2, 4]
+    assert a.stats.messages_received == 2
+    assert b.stats.messages_received == 3
+    assert core.stats["messages_processed"] == 4
+
+
+def test_dispatch_batch_records_last_alert(core):
+    from biocybe.biocybe_core import CellMessage
+
+    core.register_cells([_recording_cell("a")])
+    core._dispatch_batch(
+        [
+            CellMessage("alert_x", source="s1", payload="first"),
+            CellMessage("ping", source="s1"),
+            CellMessage("alert_x", source="s2", payload="second"),
+        ]
+    )
+    assert core.stats["last_alert"]["source"] == "s2"
+    assert core.stats["last_alert"]["payload"] == "second"
+
+
+def test_dispatch_batch_isolates_failing_cell(core):
+    from biocybe.biocybe_core import CellMessage
+
+    bad, good = _recording_cell("bad"), _recording_cell("good")
+    bad.handle_messages = lambda _msgs: 1 / 0
+    core.register_cells([bad, good])
+    core._dispatch_batch([CellMessage("ping", source="x")])
+    assert len(good.seen) == 1
+
+
+def test_dispatcher_thread_drains_bus(core):
+    import threading
+    import time
+
+    from biocybe.biocybe_core import CellMessage
+    from biocybe.biocybe_core.core import _SHUTDOWN
+
+    a = _recording_cell("a")
+    core.register_cells([a])
+    for i in range(10):
+        core.message_bus.put(CellMessage("ping", source="x", payload=i))
+    thread = threading.Thread(target=core._message_dispatcher, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(a.seen) < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        core.message_bus.put(_SHUTDOWN)
+        thread.join(timeout=5)
+    assert [m.payload for m in a.seen] == list(range(10))
+
+
+def test_dispatcher_exits_on_sentinel_after_draining(core):
+    import threading
+
+    from biocybe.biocybe_core import CellMessage
+    from biocybe.biocybe_core.core import _SHUTDOWN
+
+    a = _recording_cell("a")
+    core.register_cells([a])
+    for i in range(3):
+        core.message_bus.put(CellMessage("ping", source="x", payload=i))
+    core.message_bus.put(_SHUTDOWN)
+    thread = threading.Thread(target=core._message_dispatcher, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert [m.payload for m in a.seen] == [0, 1, 2]
+    assert core.stats["messages_processed"] == 3
+
+
+def test_broadcast_recipients_cached_and_invalidated(core):
+    from biocybe.biocybe_core import CellMessage
+
+    a, b = _recording_cell("a"), _recording_cell("b")
+    core.register_cells([a, b])
+    msg = CellMessage("ping", source="a")
+    first = core._recipients(msg)
+    assert first == (b,)
+    assert core._recipients(CellMessage("ping", source="a")) is first
+
+    c = _recording_cell("c")
+    core.register_cell(c)
+    assert core._recipients(msg) == (b, c)
+    assert core._recipients(CellMessage("ping", source="x", target="type:test")) == (a, b, c)
+
+
+# --------------------------------------------------------------------- #
+# Worker des cellules
+# --------------------------------------------------------------------- #
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    import time
+
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_active_cell_handles_messages_in_its_worker(core):
+    import threading
+
+    from biocybe.biocybe_core import CellMessage
+
+    cell = _busy_cell("a")
+    threads = []
+    cell.register_message_handler("ping", lambda _m: threads.append(threading.current_thread()))
+    core.register_cell(cell)
+    cell.start()
+    try:
+        core._dispatch_batch([CellMessage("ping", source="x")])
+        assert _wait_for(lambda: threads)
+        assert threads[0] is cell._worker_thread
+    finally:
+        cell.stop()
+        cell._worker_thread.join(timeout=5)
+
+
+def test_cell_stop_wakes_idle_worker():
+    import time
+
+    cell = _busy_cell("a")
+    cell.start()
+    assert _wait_for(lambda: cell._worker_thread.is_alive())
+    started = time.monotonic()
+    cell.stop()
+    cell._worker_thread.join(timeout=5)
+    assert not cell._worker_thread.is_alive()
+    assert time.monotonic() - started < 2
+    assert cell.status == "stopped"
+
+
+def test_pacing_cycle_keeps_handling_messages(core):
+    """Un _process_cycle qui attend via _pause reste réactif aux messages."""
+    import time
+
+    from biocybe.biocybe_core import BiologicalCell, CellMessage
+
+    class _Pacing(BiologicalCell):
+        def _process_cycle(self):
+            self._pause(60.0)
+
+    cell = _Pacing("a", "test")
+    handled = []
+    cell.register_message_handler("ping", handled.append)
+    core.register_cell(cell)
+    cell.start()
+    try:
+        assert _wait_for(lambda: cell._worker_thread.is_alive())
+        time.sleep(0.05)  # le worker est dans son cycle
+        started = time.monotonic()
+        core._dispatch_batch([CellMessage("ping", source="x")])
+        assert _wait_for(lambda: handled, timeout=2)
+        assert time.monotonic() - started < 1
+    finally:
+        started = time.monotonic()
+        cell.stop()
+        cell._worker_thread.join(timeout=5)
+        assert time.monotonic() - started < 2
+
+
+def test_delivery_during_final_drain_stays_in_worker_order(core):
+    import threading
+
+    from biocybe.biocybe_core import CellMessage
+
+    cell = _busy_cell("a")
+    gates = {"slow1": threading.Event(), "slow2": threading.Event()}
+    entered = {name: threading.Event() for name in gates}
+    handled = []
+
+    def _slow(message):
+        entered[message.payload].set()
+        gates[message.payload].wait(5)
+        handled.append((message.payload, threading.current_thread()))
+
+    cell.register_message_handler("slow", _slow)
+    cell.register_message_handler(
+        "ping", lambda _m: handled.append(("ping", threading.current_thread()))
+    )
+    core.register_cell(cell)
+    cell.start()
+    try:
+        core._dispatch_batch([CellMessage("slow", source="x", payload="slow1")])
+        assert entered["slow1"].wait(5)
+        core._dispatch_batch([CellMessage("slow", source="x", payload="slow2")])
+        cell.stop()
+        gates["slow1"].set()
+        assert entered["slow2"].wait(5)  # le worker vide sa file
+
+        core._dispatch_batch([CellMessage("ping", source="x")])
+        gates["slow2"].set()
+        cell._worker_thread.join(timeout=5)
+
+        assert [name for name, _t in handled] == ["slow1", "slow2", "ping"]
+        assert {t for _n, t in handled} == {cell._worker_thread}
+    finally:
+        for gate in gates.values():
+            gate.set()
+        cell.stop()
+
+
+def test_delivery_after_worker_exit_is_handled_inline(core):
+    import threading
+
+    from biocybe.biocybe_core import CellMessage
+
+    cell = _busy_cell("a")
+    threads = []
+    cell.register_message_handler("ping", lambda _m: threads.append(threading.current_thread()))
+    core.register_cell(cell)
+    cell.start()
+    cell.stop()
+    cell._worker_thread.join(timeout=5)
+    cell.active = True  # livraison concurrente de la fin du worker
+
+    core._dispatch_batch([CellMessage("ping", source="x")])
+
+    assert threads == [threading.current_thread()]
+    assert cell.message_queue.empty()
+
+
+# --------------------------------------------------------------------- #
+# Sauvegarde de l'état
+# --------------------------------------------------------------------- #
+
+
+@pytest.mark.parametrize("with_orjson", [True, False])
+def test_save_status_writes_json_atomically(core, tmp_path, monkeypatch, with_orjson):
+    import json
+
+    from biocybe.biocybe_core import CellMessage
+    from biocybe.biocybe_core import core as core_module
+
+    if not with_orjson:
+        monkeypatch.setattr(core_module, "_orjson", None)
+    core.register_cells([_recording_cell("é1")])
+    core._dispatch_batch([CellMessage("alert_x", source="s", payload={"n": 1})])
+    target = tmp_path / "status" / "s.json"
+    assert core.save_status(str(target)) is True
+    data = json.loads(target.read_text(encoding="utf-8"))
+    assert data["core"]["cells_count"] == 1
+    assert data["core"]["last_alert"]["payload"] == {"n": 1}
+    assert "é1" in data["cells"]
+    assert [p.name for p in target.parent.iterdir()] == ["s.json"]
+
+
+def test_save_status_failure_keeps_previous_file(core, tmp_path, monkeypatch):
+    from biocybe.biocybe_core import core as core_module
+
+    target = tmp_path / "s.json"
+    target.write_text("{}", encoding="utf-8")
+
+    def _boom(_status):
+        raise ValueError("non sérialisable")
+
+    monkeypatch.setattr(core_module, "_dumps_status", _boom)
+    assert core.save_status(str(target)) is False
+    assert target.read_text(encoding="utf-8") == "{}"
+
+
+# --------------------------------------------------------------------- #
+# Chargement automatique des modules cellulaires
+# --------------------------------------------------------------------- #
+
+
+def test_load_cells_from_modules_registers_in_discovery_order(core, tmp_path, monkeypatch):
+    pkg = tmp_path / "fakecells"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    for mod, body in {
+        "alpha": "def create_cells(config):\n"
+        "    from biocybe.biocybe_core import BiologicalCell\n"
+        "    return (BiologicalCell(n, 'alpha') for n in ('a1', 'a2'))\n",
+        "beta": "raise ImportError('dépendance absente')\n",
+        "gamma": "def create_cells(config):\n"
+        "    from biocybe.biocybe_core import BiologicalCell\n"
+        "    return [BiologicalCell('g1', 'gamma')]\n",
+    }.items():
+        (pkg / mod).mkdir()
+        (pkg / mod / "__init__.py").write_text(body, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    core.load_cells_from_modules("fakecells")
+    assert list(core.cells) == ["a1", "a2", "g1"]
+    assert core.cell_types == {"alpha": ["a1", "a2"], "gamma": ["g1"]}
+
+
+def test_broadcast_skips_cells_without_handler(core):
+    from biocybe.biocybe_core import CellMessage
+
+    subscribed, idle = _recording_cell("a"), _cell("b")
+    core.register_cells([subscribed, idle])
+    core._dispatch_batch([CellMessage("ping", source="x"), CellMessage("pong", source="x")])
+    assert [m.msg_type for m in subscribed.seen] == ["ping"]
+    assert idle.stats.messages_received == 0
+
+    # Abonnement après enregistrement : le cache est invalidé
+    idle.register_message_handler("ping", lambda _m: None)
+    assert core._recipients(CellMessage("ping", source="x")) == (subscribed, idle)
+
+    # Un message direct est toujours remis (et signalé s'il n'est pas géré)
+    core._dispatch_batch([CellMessage("pong", source="x", target="b")])
+    assert idle.stats.messages_received == 1
+
+
+# --------------------------------------------------------------------- #
+# Arrêt du noyau
+# --------------------------------------------------------------------- #
+
+
+def test_core_stop_delivers_system_stop_without_fixed_sleep(core):
+    import time
+
+    cell = _busy_cell("a")
+    stops = []
+    cell.register_message_handler("system_stop", stops.append)
+    core.register_cell(cell)
+    core.start()
+    started = time.monotonic()
+    core.stop()
+    elapsed = time.monotonic() - started
+    assert [m.source for m in stops] == ["core"]
+    assert elapsed < 0.9  # l'ancien time.sleep(1) n'est plus là
+    assert not core.active
+    assert not cell._worker_thread.is_alive()
+
+
+def test_core_config_loaded_through_shared_cache(tmp_path):
+    from biocybe.biocybe_core import BioCybeCore
+    from biocybe.config_loader import CONFIG_CACHE_SUFFIX
+
+    path = tmp_path / "biocybe.yaml"
+    path.write_text("core:\n  log_level: DEBUG\ncells:\n  autoload: false\n", encoding="utf-8")
+    core = BioCybeCore(config_path=str(path))
+    assert core.config["cells"]["autoload"] is False
+    assert core.config["core"]["log_level"] == "DEBUG"
+    assert (tmp_path / ("biocybe.yaml" + CONFIG_CACHE_SUFFIX)).exists()
+
+
+def test_core_config_defaults_when_missing(core):
+    assert core.config["cells"]["autoload"] is True
+
+
+def test_get_status_coalesces_rapid_polls(core, monkeypatch):
+    from biocybe.biocybe_core import core as core_module
+
+    core.register_cells([_cell("a")])
+    calls = []
+    original = core._build_status
+    monkeypatch.setattr(core, "_build_status", lambda: calls.append(1) or original())
+
+    first = core.get_status()
+    second = core.get_status()
+    assert len(calls) == 1
+    assert second == first and second is not first
+
+    core.register_cell(_cell("b"))  # changement de topologie : cache invalidé
+    assert core.get_status()["core"]["cells_count"] == 2
+    assert len(calls) == 2
+
+    monkeypatch.setattr(core_module, "STATUS_CACHE_TTL", 0.0)
+    core._status_cache = None
+    core.get_status()
+    core.get_status()
+    assert len(calls) == 4
+
+
+def test_get_status_results_independent_of_cache(core):
+    core.register_cells([_cell("a")])
+
+    first = core.get_status()
+    first["core"]["cells_count"] = 99
+    first["cells"]["a"]["status"] = "modifié"
+    first["cells"].clear()
+
+    second = core.get_status()
+    assert second["core"]["cells_count"] == 1
+    assert second["cells"]["a"]["status"] != "modifié"
+
+
+def test_reactive_cell_runs_without_thread(core):
+    import threading
+
+    from biocybe.biocybe_core import CellMessage
+
+    cell = _cell("a")
+    threads = []
+    cell.register_message_handler("ping", lambda _m: threads.append(threading.current_thread()))
+    core.register_cell(cell)
+    assert cell.needs_worker is False
+    assert _busy_cell("b").needs_worker is True
+
+    cell.start()
+    assert cell.active and cell._worker_thread is None
+    core._dispatch_batch([CellMessage("ping", source="x")])
+    assert threads == [threading.current_thread()]
+    cell.stop()
+    assert not cell.active and cell.status == "stopped"
+
+
+def test_direct_routes_cached_unknown_targets_not(core):
+    from biocybe.biocybe_core import CellMessage
+
+    a = _recording_cell("a")
+    core.register_cell(a)
+    assert core._recipients(CellMessage("ping", source="x", target="a")) == (a,)
+    assert ("a", "x", "ping") in core._recipients_cache
+    assert core._recipients(CellMessage("ping", source="x", target="ghost")) == ()
+    assert ("ghost", "x", "ping") not in core._recipients_cache
+
+    # La cellule apparaît plus tard : la route est résolue à ce moment-là
+    ghost = _recording_cell("ghost")
+    core.register_cell(ghost)
+    assert core._recipients(CellMessage("ping", source="x", target="ghost")) == (ghost,)
+
+
+def test_core_config_merges_partial_sections_with_defaults(tmp_path):
+    from biocybe.biocybe_core import BioCybeCore
+    from biocybe.biocybe_core.core import _DEFAULT_CONFIG
+
+    path = tmp_path / "biocybe.yaml"
+    path.write_text("cells:\n  t_cell:\n    enabled: true\nextra: 1\n", encoding="utf-8")
+    config = BioCybeCore(config_path=str(path)).config
+    assert config["cells"]["autoload"] is True  # défaut
+    assert config["cells"]["t_cell"] == {"enabled": True}  # chargé
+    assert config["core"]["log_level"] == "INFO"
+    assert config["extra"] == 1
+
+    config["cells"]["autoload"] = False
+    assert config["cells"]["autoload"] is False
+    assert _DEFAULT_CONFIG["cells"]["autoload"] is True
@@ -0,0 +1,700 @@
+"""Tests du cadre éthique RGPD héritage (explainability/ethical_framework).
+
+Tests réels :
+  - pseudonymes : 8 caractères hex, identiques au préfixe du SHA-256
+  - anonymisation : chaînes pseudonymisées, nombres neutralisés, champs
+    absents ou non sensibles intacts, entrée non modifiée
+  - copie à l'écriture : entrée renvoyée telle quelle sans champ à
+    modifier, modifiée sur place avec inplace=True
+  - anonymisation par lot : mêmes pseudonymes qu'anonymize_data, en lignes
+    comme en colonnes (listes ou tableaux numpy)
+  - pseudonymes à clé (défaut) : stables dans une instance, différents
+    d'une instance à l'autre, reproductibles avec `pseudonym_seed` ;
+    BLAKE3 à clé si installé, BLAKE2s à clé sinon
+  - as_dict : construit une fois puis réutilisé, reconstruit après
+    invalidate() ; copie renvoyée à chaque appel, horodatage fourni
+    appliqué ; activités à slots, sans __dict__ ; chaînes du vocabulaire
+    partagées entre activités, pool de chaînes borné
+  - registre en colonnes : lignes reconstruites à l'identique, export JSON
+    avec orjson comme avec le repli stdlib
+  - export NDJSON : en-tête puis une activité par ligne, gzip en option
+  - configuration : chargée et réexportée avec orjson comme avec le repli
+    stdlib
+  - minimisation : ordre des champs disponibles conservé, désactivable
+  - enregistrements par lot : un seul horodatage pour tout le lot
+  - journal d'audit : entrées écrites par lots scellés (HMAC chaîné),
+    scellées à la sortie du processus sans close(), fermé par le bloc with,
+    ajout après fermeture refusé (RuntimeError), altération ou suppression
+    détectée, rotation sans casser la chaîne, secrets absents de l'export
+    de configuration
+  - consentements empaquetés : dernier choix retenu, horodatage fourni
+    restitué à la microseconde, y compris avant 1970 et après 2262
+  - demandes RGPD : index par statut trié par date de création, requêtes
+    par intervalle, déplacement lors d'un changement de statut ;
+    horodatages stockés en ns, restitués en ISO
+  - activités par défaut : construites à la demande, une seule fois ;
+    DEFAULT_PROCESSING_ACTIVITIES toujours disponible
+  - validation d'explicabilité : score global prioritaire, sinon moyenne ;
+    avertissement seulement sous le seuil
+  - vues en lecture seule : activités, consentements et demandes RGPD
+    lèvent TypeError à la modification, l'état interne reste intact
+  - reload() : options des chemins chauds recalculées depuis la config
+  - format_explanation : texte identique pour chaque niveau (nom, enum ou
+    entier), niveau inconnu ou désactivé ramené à intermédiaire
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+
+@pytest.fixture
+def framework():
+    from biocybe.explainability.ethical_framework import EthicalFramework
+
+    return EthicalFramework()
+
+
+def _activity(name="Détection", **overrides):
+    from biocybe.explainability.ethical_framework import DataProcessingActivity
+
+    fields = {
+        "name": name,
+        "purpose": "Sécurité",
+        "data_categories": ["Logs système"],
+        "legal_basis": "Intérêt légitime",
+        "retention_period": "30 jours",
+        "security_measures": ["Chiffrement"],
+        "responsible_person": "RSSI",
+    }
+    fields.update(overrides)
+    return DataProcessingActivity(**fields)
+
+
+def _framework(tmp_path, **privacy):
+    """Cadre éthique avec une section `privacy` surchargée."""
+    from biocybe.explainability.ethical_framework import EthicalFramework
+
+    config_path = tmp_path / "ethics.json"
+    config_path.write_text(json.dumps({"privacy": privacy}))
+    return EthicalFramework(str(config_path))
+
+
+def test_pseudonyms_match_sha256_prefix():
+    from biocybe.explainability.ethical_framework import _sha256_pseudonyms
+
+    values = ["alice", "bob", "", "éàü"]
+    assert _sha256_pseudonyms(values) == [
+        hashlib.sha256(v.encode()).hexdigest()[:8] for v in values
+    ]
+
+
+def test_anonymize_data_hashes_strings_and_neutralizes_numbers(tmp_path):
+    framework = _framework(tmp_path, crypto_pseudonyms=True)
+    data = {"user": "alice", "ip": "10.0.0.1", "age": 42, "score": 0.5, "action": "login"}
+
+    result = framework.anonymize_data(data, ["user", "ip", "age", "score", "missing"])
+
+    assert result["user"] == hashlib.sha256(b"alice").hexdigest()[:8]
+    assert result["ip"] == hashlib.sha256(b"10.0.0.1").hexdigest()[:8]
+    assert result["age"] == 0
+    assert result["score"] == 0
+    assert result["action"] == "login"
+    assert "missing" not in result
+    assert data["user"] == "alice"
+
+
+def test_keyed_pseudonyms_are_stable_per_instance_only():
+    from biocybe.explainability.ethical_framework import EthicalFramework
+
+    first = EthicalFramework().anonymize_data({"user": "alice"}, ["user"])["user"]
+    again = EthicalFramework().anonymize_data({"user": "alice"}, ["user"])["user"]
+    framework = EthicalFramework()
+    a = framework.anonymize_data({"user": "alice"}, ["user"])["user"]
+    b = framework.anonymize_data({"user": "alice"}, ["user"])["user"]
+
+    assert len(a) == 8
+    int(a, 16)
+    assert a == b
+    assert first != again
+    assert a != hashlib.sha256(b"alice").hexdigest()[:8]
+
+
+def test_pseudonym_seed_makes_pseudonyms_reproducible(tmp_path):
+    a = _framework(tmp_path, pseudonym_seed="s3cret").anonymize_data({"u": "alice"}, ["u"])
+    b = _framework(tmp_path, pseudonym_seed="s3cret").anonymize_data({"u": "alice"}, ["u"])
+    c = _framework(tmp_path, pseudonym_seed="other").anonymize_data({"u": "alice"}, ["u"])
+
+    assert a == b
+    assert a != c
+
+
+def test_as_dict_is_built_once_until_invalidated():
+    activity = _activity()
+
+    first = activity.as_dict()
+    cached = activity._cached_dict
+    assert first == activity.as_dict()
+    assert activity._cached_dict is cached
+    assert first["name"] == "Détection"
+    assert first["processors"] == []
+
+    activity.purpose = "Forensique"
+    activity.invalidate()
+    rebuilt = activity.as_dict()
+    assert activity._cached_dict is not cached
+    assert rebuilt["purpose"] == "Forensique"
+
+
+def test_as_dict_returns_copies_with_requested_timestamp():
+    activity = _activity()
+
+    first = activity.as_dict()
+    first["name"] = "modifié"
+    assert activity.as_dict()["name"] == "Détection"
+
+    stamped = activity.as_dict("2026-01-01T00:00:00")
+    assert stamped["last_updated"] == "2026-01-01T00:00:00"
+    assert activity.as_dict("2026-02-01T00:00:00")["last_updated"] == "2026-02-01T00:00:00"
+    assert activity.as_dict()["last_updated"] == first["last_updated"]
+
+
+def test_register_processing_activity_stores_rows_as_columns(framework):
+    from biocybe.explainability.ethical_framework import PROCESSING_ACTIVITY_FIELDS
+
+    first, second = _activity("A"), _activity("B", processors=["Sous-traitant"])
+
+    assert framework.register_processing_activity(first)
+    assert framework.register_processing_activity(second)
+    assert framework.processing_activities == (first.as_dict(), second.as_dict())
+    assert list(framework.processing_activities[0]) == list(PROCESSING_ACTIVITY_FIELDS)
+    assert framework._pa_columns["name"] == ["A", "B"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_export_processing_register(framework, tmp_path, monkeypatch, use_orjson):
+    from biocybe.explainability import ethical_framework
+
+    if not use_orjson:
+        monkeypatch.setattr(ethical_framework, "_orjson", None)
+    framework.register_processing_activity(_activity("Détection"))
+    out = tmp_path / "register.json"
+
+    assert framework.export_processing_register(str(out))
+    exported = json.loads(out.read_text(encoding="utf-8"))
+    assert exported["framework_version"] == "1.0.0"
+    assert tuple(exported["processing_activities"]) == framework.processing_activities
+
+
+def test_check_data_minimization_keeps_required_fields_in_order(framework, tmp_path):
+    available = ["ip", "user", "pid", "cmdline", "user"]
+
+    assert framework.check_data_minimization(("user", "ip"), available) == ["ip", "user", "user"]
+    assert framework.check_data_minimization([], available) == []
+
+    disabled = _framework(tmp_path, data_minimization=False)
+    assert disabled.check_data_minimization(["ip"], available) is available
+
+
+def test_register_processing_activities_shares_one_timestamp(framework):
+    activities = [_activity("A"), _activity("B"), _activity("C")]
+
+    assert framework.register_processing_activities(activities) == 3
+    rows = framework.processing_activities
+    assert [row["name"] for row in rows] == ["A", "B", "C"]
+    assert len({row["last_updated"] for row in rows}) == 1
+
+
+def test_log_consents_shares_one_timestamp(framework):
+    framework.log_consents([("u1", "analysis", True), ("u2", "analysis", False)])
+
+    assert framework.check_consent("u1", "analysis")
+    assert not framework.check_consent("u2", "analysis")
+    assert not framework.check_consent("u3", "analysis")
+    assert (
+        framework.consent_log["u1"]["analysis"]["timestamp"]
+        == framework.consent_log["u2"]["analysis"]["timestamp"]
+    )
+
+
+def _read_jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_audit_log_records_consents_and_requests_in_sealed_batches(tmp_path):
+    from biocybe.explainability.ethical_framework import verify_audit_log
+
+    log_path = tmp_path / "audit" / "consent.jsonl"
+    framework = _framework(tmp_path, audit_log_path=str(log_path), audit_log_key="k")
+    framework.log_consent("u1", "analysis", True)
+    framework.log_consents([("u2", "analysis", False), ("u3", "analysis", True)])
+    framework.register_data_subject_request("r1", "u1", "erasure", "tout")
+    framework.update_data_subject_request("r1", "completed")
+    framework.close()
+    framework.close()
+
+    records = _read_jsonl(log_path)
+    events = [r["event"] for r in records if "event" in r]
+    assert events == [
+        "consent",
+        "consent",
+        "consent",
+        "data_subject_request",
+        "data_subject_request_update",
+    ]
+    seals = [r for r in records if "mac" in r]
+    assert seals and sum(seal["entries"] for seal in seals) == 5
+    assert "mac" in records[-1]
+    assert verify_audit_log(str(log_path), b"k")
+    assert not verify_audit_log(str(log_path), b"other")
+
+
+def test_audit_log_sealed_at_exit_without_close(tmp_path):
+    import os
+    import subprocess
+
+    from biocybe.explainability.ethical_framework import verify_audit_log
+
+    log_path = tmp_path / "consent.jsonl"
+    code = (
+        "from biocybe.explainability.ethical_framework import ConsentAuditLog; "
+        f"audit = ConsentAuditLog({str(log_path)!r}, b'k'); "
+        "audit.append({'event': 'consent', 'user_id': 'u1', 'timestamp': 0})"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(ROOT / "src")},
+    )
+
+    records = _read_jsonl(log_path)
+    assert [r["event"] for r in records if "event" in r] == ["consent"]
+    assert verify_audit_log(str(log_path), b"k")
+
+
+def test_framework_context_manager_closes_audit_log(tmp_path):
+    log_path = tmp_path / "consent.jsonl"
+
+    with _framework(tmp_path, audit_log_path=str(log_path), audit_log_key="k") as framework:
+        framework.log_consent("u1", "analysis", True)
+
+    assert framework._audit_log._closed
+    assert any("mac" in r for r in _read_jsonl(log_path))
+
+
+def test_audit_log_rejects_append_after_close(tmp_path):
+    from biocybe.explainability.ethical_framework import ConsentAuditLog
+
+    log_path = tmp_path / "consent.jsonl"
+    audit = ConsentAuditLog(str(log_path), b"k")
+    audit.append({"event": "consent", "user_id": "u1", "granted": True})
+    audit.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        audit.append({"event": "consent", "user_id": "u2", "granted": True})
+    written = [r.get("user_id") for r in _read_jsonl(log_path)]
+    assert "u1" in written
+    assert "u2" not in written
+
+
+def test_audit_log_detects_tampering(tmp_path):
+    from biocybe.explainability.ethical_framework import ConsentAuditLog, verify_audit_log
+
+    log_path = tmp_path / "consent.jsonl"
+    audit = ConsentAuditLog(str(log_path), b"k")
+    for i in range(3):
+        audit._write_batch([{"event": "consent", "user_id": f"u{i}", "granted": True}])
+    audit.close()
+    assert verify_audit_log(str(log_path), b"k")
+
+    lines = log_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    tampered = tmp_path / "tampered.jsonl"
+    tampered.write_text("".join(lines).replace('"granted":true', '"granted":false', 1))
+    assert not verify_audit_log(str(tampered), b"k")
+
+    dropped = tmp_path / "dropped.jsonl"
+    dropped.write_text("".join(lines[:2] + lines[4:]))
+    assert not verify_audit_log(str(dropped), b"k")
+
+    unsealed = tmp_path / "unsealed.jsonl"
+    unsealed.write_text("".join(lines[:-1]))
+    assert not verify_audit_log(str(unsealed), b"k")
+
+
+def test_audit_log_rotation_keeps_the_chain(tmp_path):
+    from biocybe.explainability.ethical_framework import ConsentAuditLog, verify_audit_log
+
+    log_path = tmp_path / "consent.jsonl"
+    audit = ConsentAuditLog(str(log_path), b"k", max_bytes=1)
+    for i in range(2):
+        audit._write_batch([{"event": "consent", "user_id": f"u{i}"}])
+    audit.close()
+
+    first, second = tmp_path / "consent.jsonl.2", tmp_path / "consent.jsonl.3"
+    assert first.exists() and second.exists()
+    assert log_path.read_bytes() == b""
+    first_mac = _read_jsonl(first)[-1]["mac"]
+    assert _read_jsonl(second)[-1]["prev"] == first_mac
+    assert verify_audit_log(str(first), b"k")
+    assert verify_audit_log(str(second), b"k", prev_mac=first_mac)
+
+
+def test_export_config_omits_secrets(tmp_path):
+    framework = _framework(tmp_path, pseudonym_seed="s", audit_log_key="k")
+    out = tmp_path / "config.json"
+
+    assert framework.export_config(str(out))
+    privacy = json.loads(out.read_text())["config"]["privacy"]
+    assert "pseudonym_seed" not in privacy
+    assert "audit_log_key" not in privacy
+    assert privacy["anonymization"] is True
+
+
+def test_consent_is_packed_and_restored(framework):
+    from datetime import datetime
+
+    when = datetime(2026, 3, 1, 12, 30, 45, 123456)
+    framework.log_consent("u1", "analysis", True, timestamp=when)
+    framework.log_consent("u1", "analysis", False)
+    framework.log_consent("u1", "data_collection", True, timestamp=when)
+
+    assert not framework.check_consent("u1", "analysis")
+    assert framework.check_consent("u1", "data_collection")
+    assert not framework.check_consent("u1", "unknown")
+    assert framework.consent_log["u1"]["data_collection"] == {
+        "granted": True,
+        "timestamp": when.isoformat(),
+    }
+    assert framework.consent_log["u1"]["analysis"]["granted"] is False
+
+
+@pytest.mark.parametrize(
+    "when",
+    [
+        datetime(1960, 1, 1, 8, 15, 0, 250000),
+        datetime(1969, 12, 31, 23, 59, 59, 999999),
+        datetime(2300, 6, 1, 0, 0, 1, 1),
+    ],
+)
+@pytest.mark.parametrize("granted", [True, False])
+def test_consent_packing_keeps_dates_outside_1970_2262(framework, when, granted):
+    framework.log_consent("u1", "analysis", granted, timestamp=when)
+
+    assert framework.check_consent("u1", "analysis") is granted
+    assert framework.consent_log["u1"]["analysis"] == {
+        "granted": granted,
+        "timestamp": when.isoformat(),
+    }
+
+
+def test_reload_applies_config_changes(framework):
+    data = {"user": "alice"}
+    assert framework.anonymize_data(data, ["user"])["user"] != "alice"
+    assert not framework.validate_model_explainability({"global_score": 0.5})
+
+    framework.config["privacy"]["anonymization"] = False
+    framework.config["explainability"]["required_explainability_score"] = 0.4
+    framework.reload()
+
+    assert framework.anonymize_data(data, ["user"]) is data
+    assert framework.validate_model_explainability({"global_score": 0.5})
+
+
+EXPLANATION = {
+    "method": "shap",
+    "features": [
+        {"feature": "cpu", "importance": 0.8, "value": 97},
+        {"feature": "ports", "importance": -0.25},
+        {"feature": "uid", "importance": 0.0},
+    ],
+}
+
+
+def test_format_explanation_levels(framework):
+    assert framework.format_explanation(EXPLANATION, "technical") == "\n".join(
+        [
+            "Méthode d'explication: shap",
+            "Caractéristiques contributives:",
+            "  1. cpu: 0.800000",
+            "     Valeur: 97",
+            "  2. ports: -0.250000",
+            "  3. uid: 0.000000",
+        ]
+    )
+    intermediate = "\n".join(
+        [
+            "Cette décision a été prise en utilisant la méthode shap.",
+            "Les facteurs les plus importants sont:",
+            "  • cpu a augmenté le niveau de risque",
+            "  • ports a diminué le niveau de risque",
+            "  • uid a diminué le niveau de risque",
+        ]
+    )
+    assert framework.format_explanation(EXPLANATION, "intermediate") == intermediate
+    assert framework.format_explanation(EXPLANATION, "expert") == intermediate
+    assert framework.format_explanation(EXPLANATION, "simplified") == (
+        "Cette décision est principalement due à un impact positif du facteur 'cpu'."
+    )
+    assert framework.format_explanation({}, "simplified") == (
+        "La décision est basée sur l'analyse des motifs détectés."
+    )
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_config_load_and_export_roundtrip(tmp_path, monkeypatch, use_orjson):
+    from biocybe.explainability import ethical_framework
+
+    if not use_orjson:
+        monkeypatch.setattr(ethical_framework, "_orjson", None)
+    framework = _framework(tmp_path, max_retention_days=7, unknown_section_key="é")
+    out = tmp_path / "exported.json"
+
+    assert framework.config["privacy"]["max_retention_days"] == 7
+    assert framework.export_config(str(out))
+    exported = json.loads(out.read_text(encoding="utf-8"))
+    assert exported["config"] == framework.config
+    assert exported["framework_version"] == "1.0.0"
+
+
+def test_anonymize_data_copies_only_when_needed(framework):
+    data = {"action": "login", "user": "alice", "age": 42}
+
+    assert framework.anonymize_data(data, ["missing", "action_id"]) is data
+
+    copy = framework.anonymize_data(data, ["user"])
+    assert copy is not data
+    assert list(copy) == ["action", "user", "age"]
+    assert data["user"] == "alice"
+
+    same = framework.anonymize_data(data, ["user", "age"], inplace=True)
+    assert same is data
+    assert data["user"] == copy["user"]
+    assert data["age"] == 0
+
+
+def test_anonymize_batch_rows_match_anonymize_data(framework):
+    records = [
+        {"user": "alice", "age": 30, "action": "login"},
+        {"action": "logout"},
+        {"user": "bob", "age": 2.5},
+    ]
+
+    result = framework.anonymize_batch(records, ["user", "age"])
+
+    assert result == [framework.anonymize_data(r, ["user", "age"]) for r in records]
+    assert result[1] is records[1]
+    assert records[0]["user"] == "alice"
+
+
+def test_anonymize_batch_columns(framework):
+    columns = {"user": ["alice", "bob", None], "age": [30, 2.5, 1], "action": ["a", "b", "c"]}
+
+    result = framework.anonymize_batch(columns, ["user", "age"])
+
+    expected = framework.anonymize_data({"user": "alice"}, ["user"])["user"]
+    assert result["user"][0] == expected
+    assert result["user"][2] is None
+    assert result["age"] == [0, 0, 0]
+    assert result["action"] is columns["action"]
+    assert columns["user"][0] == "alice"
+
+
+def test_anonymize_batch_numpy_columns(framework):
+    np = pytest.importorskip("numpy")
+    columns = {"user": np.array(["alice", "bob"]), "score": np.array([0.5, 0.9])}
+
+    result = framework.anonymize_batch(columns, ["user", "score"])
+
+    assert result["score"].dtype == columns["score"].dtype
+    assert not result["score"].any()
+    assert result["user"].tolist() == [
+        framework.anonymize_data({"u": v}, ["u"])["u"] for v in ("alice", "bob")
+    ]
+
+
+def test_list_requests_by_status_and_creation_range(framework, monkeypatch):
+    from biocybe.explainability import ethical_framework
+
+    clock = iter([300, 100, 200, 400, 500, 600])
+    monkeypatch.setattr(ethical_framework, "time", SimpleNamespace(time_ns=lambda: next(clock)))
+    for request_id in ("r3", "r1", "r2", "r4"):
+        framework.register_data_subject_request(request_id, "u", "access", "")
+
+    assert framework.list_requests("pending") == ["r1", "r2", "r3", "r4"]
+    assert framework.list_requests("pending", since_ns=200, until_ns=300) == ["r2", "r3"]
+    assert framework.list_requests("pending", until_ns=99) == []
+
+    assert framework.update_data_subject_request("r2", "completed", "ok")
+    assert framework.update_data_subject_request("r4", "completed")
+    assert not framework.update_data_subject_request("r9", "completed")
+    assert framework.list_requests("pending") == ["r1", "r3"]
+    assert framework.list_requests("completed") == ["r2", "r4"]
+    assert framework.list_requests("rejected") == []
+    assert framework.data_subject_requests["r2"]["status"] == "completed"
+    assert framework.data_subject_requests["r2"]["response"] == "ok"
+
+
+def test_keyed_pseudonyms_use_blake2s_without_blake3(monkeypatch):
+    from biocybe.explainability import ethical_framework
+
+    monkeypatch.setattr(ethical_framework, "_blake3", None)
+    key = bytes(range(32))
+    seed = ethical_framework._keyed_seed(key)
+
+    assert ethical_framework._keyed_pseudonyms(seed, ["alice", "bob"]) == [
+        hashlib.blake2s(v, digest_size=4, key=key).hexdigest() for v in (b"alice", b"bob")
+    ]
+
+
+def test_keyed_pseudonyms_use_blake3_when_installed():
+    blake3 = pytest.importorskip("blake3")
+    from biocybe.explainability import ethical_framework
+
+    key = bytes(range(32))
+    seed = ethical_framework._keyed_seed(key)
+
+    assert ethical_framework._keyed_pseudonyms(seed, ["alice"]) == [
+        blake3.blake3(b"alice", key=key).digest()[:4].hex()
+    ]
+
+
+def test_format_explanation_accepts_enum_and_int_levels(framework, tmp_path):
+    from biocybe.explainability import EthicalFramework, ExplanationLevel
+
+    for level in ExplanationLevel:
+        expected = framework.format_explanation(EXPLANATION, level.name.lower())
+        assert framework.format_explanation(EXPLANATION, level) == expected
+        assert framework.format_explanation(EXPLANATION, int(level)) == expected
+
+    intermediate = framework.format_explanation(EXPLANATION, ExplanationLevel.INTERMEDIATE)
+    assert framework.format_explanation(EXPLANATION, 7) == intermediate
+
+    config_path = tmp_path / "levels.json"
+    config_path.write_text(json.dumps({"explainability": {"explanation_levels": ["simplified"]}}))
+    restricted = EthicalFramework(str(config_path))
+    assert restricted.format_explanation(EXPLANATION, "technical") == intermediate
+    assert restricted.format_explanation(EXPLANATION, ExplanationLevel.SIMPLIFIED) == (
+        framework.format_explanation(EXPLANATION, "simplified")
+    )
+
+
+def test_processing_activity_uses_slots():
+    activity = _activity()
+
+    assert not hasattr(activity, "__dict__")
+    with pytest.raises(AttributeError):
+        activity.unknown = 1
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_export_processing_register_ndjson(framework, tmp_path, compress):
+    import gzip
+
+    framework.register_processing_activities([_activity("A"), _activity("B")])
+    out = tmp_path / ("register.ndjson.gz" if compress else "register.ndjson")
+
+    assert framework.export_processing_register_ndjson(str(out), compress=compress)
+    raw = gzip.decompress(out.read_bytes()) if compress else out.read_bytes()
+    header, *rows = [json.loads(line) for line in raw.decode("utf-8").splitlines()]
+    assert header["framework_version"] == "1.0.0"
+    assert "generated_at" in header
+    assert tuple(rows) == framework.processing_activities
+
+
+def test_default_processing_activities_are_built_once(framework):
+    from biocybe.explainability import ethical_framework
+
+    defaults = ethical_framework.default_processing_activities()
+
+    assert isinstance(defaults, tuple)
+    assert len(defaults) == 3
+    assert ethical_framework.default_processing_activities() is defaults
+    assert ethical_framework.DEFAULT_PROCESSING_ACTIVITIES == list(defaults)
+    assert framework.register_processing_activities(defaults) == 3
+    with pytest.raises(AttributeError):
+        ethical_framework.UNKNOWN_ATTRIBUTE  # noqa: B018
+
+
+def test_validate_model_explainability(framework, caplog):
+    with caplog.at_level("WARNING", logger="biocybe.explainability.ethical_framework"):
+        assert framework.validate_model_explainability({"global_score": 0.7, "lime": 0.1})
+        assert framework.validate_model_explainability({"lime": 0.9, "shap": 0.6})
+        assert not caplog.records
+
+        assert not framework.validate_model_explainability({"lime": 0.5, "shap": 0.6})
+        assert "0.55 < 0.70" in caplog.text
+        assert not framework.validate_model_explainability({"global_score": 0.2})
+        assert not framework.validate_model_explainability({})
+
+
+def test_processing_activity_vocabulary_is_shared():
+    first = _activity("A", security_measures=["".join(["Chiff", "rement"])])
+    second = _activity("B", security_measures=["".join(["Chiffr", "ement"])], processors=None)
+
+    assert first.security_measures[0] is second.security_measures[0]
+    assert first.data_categories[0] is second.data_categories[0]
+    assert second.processors is None
+
+
+def test_processing_activity_vocabulary_pool_is_bounded(monkeypatch):
+    from biocybe.explainability import ethical_framework
+
+    monkeypatch.setattr(ethical_framework, "_STR_POOL", {})
+    monkeypatch.setattr(ethical_framework, "STR_POOL_MAX_SIZE", 3)
+
+    values = [f"mesure-{i}" for i in range(10)]
+    assert ethical_framework._shared_strings(values) == values
+    assert len(ethical_framework._STR_POOL) == 3
+    # Les chaînes déjà dans le pool restent partagées
+    assert ethical_framework._shared_strings(["".join(["mesure", "-0"])])[0] is values[0]
+
+
+def test_data_subject_request_timestamps_are_formatted_on_read(framework, monkeypatch):
+    from datetime import datetime
+
+    from biocybe.explainability import ethical_framework
+
+    created = datetime(2026, 5, 1, 8, 0, 0, 250000)
+    completed = datetime(2026, 5, 2, 9, 30, 0)
+    clock = iter([ethical_framework._datetime_to_ns(d) for d in (created, completed)])
+    monkeypatch.setattr(ethical_framework, "time", SimpleNamespace(time_ns=lambda: next(clock)))
+
+    framework.register_data_subject_request("r1", "u1", "erasure", "tout")
+    assert framework.data_subject_requests["r1"]["created_at"] == created.isoformat()
+    assert framework.data_subject_requests["r1"]["completed_at"] is None
+
+    framework.update_data_subject_request("r1", "completed")
+    request = framework.data_subject_requests["r1"]
+    assert request["completed_at"] == completed.isoformat()
+    assert framework._requests["r1"]["completed_at"] == ethical_framework._datetime_to_ns(completed)
+
+
+def test_public_registers_are_read_only(framework):
+    framework.register_processing_activity(_activity("A"))
+    framework.log_consent("u1", "analysis", True)
+    framework.register_data_subject_request("r1", "u1", "erasure", "tout")
+
+    with pytest.raises(TypeError):
+        framework.processing_activities[0]["name"] = "B"
+    with pytest.raises(AttributeError):
+        framework.processing_activities.append({})
+    with pytest.raises(TypeError):
+        framework.consent_log["u1"]["analysis"]["granted"] = False
+    with pytest.raises(TypeError):
+        framework.consent_log["u2"] = {}
+    with pytest.raises(TypeError):
+        framework.data_subject_requests["r1"]["status"] = "completed"
+
+    assert framework.processing_activities[0]["name"] == "A"
+    assert framework.consent_log["u1"]["analysis"]["granted"] is True
+    assert framework.data_subject_requests["r1"]["status"] == "pending"
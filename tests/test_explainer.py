@@ -0,0 +1,607 @@
+"""Tests des explications XAI héritage (explainability/explainer).
+
+Nécessite shap, lime et scikit-learn : ignorés sinon (captum et matplotlib
+ne sont chargés qu'à la demande).
+
+Tests réels :
+  - explainer d'arbres : CPU sans GPU CUDA, GPU détecté sans CUDA_PATH,
+    repli CPU si le GPU échoue, FastTreeSHAP préféré sur CPU quand il est
+    installé
+  - explain_batch : un seul appel SHAP, mêmes explications que ligne par ligne ;
+    importance agrégée ; lignes LIME au format d'explain_prediction (poids
+    signés, libellés discrétisés)
+  - LIME : nombre de perturbations configurable, top-K conservé sans sélection
+  - background_data : résumé k-means pour KernelSHAP, données brutes pour LIME,
+    avertissement et ligne de zéros à défaut
+  - caches : valeurs SHAP mémoïsées (LRU, .npy par empreinte de modèle),
+    ExplainableDecision partagée entre expliqueurs
+  - explain_prediction : top-K trié par importance, valeurs en float natifs
+  - textes d'explication : top 5, direction et précision d'affichage
+  - import paresseux : shap/lime/captum/matplotlib absents après l'import du module
+  - batch_explain_threats : threads (SHAP d'arbres) ou processus (LIME) selon
+    le model_type passé à ThreatExplainer, sérialisation
+  - modèles linéaires : LinearExplainer (exact) au lieu de KernelSHAP
+  - KernelSHAP : coalitions bornées (nsamples), régularisation l1 sur le top-K
+  - plot_shap_summary : valeurs SHAP précalculées réutilisées
+  - entrées float64 converties en float32 pour l'explainer seulement, sans
+    contrôle d'additivité (Tree SHAP) ; valeurs rapportées inchangées
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+shap = pytest.importorskip("shap")
+pytest.importorskip("lime")
+pytest.importorskip("sklearn")
+
+import numpy as np  # noqa: E402
+
+FEATURES = ["cpu", "ports", "uid", "entropy"]
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.random((60, len(FEATURES)))
+    y = (X[:, 0] + 0.5 * X[:, 1] > 0.8).astype(int)
+    return X, y
+
+
+@pytest.fixture
+def forest(data):
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, y = data
+    return RandomForestClassifier(n_estimators=5, max_depth=3, random_state=0).fit(X, y)
+
+
+def test_tree_explainer_uses_cpu_without_cuda(forest, monkeypatch):
+    from biocybe.explainability import explainer
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    monkeypatch.setattr(explainer, "_cuda_device_available", lambda: False)
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+
+    decision = ExplainableDecision(forest, "tree", FEATURES)
+
+    assert decision.shap_backend == "shap-cpu"
+    assert isinstance(decision.explainers["shap"], shap.TreeExplainer)
+
+
+def test_tree_explainer_falls_back_to_cpu_when_gpu_fails(forest, monkeypatch):
+    from biocybe.explainability import explainer
+
+    def no_gpu(model):
+        raise RuntimeError("CUDA non disponible")
+
+    monkeypatch.setattr(explainer, "_cuda_device_available", lambda: True)
+    monkeypatch.setattr(shap, "GPUTreeExplainer", no_gpu)
+    monkeypatch.setitem(sys.modules, "cuml", None)
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+
+    tree_explainer, backend = explainer._make_tree_explainer(forest)
+
+    assert backend == "shap-cpu"
+    assert isinstance(tree_explainer, shap.TreeExplainer)
+
+
+def test_cuda_detection_without_cuda_path(monkeypatch):
+    from biocybe.explainability import explainer
+
+    monkeypatch.delenv("CUDA_PATH", raising=False)
+    runtime = SimpleNamespace(getDeviceCount=lambda: 1)
+    monkeypatch.setitem(sys.modules, "cupy", SimpleNamespace(cuda=SimpleNamespace(runtime=runtime)))
+    explainer._cuda_device_available.cache_clear()
+    try:
+        assert explainer._cuda_device_available() is True
+    finally:
+        explainer._cuda_device_available.cache_clear()
+
+
+def test_tree_explainer_prefers_fasttreeshap_on_cpu(forest, monkeypatch):
+    from biocybe.explainability import explainer
+
+    calls = []
+
+    def fast_tree_explainer(model, algorithm, n_jobs):
+        calls.append((algorithm, n_jobs))
+        return "fast"
+
+    monkeypatch.setattr(explainer, "_cuda_device_available", lambda: False)
+    monkeypatch.setitem(
+        sys.modules, "fasttreeshap", SimpleNamespace(TreeExplainer=fast_tree_explainer)
+    )
+
+    tree_explainer, backend = explainer._make_tree_explainer(forest, "v1")
+
+    assert (tree_explainer, backend) == ("fast", "fasttreeshap-v1")
+    assert calls == [("v1", -1)]
+
+
+def test_explain_batch_matches_row_by_row(forest, data, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    X, _ = data
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    decision = ExplainableDecision(forest, "tree", FEATURES)
+    calls = []
+    shap_values = decision.explainers["shap"].shap_values
+    monkeypatch.setattr(
+        decision.explainers["shap"],
+        "shap_values",
+        lambda batch, **options: calls.append(len(batch)) or shap_values(batch, **options),
+    )
+
+    batch = decision.explain_batch(X[:5], num_features=3)["rows"]
+
+    assert calls == [5]
+    for row, explanation in zip(X[:5], batch, strict=True):
+        single = decision.explain_prediction(row[None, :], num_features=3)
+        assert explanation["features"] == single["features"]
+        assert len(explanation["features"]) == 3
+
+
+def test_explain_batch_aggregates_mean_absolute_shap(forest, data, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision, _first_class
+
+    X, _ = data
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    decision = ExplainableDecision(forest, "tree", FEATURES)
+
+    batch = decision.explain_batch(X[:8], num_features=len(FEATURES))
+
+    expected = np.abs(_first_class(decision.explainers["shap"].shap_values(X[:8]))).mean(axis=0)
+    assert "error" not in batch
+    assert len(batch["rows"]) == 8
+    assert {f["feature"]: f["importance"] for f in batch["features"]} == pytest.approx(
+        dict(zip(FEATURES, expected, strict=True))
+    )
+
+
+def test_explain_batch_lime_explains_each_row(forest, data, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    X, _ = data
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    decision = ExplainableDecision(forest, "tree", FEATURES)
+
+    batch = decision.explain_batch(X[:3], method="lime", num_features=2)
+
+    assert "error" not in batch
+    assert [len(row["features"]) for row in batch["rows"]] == [2, 2, 2]
+    assert {f["feature"] for f in batch["features"]} <= set(FEATURES)
+
+
+def test_explain_batch_lime_rows_match_explain_prediction(forest, data, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    X, _ = data
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    decision = ExplainableDecision(forest, "tree", FEATURES)
+    lime_exp = SimpleNamespace(
+        as_list=lambda: [("cpu > 0.50", 0.3), ("ports <= 2.00", -0.2)],
+        as_map=lambda: {1: [(0, 0.3), (1, -0.2)]},
+    )
+    monkeypatch.setattr(decision, "_lime_explanation", lambda row, num_features: lime_exp)
+
+    batch = decision.explain_batch(X[:2], method="lime", num_features=2)
+    single = decision.explain_prediction(X[:1], method="lime", num_features=2)
+
+    assert batch["rows"][0] == single
+    assert batch["rows"][0]["features"][1] == {"feature": "ports <= 2.00", "importance": -0.2}
+    assert "ports <= 2.00: a diminué le risque" in decision.generate_explanation_text(
+        batch["rows"][0]
+    )
+    assert {f["feature"]: f["importance"] for f in batch["features"]} == pytest.approx(
+        {FEATURES[0]: 0.3, FEATURES[1]: 0.2}
+    )
+
+
+def test_explain_batch_rejects_unknown_method(forest, data):
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    X, _ = data
+    batch = ExplainableDecision(forest, "tree", FEATURES).explain_batch(X[:2], method="anchors")
+
+    assert batch["rows"] == []
+    assert "Unsupported" in batch["error"]
+
+
+def test_lime_uses_configured_num_samples_and_keeps_top_k(forest, data, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    X, _ = data
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    decision = ExplainableDecision(forest, "tree", FEATURES, lime_num_samples=200)
+    samples = []
+    predict_proba = forest.predict_proba
+    monkeypatch.setattr(
+        forest, "predict_proba", lambda rows: samples.append(len(rows)) or predict_proba(rows)
+    )
+
+    explanation = decision.explain_prediction(X[:1], method="lime", num_features=2)
+
+    assert decision.explainers["lime"].feature_selection == "none"
+    assert samples == [200]
+    weights = [abs(f["importance"]) for f in explanation["features"]]
+    assert len(weights) == 2
+    assert weights == sorted(weights, reverse=True)
+
+
+def test_background_data_summarizes_kernel_and_feeds_lime(data):
+    from sklearn.neighbors import KNeighborsClassifier
+
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    X, y = data
+    model = KNeighborsClassifier().fit(X, y)
+
+    decision = ExplainableDecision(model, "knn", FEATURES, background_data=X)
+
+    assert decision.explainers["shap"].data.data.shape == (10, len(FEATURES))
+    assert decision.explainers["lime"].discretizer.mins[0][1:] == pytest.approx(
+        np.percentile(X[:, 0], [25, 50, 75])
+    )
+
+
+def test_missing_background_data_warns_and_uses_zero_row(forest, caplog, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+
+    with caplog.at_level("WARNING", logger="biocybe.explainability.explainer"):
+        decision = ExplainableDecision(forest, "tree", FEATURES)
+
+    assert "background_data" in caplog.text
+    assert decision.explainers["lime"].discretizer.maxs[0] == pytest.approx([0, 0])
+
+
+@pytest.fixture
+def counted_decision(forest, monkeypatch):
+    """ExplainableDecision d'arbres dont les appels shap_values sont comptés."""
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    def build(**kwargs):
+        decision = ExplainableDecision(forest, "tree", FEATURES, **kwargs)
+        calls = []
+        shap_values = decision.explainers["shap"].shap_values
+        monkeypatch.setattr(
+            decision.explainers["shap"],
+            "shap_values",
+            lambda X, **options: calls.append(len(X)) or shap_values(X, **options),
+        )
+        return decision, calls
+
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    return build
+
+
+def test_shap_values_memoized_by_input_content(counted_decision, data):
+    X, _ = data
+    decision, calls = counted_decision()
+
+    first = decision.explain_prediction(X[:1].copy(), num_features=3)
+    second = decision.explain_prediction(X[:1].copy(), num_features=3)
+
+    assert calls == [1]
+    assert first == second
+
+
+def test_shap_cache_evicts_least_recent(counted_decision, data, monkeypatch):
+    from biocybe.explainability import explainer
+
+    X, _ = data
+    monkeypatch.setattr(explainer, "SHAP_CACHE_SIZE", 2)
+    decision, calls = counted_decision()
+
+    for i in (0, 1, 0, 2, 1):
+        decision.explain_prediction(X[i : i + 1])
+
+    assert len(calls) == 4
+    assert len(decision._shap_cache) == 2
+
+
+def test_shap_values_persisted_in_cache_dir(counted_decision, data, tmp_path):
+    X, _ = data
+    first, first_calls = counted_decision(cache_dir=tmp_path)
+    first.explain_prediction(X[:1])
+
+    second, second_calls = counted_decision(cache_dir=tmp_path)
+    second.explain_prediction(X[:1])
+
+    assert first_calls == [1]
+    assert second_calls == []
+    [stored] = tmp_path.glob("shap-*.npy")
+    assert np.load(stored, allow_pickle=False).shape == (1, len(FEATURES))
+
+
+def test_cache_dir_not_shared_between_models(data, tmp_path, monkeypatch):
+    from sklearn.ensemble import RandomForestClassifier
+
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    X, y = data
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    models = [
+        RandomForestClassifier(n_estimators=5, max_depth=3, random_state=seed).fit(X, y)
+        for seed in (0, 1)
+    ]
+
+    explanations = [
+        ExplainableDecision(model, "tree", FEATURES, cache_dir=tmp_path).explain_prediction(X[:1])
+        for model in models
+    ]
+
+    assert len(list(tmp_path.glob("shap-*.npy"))) == 2
+    assert explanations[0] != explanations[1]
+
+
+def test_threat_explainer_shares_given_decision(forest, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision, ThreatExplainer
+
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    decision = ExplainableDecision(forest, "tree", FEATURES)
+
+    first = ThreatExplainer(forest, FEATURES, explainable_decision=decision)
+    second = ThreatExplainer(forest, FEATURES, explainable_decision=decision)
+
+    assert first.explainable_decision is second.explainable_decision is decision
+
+
+RANKED_FEATURES = [
+    {"feature": "cpu", "importance": 0.25},
+    {"feature": "ports", "importance": -0.004},
+    {"feature": "uid", "importance": 0.0},
+    {"feature": "entropy", "importance": -0.0123456},
+    {"feature": "tty", "importance": 0.001},
+    {"feature": "pid", "importance": 0.5},
+]
+
+
+def test_explanation_text_formats_top_five(forest, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    decision = ExplainableDecision(forest, "tree", FEATURES)
+
+    text = decision.generate_explanation_text({"method": "shap", "features": RANKED_FEATURES})
+
+    assert text.splitlines() == [
+        "Explication de la décision (méthode: shap):",
+        "",
+        "Facteurs les plus importants dans cette décision:",
+        "  1. cpu: a augmenté le risque (importance: 0.2500)",
+        "  2. ports: a diminué le risque (importance: 0.004000)",
+        "  3. uid: a diminué le risque (importance: 0.000000)",
+        "  4. entropy: a diminué le risque (importance: 0.0123)",
+        "  5. tty: a augmenté le risque (importance: 0.001000)",
+    ]
+
+
+def test_threat_explanation_text_lists_top_five(forest):
+    from biocybe.explainability.explainer import ThreatExplainer
+
+    threat = ThreatExplainer(forest, FEATURES, model_type="tree")
+    text = threat.generate_threat_explanation_text(
+        {"is_threat": False, "confidence": 0.25, "explanation": {"features": RANKED_FEATURES}}
+    )
+
+    assert text.splitlines()[3:] == [
+        "  1. cpu: a augmenté le niveau de risque",
+        "  2. ports: a diminué le niveau de risque",
+        "  3. uid: a diminué le niveau de risque",
+        "  4. entropy: a diminué le niveau de risque",
+        "  5. tty: a augmenté le niveau de risque",
+    ]
+
+
+def test_explain_prediction_ranks_top_features_without_pandas(forest, data, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision, _first_class
+
+    X, _ = data
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    decision = ExplainableDecision(forest, "tree", FEATURES)
+    importance = np.abs(_first_class(decision.explainers["shap"].shap_values(X[:1])))[0]
+    order = np.argsort(-importance, kind="stable")
+
+    top = decision.explain_prediction(X[:1], num_features=2)["features"]
+    everything = decision.explain_prediction(X[:1], num_features=10)["features"]
+
+    assert [f["feature"] for f in top] == [FEATURES[i] for i in order[:2]]
+    assert [f["feature"] for f in everything] == [FEATURES[i] for i in order]
+    assert everything[0] == {
+        "feature": FEATURES[order[0]],
+        "importance": pytest.approx(importance[order[0]]),
+        "value": pytest.approx(X[0, order[0]]),
+    }
+    assert all(type(f["importance"]) is float and type(f["value"]) is float for f in everything)
+
+
+def test_module_import_does_not_load_xai_dependencies():
+    code = (
+        "import sys; import biocybe.explainability.explainer; "
+        "print(sorted(m for m in ('shap', 'lime', 'captum', 'matplotlib') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(ROOT / "src")},
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+@pytest.fixture
+def tree_threat(forest, monkeypatch):
+    """ThreatExplainer construit sur un modèle d'arbres (TreeExplainer)."""
+    from biocybe.explainability.explainer import ThreatExplainer
+
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    return ThreatExplainer(forest, FEATURES, model_type="tree")
+
+
+def _spy_parallel_backend(monkeypatch):
+    import joblib
+
+    seen = []
+    real_parallel = joblib.Parallel
+
+    def _parallel(*args, **kwargs):
+        seen.append(kwargs.get("prefer"))
+        return real_parallel(*args, **kwargs)
+
+    monkeypatch.setattr(joblib, "Parallel", _parallel)
+    return seen
+
+
+def test_batch_explain_threats_matches_serial_with_threads(tree_threat, data, monkeypatch):
+    X, _ = data
+    seen = _spy_parallel_backend(monkeypatch)
+
+    batch = tree_threat.batch_explain_threats(X[:4], n_jobs=2)
+
+    assert seen == ["threads"]
+    assert batch == [tree_threat.explain_threat_detection(X[i : i + 1]) for i in range(4)]
+
+
+def test_batch_explain_threats_lime_in_processes(tree_threat, data, monkeypatch):
+    X, _ = data
+    seen = _spy_parallel_backend(monkeypatch)
+
+    batch = tree_threat.batch_explain_threats(X[:2], explanation_method="lime", n_jobs=2)
+
+    assert seen == ["processes"]
+    assert [b["is_threat"] for b in batch] == [
+        tree_threat.explain_threat_detection(X[i : i + 1])["is_threat"] for i in range(2)
+    ]
+    assert all(b["explanation"]["features"] and "error" not in b["explanation"] for b in batch)
+
+
+def test_explainable_decision_pickles_without_cache(tree_threat, data):
+    cloudpickle = pytest.importorskip("cloudpickle")
+
+    X, _ = data
+    decision = tree_threat.explainable_decision
+    decision.explain_prediction(X[:1])
+
+    clone = cloudpickle.loads(cloudpickle.dumps(decision))
+
+    assert len(decision._shap_cache) == 1
+    assert len(clone._shap_cache) == 0
+    assert clone.explain_prediction(X[:1]) == decision.explain_prediction(X[:1])
+
+
+@pytest.mark.parametrize(
+    ("background", "perturbation"),
+    [(True, "correlation_dependent"), (False, "interventional")],
+)
+def test_linear_models_use_linear_explainer(data, background, perturbation):
+    from sklearn.linear_model import LogisticRegression
+
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    X, y = data
+    model = LogisticRegression().fit(X, y)
+
+    decision = ExplainableDecision(
+        model, "linear", FEATURES, background_data=X if background else None
+    )
+    explanation = decision.explain_prediction(X[:1], num_features=2)
+
+    assert isinstance(decision.explainers["shap"], shap.LinearExplainer)
+    assert decision.explainers["shap"].feature_perturbation == perturbation
+    assert "error" not in explanation
+    assert len(explanation["features"]) == 2
+
+
+def test_kernel_shap_bounds_coalitions_and_regularizes_top_k(data, monkeypatch):
+    from sklearn.neighbors import KNeighborsClassifier
+
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    X, y = data
+    model = KNeighborsClassifier().fit(X, y)
+    decision = ExplainableDecision(model, "knn", FEATURES, background_data=X, kernel_nsamples=64)
+    calls = []
+    shap_values = decision.explainers["shap"].shap_values
+    monkeypatch.setattr(
+        decision.explainers["shap"],
+        "shap_values",
+        lambda X, **options: calls.append(options) or shap_values(X, **options),
+    )
+
+    top = decision.explain_prediction(X[:1], num_features=2)
+    everything = decision.explain_prediction(X[:1], num_features=len(FEATURES))
+
+    assert calls == [{"nsamples": 64, "l1_reg": "num_features(2)"}, {"nsamples": 64}]
+    assert "error" not in top and len(top["features"]) == 2
+    assert len(everything["features"]) == len(FEATURES)
+
+
+def test_shap_summary_reuses_precomputed_values(forest, data, monkeypatch):
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from biocybe.explainability.explainer import DecisionVisualizer
+
+    X, _ = data
+    tree_explainer = shap.TreeExplainer(forest)
+    shap_values = tree_explainer.shap_values(X[:10])[..., 1]
+
+    def recompute(X_sample):
+        raise AssertionError("valeurs SHAP recalculées")
+
+    monkeypatch.setattr(tree_explainer, "shap_values", recompute)
+
+    fig = DecisionVisualizer().plot_shap_summary(tree_explainer, X[:10], shap_values=shap_values)
+
+    assert not any("Erreur" in text.get_text() for ax in fig.axes for text in ax.texts)
+    plt.close("all")
+
+
+def test_tree_shap_receives_float32_without_additivity_check(forest, data, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    X, _ = data
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    decision = ExplainableDecision(forest, "tree", FEATURES)
+    calls = []
+    shap_values = decision.explainers["shap"].shap_values
+    monkeypatch.setattr(
+        decision.explainers["shap"],
+        "shap_values",
+        lambda X, **options: calls.append((X.dtype, options)) or shap_values(X, **options),
+    )
+
+    explanation = decision.explain_prediction(X[:1].astype(np.float64))
+
+    assert "error" not in explanation
+    assert calls == [(np.float32, {"check_additivity": False})]
+
+
+def test_float32_cast_does_not_leak_into_reported_values(forest, monkeypatch):
+    from biocybe.explainability.explainer import ExplainableDecision
+
+    monkeypatch.setitem(sys.modules, "fasttreeshap", None)
+    decision = ExplainableDecision(forest, "tree", FEATURES)
+    row = np.array([[1234567.89, 0.1, 0.3, 0.7]])
+
+    single = decision.explain_prediction(row, num_features=len(FEATURES))
+    batch = decision.explain_batch(row, num_features=len(FEATURES))
+
+    expected = dict(zip(FEATURES, row[0].tolist(), strict=True))
+    for features in (single["features"], batch["features"], batch["rows"][0]["features"]):
+        assert {f["feature"]: f["value"] for f in features} == expected
@@ -0,0 +1,184 @@
+"""Tests de la journalisation par défaut (biocybe.log_setup).
+
+Tests réels :
+  - tampon fichier : écrit par lots, WARNING+ et tampon ancien flushés,
+    y compris quand plus aucun record n'arrive (listener inactif)
+  - un lot = un seul writev(), écriture partielle complétée
+  - formatter à horodatage mis en cache : sortie identique à la stdlib
+  - configure_logging : QueueHandler sur la racine, vidé à la sortie,
+    sans effet si la racine est déjà configurée
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+
+# --------------------------------------------------------------------- #
+# Tampon fichier
+# --------------------------------------------------------------------- #
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _record(level: int, created: float) -> logging.LogRecord:
+    rec = logging.LogRecord("t", level, __file__, 0, "msg", None, None)
+    rec.created = created
+    return rec
+
+
+def test_buffered_handler_batches_info_records():
+    from biocybe.log_setup import BufferedLogHandler
+
+    target = _ListHandler()
+    h = BufferedLogHandler(3, flushLevel=logging.WARNING, target=target, flush_interval=60)
+    h.handle(_record(logging.INFO, 100.0))
+    h.handle(_record(logging.INFO, 100.1))
+    assert target.records == []
+    h.handle(_record(logging.INFO, 100.2))  # capacité atteinte
+    assert len(target.records) == 3
+
+
+def test_buffered_handler_flushes_warning_immediately():
+    from biocybe.log_setup import BufferedLogHandler
+
+    target = _ListHandler()
+    h = BufferedLogHandler(100, flushLevel=logging.WARNING, target=target, flush_interval=60)
+    h.handle(_record(logging.INFO, 100.0))
+    h.handle(_record(logging.WARNING, 100.1))
+    assert [r.levelno for r in target.records] == [logging.INFO, logging.WARNING]
+
+
+def test_buffered_handler_flushes_stale_buffer():
+    from biocybe.log_setup import BufferedLogHandler
+
+    target = _ListHandler()
+    h = BufferedLogHandler(100, flushLevel=logging.WARNING, target=target, flush_interval=1.0)
+    h.handle(_record(logging.INFO, 100.0))
+    assert target.records == []
+    h.handle(_record(logging.INFO, 101.5))
+    assert len(target.records) == 2
+
+
+def test_listener_flushes_buffer_when_queue_goes_idle():
+    import queue
+    import time
+
+    from biocybe.log_setup import BufferedLogHandler, FlushingQueueListener
+
+    target = _ListHandler()
+    buffered = BufferedLogHandler(100, flushLevel=logging.WARNING, target=target)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = FlushingQueueListener(log_queue, buffered, flush_interval=0.05)
+    listener.start()
+    try:
+        log_queue.put(_record(logging.INFO, time.time()))
+        deadline = time.monotonic() + 5
+        while not target.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(target.records) == 1
+    finally:
+        listener.stop()
+
+
+# --------------------------------------------------------------------- #
+# Installation sur le logger racine
+# --------------------------------------------------------------------- #
+
+
+def test_cli_import_installs_queue_logging(tmp_path):
+    """Régression : l'import du noyau ne doit pas préempter la config du CLI."""
+    code = (
+        "import logging, logging.handlers, biocybe.cli; "
+        "hs = logging.root.handlers; "
+        "assert len(hs) == 1 and isinstance(hs[0], logging.handlers.QueueHandler), hs; "
+        "logging.getLogger('biocybe.t').warning('hello-queue')"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(ROOT / "src")},
+        capture_output=True,
+    )
+    # Le listener a été vidé à la sortie : le record est bien sur disque
+    assert "hello-queue" in (tmp_path / "biocybe.log").read_text(encoding="utf-8")
+
+
+def test_configure_logging_is_noop_when_root_configured(monkeypatch):
+    from biocybe.log_setup import configure_logging
+
+    root = logging.getLogger()
+    sentinel = _ListHandler()
+    monkeypatch.setattr(root, "handlers", [sentinel])
+    assert configure_logging() is None
+    assert root.handlers == [sentinel]
+
+
+def test_cached_time_formatter_matches_stdlib():
+    from biocybe.log_setup import LOG_FORMAT, CachedTimeFormatter
+
+    fast = CachedTimeFormatter(LOG_FORMAT)
+    ref = logging.Formatter(LOG_FORMAT)
+    for created in (1_700_000_000.123, 1_700_000_000.999, 1_700_000_001.004, 1_700_000_000.5):
+        rec = logging.LogRecord("biocybe.t", logging.INFO, __file__, 0, "m %s", ("x",), None)
+        rec.created = created
+        rec.msecs = int((created - int(created)) * 1000)
+        assert fast.format(rec) == ref.format(rec)
+
+
+def test_writev_handler_writes_batch_in_one_call(tmp_path, monkeypatch):
+    from biocybe import log_setup
+
+    calls = []
+    real_writev = getattr(os, "writev", None)
+    if real_writev is None:
+        pytest.skip("os.writev indisponible sur cette plateforme")
+
+    def _spy(fd, bufs):
+        calls.append(len(bufs))
+        return real_writev(fd, bufs)
+
+    monkeypatch.setattr(log_setup.os, "writev", _spy)
+    path = tmp_path / "b.log"
+    target = log_setup.WritevFileHandler(str(path), encoding="utf-8")
+    target.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    h = log_setup.BufferedLogHandler(10, flushLevel=logging.ERROR, target=target, flush_interval=60)
+    for i in range(3):
+        h.handle(_record(logging.INFO, 100.0 + i / 10))
+    h.handle(_record(logging.ERROR, 100.5))
+    h.close()
+    target.close()
+    assert calls == [4]
+    assert path.read_text(encoding="utf-8").splitlines() == ["INFO msg"] * 3 + ["ERROR msg"]
+
+
+def test_write_all_completes_partial_writev(monkeypatch):
+    from biocybe import log_setup
+
+    if not hasattr(os, "writev"):
+        pytest.skip("os.writev indisponible sur cette plateforme")
+    r, w = os.pipe()
+    try:
+        monkeypatch.setattr(log_setup.os, "writev", lambda fd, bufs: os.write(fd, bufs[0][:2]))
+        log_setup.write_all(w, [b"abcdef", b"ghi"])
+        assert os.read(r, 100) == b"abcdefghi"
+    finally:
+        os.close(r)
+        os.close(w)
@@ -0,0 +1,1044 @@
+"""Tests du détecteur de signatures héritage (detection/signature_detector).
+
+Tests réels :
+  - hashes identiques à hashlib sur un fichier lu en plusieurs blocs
+  - lecture par blocs dans un tampon réutilisé (sans mmap) : mêmes hashes,
+    pas de plantage si le fichier est tronqué pendant l'analyse
+  - contextes de hachage vierges partagés : jamais modifiés par un scan
+  - sha256 et entropie en une seule lecture, sha1 jamais ; md5 seulement si
+    la base contient des signatures de hash
+  - entropie : 0 pour un octet répété, 8 pour une distribution uniforme
+  - repli sans numpy : mêmes valeurs
+  - fichier absent : info d'erreur, jamais d'exception
+  - base de signatures SQLite : persistance, lots, import des anciens JSON,
+    lectures sérialisées avec les écritures sur la connexion partagée
+  - un seul stat par analyse ; dossier ou fichier absent : erreur rapportée
+  - VirusTotal : session partagée, pool dimensionné, nouvelles tentatives
+  - correspondance md5 : sha256, entropie et analyse YARA sont évités ;
+    sans correspondance, informations complètes
+  - libmagic : une instance par thread, réutilisée d'un fichier à l'autre ;
+    en cas d'échec, type "unknown" et l'analyse continue
+  - scan_file : Future servi par le pool, callback appelé, cache réutilisé
+  - cache des résultats : invalidé si le fichier change, TTL, éviction LRU,
+    résultats en erreur jamais mis en cache
+  - scan_files : ordre conservé, petits lots dans l'appelant, gros lots
+    répartis sur le pool
+  - contre-pression : scan_file bloque quand le backlog du pool est plein
+  - shutdown : attend les analyses déjà soumises
+  - famille retenue : la plus fréquente parmi les règles correspondantes
+  - sévérité retenue : la plus haute, valeurs inconnues classées en bas
+  - catégorie ransomware prioritaire sur la famille ; confiance = meilleure
+    correspondance
+  - métadonnées de règle : un seul dict partagé entre les résultats, par
+    namespace et par jeu compilé (règles homonymes distinguées)
+  - recherche des fichiers de règles : arborescence complète, même
+    résultat qu'os.walk
+  - règles compilées : un seul automate partagé par les détecteurs du
+    processus tant que les sources sont inchangées
+  - règles compilées : rechargées depuis le cache tant que les sources ne
+    changent pas, recompilées sinon, anciens caches supprimés sans toucher
+    à ceux d'un autre répertoire de règles
+  - règles d'en-tête : appliquées aux 64 premiers Kio, décisives si elles
+    correspondent, règles complètes sinon
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+
+@pytest.fixture
+def detector(tmp_path, monkeypatch):
+    """Détecteur isolé : config et base de signatures sous tmp_path."""
+    from biocybe.detection.signature_detector import SignatureDetector
+
+    monkeypatch.chdir(tmp_path)
+    det = SignatureDetector(config_path=str(tmp_path / "absent.yaml"))
+    yield det
+    det.shutdown()
+
+
+def test_file_info_hashes_match_hashlib_across_chunks(detector, tmp_path, monkeypatch):
+    from biocybe.detection import signature_detector
+
+    monkeypatch.setattr(signature_detector, "READ_CHUNK_SIZE", 1000)
+    detector.db.add_hash_signature("0" * 32, {"family": "test"})
+    data = bytes(range(256)) * 50 + b"fin"
+    target = tmp_path / "sample.bin"
+    target.write_bytes(data)
+
+    info = detector._get_file_info(str(target))
+    assert info["size"] == len(data)
+    assert info["md5"] == hashlib.md5(data).hexdigest()
+    assert info["sha256"] == hashlib.sha256(data).hexdigest()
+    assert "sha1" not in info
+
+
+def test_hash_seeds_stay_pristine(detector, tmp_path):
+    from biocybe.detection import signature_detector
+
+    detector.db.add_hash_signature("0" * 32, {"family": "test"})
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"contenu")
+    detector._get_file_info(str(target))
+
+    assert signature_detector._MD5_SEED.hexdigest() == hashlib.md5().hexdigest()
+    assert signature_detector._SHA256_SEED.hexdigest() == hashlib.sha256().hexdigest()
+
+
+def test_file_info_reads_in_reused_blocks(detector, tmp_path, monkeypatch):
+    from biocybe.detection import signature_detector
+
+    monkeypatch.setattr(signature_detector, "READ_CHUNK_SIZE", 7)
+    data = b"lecture par blocs dans un tampon"
+    target = tmp_path / "sample.bin"
+    target.write_bytes(data)
+
+    info = detector._get_file_info(str(target))
+    assert info["sha256"] == hashlib.sha256(data).hexdigest()
+    assert info["size"] == len(data)
+
+
+def test_file_chunks_survive_truncation_during_scan(tmp_path, monkeypatch):
+    from biocybe.detection import signature_detector
+
+    monkeypatch.setattr(signature_detector, "READ_CHUNK_SIZE", 4)
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"0123456789abcdef")
+
+    seen = []
+    with open(target, "rb") as f:
+        for chunk in signature_detector._iter_file_chunks(f):
+            seen.append(bytes(chunk))
+            if len(seen) == 1:
+                with open(target, "r+b") as g:
+                    g.truncate(2)
+
+    assert seen[0] == b"0123"
+    assert b"".join(seen).startswith(b"0123")
+
+
+def test_file_info_skips_md5_with_empty_database(detector, tmp_path, monkeypatch):
+    from biocybe.detection import signature_detector
+
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"contenu")
+    assert not detector.db.has_hash_signatures()
+    reads = []
+    real_iter = signature_detector._iter_file_chunks
+
+    def _counting_iter(f):
+        reads.append(f.name)
+        return real_iter(f)
+
+    monkeypatch.setattr(signature_detector, "_iter_file_chunks", _counting_iter)
+
+    info = detector._get_file_info(str(target))
+    assert "md5" not in info
+    assert info["sha256"] == hashlib.sha256(b"contenu").hexdigest()
+    assert len(reads) == 1
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_file_info_entropy_bounds(detector, tmp_path, monkeypatch, use_numpy):
+    from biocybe.detection import signature_detector
+
+    if not use_numpy:
+        monkeypatch.setattr(signature_detector, "np", None)
+    flat = tmp_path / "flat.bin"
+    flat.write_bytes(b"A" * 4096)
+    uniform = tmp_path / "uniform.bin"
+    uniform.write_bytes(bytes(range(256)) * 16)
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+
+    assert detector._get_file_info(str(flat))["entropy"] == 0.0
+    assert detector._get_file_info(str(uniform))["entropy"] == pytest.approx(8.0)
+    assert detector._get_file_info(str(empty))["entropy"] == 0.0
+
+
+def test_file_info_entropy_same_with_and_without_numpy(detector, tmp_path, monkeypatch):
+    from biocybe.detection import signature_detector
+
+    target = tmp_path / "text.txt"
+    target.write_bytes(b"le systeme immunitaire numerique " * 100)
+    with_numpy = detector._get_file_info(str(target))["entropy"]
+    monkeypatch.setattr(signature_detector, "np", None)
+    assert detector._get_file_info(str(target))["entropy"] == pytest.approx(with_numpy)
+
+
+def test_magic_instance_reused_per_thread(detector, tmp_path, monkeypatch):
+    import threading
+
+    from biocybe.detection import signature_detector
+
+    created = []
+
+    class _FakeMagic:
+        def __init__(self, mime):
+            assert mime
+            created.append(threading.get_ident())
+
+        def from_file(self, _path):
+            return "application/octet-stream"
+
+    monkeypatch.setattr(signature_detector, "magic", type("m", (), {"Magic": _FakeMagic}))
+    monkeypatch.setattr(signature_detector, "_MAGIC_AVAILABLE", True)
+    paths = []
+    for i in range(3):
+        p = tmp_path / f"f{i}.bin"
+        p.write_bytes(b"x")
+        paths.append(str(p))
+
+    infos = [detector._get_file_info(p) for p in paths]
+    assert {i["mime"] for i in infos} == {"application/octet-stream"}
+    assert len(created) == 1
+
+    worker = threading.Thread(target=detector._get_file_info, args=(paths[0],))
+    worker.start()
+    worker.join()
+    assert len(created) == 2
+    assert len(set(created)) == 2
+
+
+def test_magic_failure_reports_unknown_mime_and_keeps_scanning(
+    rules_detector, tmp_path, monkeypatch
+):
+    from biocybe.detection import signature_detector
+
+    class _BrokenMagic:
+        def __init__(self, mime):
+            pass
+
+        def from_file(self, _path):
+            raise RuntimeError("libmagic en panne")
+
+    monkeypatch.setattr(signature_detector, "magic", type("m", (), {"Magic": _BrokenMagic}))
+    monkeypatch.setattr(signature_detector, "_MAGIC_AVAILABLE", True)
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"FULL_MARKER")
+
+    result = rules_detector.scan_file_sync(str(target))
+    assert "error" not in result.metadata
+    assert result.file_info["mime"] == "unknown"
+    assert result.matched_rules == ["FullMarker"]
+
+
+def test_file_info_missing_file_reports_error(detector, tmp_path):
+    info = detector._get_file_info(str(tmp_path / "absent.bin"))
+    assert "error" in info
+    assert info["md5"] == ""
+    assert info["entropy"] == 0.0
+
+
+# --------------------------------------------------------------------- #
+# Analyses asynchrones (pool de threads)
+# --------------------------------------------------------------------- #
+
+
+def test_scan_file_returns_future_and_calls_callback(detector, tmp_path):
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"contenu sain")
+    received = []
+
+    future = detector.scan_file(str(target), callback=received.append)
+    result = future.result(timeout=5)
+    assert not result.is_malicious
+    assert result.file_info["size"] == len(b"contenu sain")
+    _wait_for(lambda: received)
+    assert received == [result]
+
+
+def test_scan_file_serves_fresh_result_from_cache(detector, tmp_path, monkeypatch):
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"contenu")
+    first = detector.scan_file(str(target)).result(timeout=5)
+
+    def _boom(_path):
+        raise AssertionError("le fichier ne doit pas être réanalysé")
+
+    monkeypatch.setattr(detector, "_scan_file_internal", _boom)
+    assert detector.scan_file(str(target)).result(timeout=5) is first
+
+
+def test_scan_file_rescans_modified_file(detector, tmp_path):
+    import os
+
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"v1")
+    first = detector.scan_file(str(target)).result(timeout=5)
+    target.write_bytes(b"version 2")
+    st = target.stat()
+    os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    second = detector.scan_file(str(target)).result(timeout=5)
+    assert second is not first
+    assert second.file_info["size"] == len(b"version 2")
+
+
+def test_scan_file_does_not_cache_errors(detector, tmp_path, monkeypatch):
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"contenu")
+    real_info = detector._basic_file_info
+    failures = [OSError("lecture impossible")]
+
+    def _flaky(path, stats=None):
+        if failures:
+            raise failures.pop()
+        return real_info(path, stats)
+
+    monkeypatch.setattr(detector, "_basic_file_info", _flaky)
+    first = detector.scan_file(str(target)).result(timeout=5)
+    assert "error" in first.metadata
+    assert not detector.results_cache
+
+    second = detector.scan_file(str(target)).result(timeout=5)
+    assert "error" not in second.metadata
+    assert len(detector.results_cache) == 1
+
+
+def test_results_cache_expires_after_ttl(detector, tmp_path, monkeypatch):
+    from biocybe.detection import signature_detector
+
+    monkeypatch.setattr(signature_detector, "RESULTS_CACHE_TTL", 0.0)
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"contenu")
+    first = detector.scan_file(str(target)).result(timeout=5)
+    assert detector.scan_file(str(target)).result(timeout=5) is not first
+    assert len(detector.results_cache) == 1
+
+
+def test_results_cache_evicts_least_recently_used(detector, tmp_path, monkeypatch):
+    from biocybe.detection import signature_detector
+
+    monkeypatch.setattr(signature_detector, "RESULTS_CACHE_SIZE", 2)
+    paths = []
+    for name in ("a", "b", "c"):
+        p = tmp_path / name
+        p.write_bytes(name.encode())
+        paths.append(str(p))
+    detector.scan_file(paths[0]).result(timeout=5)
+    detector.scan_file(paths[1]).result(timeout=5)
+    detector.scan_file(paths[0]).result(timeout=5)  # "a" redevient le plus récent
+    detector.scan_file(paths[2]).result(timeout=5)
+
+    cached_paths = {key[0] for key in detector.results_cache}
+    assert cached_paths == {paths[0], paths[2]}
+
+
+def test_scan_file_runs_scans_concurrently(tmp_path, monkeypatch):
+    import threading
+
+    from biocybe.detection.signature_detector import SignatureDetector
+
+    monkeypatch.chdir(tmp_path)
+    config = tmp_path / "detection.yaml"
+    config.write_text("signatures:\n  scan_workers: 4\n", encoding="utf-8")
+    det = SignatureDetector(config_path=str(config))
+    barrier = threading.Barrier(4, timeout=5)
+    real_scan = det._scan_file_internal
+
+    def _scan(path):
+        barrier.wait()  # ne passe que si 4 analyses tournent en même temps
+        return real_scan(path)
+
+    monkeypatch.setattr(det, "_scan_file_internal", _scan)
+    try:
+        paths = []
+        for i in range(4):
+            p = tmp_path / f"f{i}.bin"
+            p.write_bytes(bytes([i]) * 10)
+            paths.append(str(p))
+        futures = [det.scan_file(p) for p in paths]
+        assert all(f.result(timeout=5).file_info["size"] == 10 for f in futures)
+    finally:
+        det.shutdown()
+
+
+def _scan_threads(detector, monkeypatch):
+    """Enregistre le nom du thread de chaque analyse."""
+    import threading
+
+    names = []
+    real_scan = detector._scan_file_internal
+
+    def _scan(path):
+        names.append(threading.current_thread().name)
+        return real_scan(path)
+
+    monkeypatch.setattr(detector, "_scan_file_internal", _scan)
+    return names
+
+
+@pytest.mark.parametrize(("count", "on_pool"), [(3, False), (12, True)])
+def test_scan_files_keeps_order(detector, tmp_path, monkeypatch, count, on_pool):
+    names = _scan_threads(detector, monkeypatch)
+    paths = []
+    for i in range(count):
+        p = tmp_path / f"f{i}.bin"
+        p.write_bytes(b"x" * (i + 1))
+        paths.append(str(p))
+
+    results = detector.scan_files(paths)
+    assert [r.file_info["size"] for r in results] == list(range(1, count + 1))
+    assert all(n.startswith("signature-scan") for n in names) is on_pool
+
+
+def test_scan_file_blocks_when_backlog_full(tmp_path, monkeypatch):
+    import threading
+
+    from biocybe.detection.signature_detector import SCAN_BACKLOG_PER_WORKER, SignatureDetector
+
+    monkeypatch.chdir(tmp_path)
+    config = tmp_path / "detection.yaml"
+    config.write_text("signatures:\n  scan_workers: 1\n", encoding="utf-8")
+    det = SignatureDetector(config_path=str(config))
+    release = threading.Event()
+    real_scan = det._scan_file_internal
+
+    def _slow_scan(path):
+        release.wait(5)
+        return real_scan(path)
+
+    monkeypatch.setattr(det, "_scan_file_internal", _slow_scan)
+    try:
+        paths = []
+        for i in range(SCAN_BACKLOG_PER_WORKER + 1):
+            p = tmp_path / f"f{i}.bin"
+            p.write_bytes(bytes([i]))
+            paths.append(str(p))
+        futures = [det.scan_file(p) for p in paths[:-1]]
+
+        producer = threading.Thread(target=lambda: futures.append(det.scan_file(paths[-1])))
+        producer.start()
+        producer.join(0.2)
+        assert producer.is_alive()  # backlog plein : le producteur attend
+
+        release.set()
+        producer.join(5)
+        assert not producer.is_alive()
+        assert len([f.result(timeout=5) for f in futures]) == len(paths)
+    finally:
+        release.set()
+        det.shutdown()
+
+
+def test_shutdown_waits_for_submitted_scans(detector, tmp_path):
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"contenu")
+    future = detector.scan_file(str(target))
+    detector.shutdown()
+    assert future.done()
+
+
+def _wait_for(predicate, timeout=5.0):
+    import time
+
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition jamais atteinte"
+        time.sleep(0.01)
+
+
+# --------------------------------------------------------------------- #
+# Préfiltre YARA sur l'en-tête
+# --------------------------------------------------------------------- #
+
+HEADER_RULE = """
+rule HeaderMagic {
+    meta:
+        severity = "high"
+    strings:
+        $mz = "MZ"
+    condition:
+        $mz at 0
+}
+"""
+
+FULL_RULE = """
+rule FullMarker {
+    meta:
+        severity = "medium"
+    strings:
+        $m = "FULL_MARKER"
+    condition:
+        $m
+}
+"""
+
+
+@pytest.fixture
+def rules_detector(tmp_path, monkeypatch):
+    """Détecteur avec une règle d'en-tête et une règle complète."""
+    from biocybe.detection.signature_detector import HEADER_RULES_DIR, SignatureDetector
+
+    monkeypatch.chdir(tmp_path)
+    rules = tmp_path / "rules"
+    (rules / HEADER_RULES_DIR).mkdir(parents=True)
+    (rules / HEADER_RULES_DIR / "magic.yar").write_text(HEADER_RULE, encoding="utf-8")
+    (rules / "marker.yar").write_text(FULL_RULE, encoding="utf-8")
+    config = tmp_path / "detection.yaml"
+    config.write_text(f"signatures:\n  yara_rules_path: {rules}\n", encoding="utf-8")
+    det = SignatureDetector(config_path=str(config))
+    yield det
+    det.shutdown()
+
+
+def test_header_rules_compiled_separately(rules_detector):
+    assert rules_detector.rules_header is not None
+    assert rules_detector.rules is not None
+
+
+def test_header_hit_skips_full_file_scan(rules_detector, tmp_path):
+    target = tmp_path / "sample.exe"
+    target.write_bytes(b"MZ" + b"\0" * 100 + b"FULL_MARKER")
+
+    result = rules_detector.scan_file_sync(str(target))
+    assert result.is_malicious
+    assert result.matched_rules == ["HeaderMagic"]
+
+
+def test_header_miss_falls_back_to_full_rules(rules_detector, tmp_path):
+    from biocybe.detection.signature_detector import HEADER_SCAN_SIZE
+
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"\0" * (HEADER_SCAN_SIZE * 2) + b"FULL_MARKER")
+
+    result = rules_detector.scan_file_sync(str(target))
+    assert result.matched_rules == ["FullMarker"]
+    assert result.severity == "medium"
+
+
+def test_header_rules_only_see_the_header(tmp_path, monkeypatch):
+    from biocybe.detection.signature_detector import (
+        HEADER_RULES_DIR,
+        HEADER_SCAN_SIZE,
+        SignatureDetector,
+    )
+
+    monkeypatch.chdir(tmp_path)
+    rules = tmp_path / "rules" / HEADER_RULES_DIR
+    rules.mkdir(parents=True)
+    (rules / "marker.yar").write_text(FULL_RULE, encoding="utf-8")
+    config = tmp_path / "detection.yaml"
+    config.write_text(f"signatures:\n  yara_rules_path: {rules.parent}\n", encoding="utf-8")
+    det = SignatureDetector(config_path=str(config))
+    try:
+        assert det.rules is None
+        late = tmp_path / "late.bin"
+        late.write_bytes(b"\0" * HEADER_SCAN_SIZE + b"FULL_MARKER")
+        early = tmp_path / "early.bin"
+        early.write_bytes(b"FULL_MARKER" + b"\0" * HEADER_SCAN_SIZE)
+        assert not det.scan_file_sync(str(late)).is_malicious
+        assert det.scan_file_sync(str(early)).matched_rules == ["FullMarker"]
+    finally:
+        det.shutdown()
+
+
+# --------------------------------------------------------------------- #
+# Cache des règles compilées
+# --------------------------------------------------------------------- #
+
+
+def _rules_config(tmp_path, rule_text=FULL_RULE):
+    rules = tmp_path / "rules"
+    rules.mkdir(exist_ok=True)
+    (rules / "marker.yar").write_text(rule_text, encoding="utf-8")
+    config = tmp_path / "detection.yaml"
+    config.write_text(f"signatures:\n  yara_rules_path: {rules}\n", encoding="utf-8")
+    return config
+
+
+def _cached_rules(tmp_path):
+    from biocybe.detection.signature_detector import RULES_CACHE_SUFFIX
+
+    return sorted((tmp_path / "db" / "signatures").glob(f"*{RULES_CACHE_SUFFIX}"))
+
+
+def test_find_rule_files_matches_os_walk(tmp_path):
+    import os
+
+    from biocybe.detection.signature_detector import _find_rule_files
+
+    root = tmp_path / "rules"
+    for rel in ("a.yar", "x/b.yara", "x/y/c.yar", "x/y/z/d.yar", "w/e.yar", "w/notes.txt"):
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("", encoding="utf-8")
+    (root / "empty").mkdir()
+
+    expected = sorted(
+        os.path.join(dirpath, name)
+        for dirpath, _, names in os.walk(root)
+        for name in names
+        if name.endswith((".yar", ".yara"))
+    )
+    assert _find_rule_files(str(root)) == expected
+    assert len(expected) == 5
+
+
+def test_compiled_rules_reloaded_from_cache(tmp_path, monkeypatch):
+    from biocybe.detection import signature_detector
+
+    monkeypatch.chdir(tmp_path)
+    config = _rules_config(tmp_path)
+    signature_detector.SignatureDetector(config_path=str(config)).shutdown()
+    assert len(_cached_rules(tmp_path)) == 1
+    signature_detector._load_or_compile_rules.cache_clear()  # relecture disque
+
+    def _boom(*_a, **_kw):
+        raise AssertionError("les règles ne doivent pas être recompilées")
+
+    monkeypatch.setattr(signature_detector.yara, "compile", _boom)
+    det = signature_detector.SignatureDetector(config_path=str(config))
+    try:
+        target = tmp_path / "sample.bin"
+        target.write_bytes(b"xx FULL_MARKER xx")
+        assert det.scan_file_sync(str(target)).matched_rules == ["FullMarker"]
+    finally:
+        det.shutdown()
+
+
+def test_changed_rules_recompiled_and_old_cache_pruned(tmp_path, monkeypatch):
+    import os
+
+    from biocybe.detection.signature_detector import SignatureDetector
+
+    monkeypatch.chdir(tmp_path)
+    config = _rules_config(tmp_path)
+    SignatureDetector(config_path=str(config)).shutdown()
+    before = _cached_rules(tmp_path)
+
+    rule = tmp_path / "rules" / "marker.yar"
+    rule.write_text(FULL_RULE.replace("FULL_MARKER", "OTHER_MARKER"), encoding="utf-8")
+    st = rule.stat()
+    os.utime(rule, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    det = SignatureDetector(config_path=str(config))
+    try:
+        after = _cached_rules(tmp_path)
+        assert len(after) == 1
+        assert after != before
+        target = tmp_path / "sample.bin"
+        target.write_bytes(b"OTHER_MARKER")
+        assert det.scan_file_sync(str(target)).is_malicious
+    finally:
+        det.shutdown()
+
+
+def test_rules_cache_prune_keeps_other_rule_sets(tmp_path, monkeypatch):
+    from biocybe.detection.signature_detector import SignatureDetector
+
+    monkeypatch.chdir(tmp_path)
+    SignatureDetector(config_path=str(_rules_config(tmp_path))).shutdown()
+    other_rules = tmp_path / "other_rules"
+    other_rules.mkdir()
+    (other_rules / "marker.yar").write_text(
+        FULL_RULE.replace("FULL_MARKER", "OTHER_MARKER"), encoding="utf-8"
+    )
+    other_config = tmp_path / "other.yaml"
+    other_config.write_text(f"signatures:\n  yara_rules_path: {other_rules}\n", encoding="utf-8")
+
+    SignatureDetector(config_path=str(other_config)).shutdown()
+    SignatureDetector(config_path=str(_rules_config(tmp_path))).shutdown()
+
+    assert len(_cached_rules(tmp_path)) == 2
+
+
+def test_corrupted_rules_cache_recompiled(tmp_path, monkeypatch):
+    from biocybe.detection.signature_detector import SignatureDetector, _load_or_compile_rules
+
+    monkeypatch.chdir(tmp_path)
+    config = _rules_config(tmp_path)
+    SignatureDetector(config_path=str(config)).shutdown()
+    (cache,) = _cached_rules(tmp_path)
+    cache.write_bytes(b"pas un binaire yara")
+    _load_or_compile_rules.cache_clear()
+
+    det = SignatureDetector(config_path=str(config))
+    try:
+        assert det.rules is not None
+        assert cache.read_bytes() != b"pas un binaire yara"
+    finally:
+        det.shutdown()
+
+
+# --------------------------------------------------------------------- #
+# Agrégation des correspondances
+# --------------------------------------------------------------------- #
+
+
+def _family_rule(name, family, marker):
+    return f"""
+rule {name} {{
+    meta:
+        family = "{family}"
+    strings:
+        $m = "{marker}"
+    condition:
+        $m
+}}
+"""
+
+
+def test_most_frequent_family_wins(tmp_path, monkeypatch):
+    from biocybe.detection.signature_detector import SignatureDetector
+
+    monkeypatch.chdir(tmp_path)
+    rules_text = (
+        _family_rule("Lone", "emotet", "AAA")
+        + _family_rule("PairOne", "qakbot", "BBB")
+        + _family_rule("PairTwo", "qakbot", "CCC")
+    )
+    det = SignatureDetector(config_path=str(_rules_config(tmp_path, rules_text)))
+    try:
+        target = tmp_path / "sample.bin"
+        target.write_bytes(b"AAA BBB CCC")
+        result = det.scan_file_sync(str(target))
+        assert result.malware_family == "qakbot"
+        assert len(result.matched_rules) == 3
+    finally:
+        det.shutdown()
+
+
+# --------------------------------------------------------------------- #
+# Base de signatures (SQLite)
+# --------------------------------------------------------------------- #
+
+
+def test_signature_database_persists_between_instances(tmp_path):
+    from biocybe.detection.signature_detector import SignatureDatabase
+
+    db = SignatureDatabase(str(tmp_path / "sigs"))
+    db.add_hash_signature("a" * 32, {"family": "emotet", "severity": "critical"})
+    db.add_hash_signatures({"b" * 32: {"family": "x"}, "c" * 32: {"family": "y"}})
+    db.add_yara_rule_info("Rule", {"author": "soc"})
+    db.save_database()
+    db.close()
+
+    db = SignatureDatabase(str(tmp_path / "sigs"))
+    try:
+        assert db.check_hash("b" * 32)
+        assert not db.check_hash("d" * 32)
+        assert db.get_hash_info("a" * 32) == {"family": "emotet", "severity": "critical"}
+        assert db.get_hash_info("d" * 32) is None
+        assert db.get_yara_rule_info("Rule") == {"author": "soc"}
+        assert db.last_update is not None
+    finally:
+        db.close()
+
+
+def test_signature_database_imports_legacy_json(tmp_path):
+    import json
+
+    from biocybe.detection.signature_detector import SignatureDatabase
+
+    legacy = tmp_path / "sigs"
+    legacy.mkdir()
+    (legacy / "hash_signatures.json").write_text(
+        json.dumps({"e" * 32: {"family": "old"}}), encoding="utf-8"
+    )
+    (legacy / "yara_info.json").write_text(json.dumps({"R": {"a": 1}}), encoding="utf-8")
+    (legacy / "last_update.txt").write_text("2024-01-02T03:04:05", encoding="utf-8")
+
+    db = SignatureDatabase(str(legacy))
+    try:
+        assert db.get_hash_info("e" * 32) == {"family": "old"}
+        assert db.get_yara_rule_info("R") == {"a": 1}
+        assert db.last_update.year == 2024
+    finally:
+        db.close()
+
+
+def test_signature_database_lookups_serialized_with_writes(tmp_path):
+    import threading
+
+    from biocybe.detection.signature_detector import SignatureDatabase
+
+    db = SignatureDatabase(str(tmp_path / "sigs"))
+    db.add_hash_signature("a" * 32, {"family": "x"})
+    found = []
+    try:
+        with db.update_lock:
+            reader = threading.Thread(target=lambda: found.append(db.check_hash("a" * 32)))
+            reader.start()
+            reader.join(0.1)
+            # La lecture attend que le verrou de la connexion soit libéré
+            assert reader.is_alive()
+        reader.join(5)
+        assert found == [True]
+    finally:
+        db.close()
+
+
+def test_hash_match_from_database_flags_file(detector, tmp_path):
+    data = b"echantillon connu"
+    detector.db.add_hash_signature(hashlib.md5(data).hexdigest(), {"family": "known"})
+    target = tmp_path / "known.bin"
+    target.write_bytes(data)
+
+    result = detector.scan_file_sync(str(target))
+    assert result.is_malicious
+    assert result.malware_family == "known"
+    assert result.confidence == 1.0
+
+
+def test_hash_match_stops_before_sha256_and_yara(detector, tmp_path, monkeypatch):
+    from biocybe.detection import signature_detector
+
+    data = b"echantillon connu"
+    detector.db.add_hash_signature(hashlib.md5(data).hexdigest(), {"family": "known"})
+    target = tmp_path / "known.bin"
+    target.write_bytes(data)
+    reads = []
+    real_iter = signature_detector._iter_file_chunks
+
+    def _counting_iter(f):
+        reads.append(f.name)
+        return real_iter(f)
+
+    def _boom(*_a, **_kw):
+        raise AssertionError("YARA inutile sur correspondance md5")
+
+    monkeypatch.setattr(signature_detector, "_iter_file_chunks", _counting_iter)
+    monkeypatch.setattr(detector, "_match_yara", _boom)
+    detector.rules = object()
+    result = detector.scan_file_sync(str(target))
+    assert result.is_malicious
+    assert result.file_info["md5"] == hashlib.md5(data).hexdigest()
+    assert "sha256" not in result.file_info
+    assert "entropy" not in result.file_info
+    assert len(reads) == 1
+
+
+def test_hash_miss_completes_file_info(detector, tmp_path):
+    detector.db.add_hash_signature("0" * 32, {"family": "autre"})
+    target = tmp_path / "unknown.bin"
+    target.write_bytes(b"inconnu")
+
+    result = detector.scan_file_sync(str(target))
+    assert not result.is_malicious
+    assert result.file_info["md5"] == hashlib.md5(b"inconnu").hexdigest()
+    assert result.file_info["sha256"] == hashlib.sha256(b"inconnu").hexdigest()
+    assert "entropy" in result.file_info
+
+
+def test_scan_stats_file_once(detector, tmp_path, monkeypatch):
+    from biocybe.detection import signature_detector
+
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"contenu")
+    calls = []
+    real_stat = signature_detector.os.stat
+
+    def _stat(path, *a, **kw):
+        if str(path) == str(target):
+            calls.append(path)
+        return real_stat(path, *a, **kw)
+
+    monkeypatch.setattr(signature_detector.os, "stat", _stat)
+    assert detector.scan_file_sync(str(target)).file_info["size"] == len(b"contenu")
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("kind", ["missing", "directory"])
+def test_scan_rejects_missing_or_non_regular_file(detector, tmp_path, kind):
+    target = tmp_path / "cible"
+    if kind == "directory":
+        target.mkdir()
+
+    result = detector.scan_file_sync(str(target))
+    assert not result.is_malicious
+    assert "error" in result.metadata
+
+
+# --------------------------------------------------------------------- #
+# VirusTotal
+# --------------------------------------------------------------------- #
+
+
+def test_virustotal_session_pools_and_retries(detector):
+    from biocybe.detection.signature_detector import VIRUSTOTAL_RETRIES, VIRUSTOTAL_URL
+
+    adapter = detector._vt_session.get_adapter(VIRUSTOTAL_URL)
+    assert adapter.max_retries.total == VIRUSTOTAL_RETRIES
+    assert adapter._pool_maxsize == detector._pool._max_workers
+
+
+def test_virustotal_queries_reuse_the_session(detector, tmp_path, monkeypatch):
+    calls = []
+
+    class _Response:
+        status_code = 200
+
+        @staticmethod
+        def json():
+            return {"positives": 3, "total": 60}
+
+    def _get(url, params, timeout):
+        calls.append(params["resource"])
+        return _Response()
+
+    monkeypatch.setattr(detector._vt_session, "get", _get)
+    detector.external_apis = {"virustotal": {"api_key": "k", "url": ""}}
+    target = tmp_path / "sample.bin"
+    target.write_bytes(b"contenu")
+
+    result = detector.scan_file_sync(str(target))
+    assert result.is_malicious
+    assert result.matched_rules == ["virustotal:3/60"]
+    assert calls == [hashlib.sha256(b"contenu").hexdigest()]
+
+
+def test_rule_metadata_shared_between_results(rules_detector, tmp_path):
+    first = tmp_path / "one.bin"
+    first.write_bytes(b"FULL_MARKER")
+    second = tmp_path / "two.bin"
+    second.write_bytes(b"xx FULL_MARKER")
+
+    meta_one = rules_detector.scan_file_sync(str(first)).metadata["FullMarker"]
+    meta_two = rules_detector.scan_file_sync(str(second)).metadata["FullMarker"]
+    assert meta_one == {"severity": "medium"}
+    assert meta_one is meta_two
+
+
+def test_rule_metadata_reset_when_rules_reloaded(rules_detector, tmp_path):
+    target = tmp_path / "one.bin"
+    target.write_bytes(b"FULL_MARKER")
+    before = rules_detector.scan_file_sync(str(target)).metadata["FullMarker"]
+
+    rules_detector._load_yara_rules()
+    after = rules_detector.scan_file_sync(str(target)).metadata["FullMarker"]
+    assert after == before
+    assert after is not before
+
+
+def _same_name_rules_detector(tmp_path, first_dir, second_dir):
+    from biocybe.detection.signature_detector import SignatureDetector
+
+    rules = tmp_path / "rules"
+    for sub, name, severity, marker in (
+        (first_dir, "a.yar", "high", "ALPHA_MARKER"),
+        (second_dir, "b.yar", "low", "BRAVO_MARKER"),
+    ):
+        (rules / sub).mkdir(parents=True, exist_ok=True)
+        (rules / sub / name).write_text(_severity_rule("Same", severity, marker), encoding="utf-8")
+    config = tmp_path / "detection.yaml"
+    config.write_text(f"signatures:\n  yara_rules_path: {rules}\n", encoding="utf-8")
+    return SignatureDetector(config_path=str(config))
+
+
+def test_rule_metadata_keyed_by_namespace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    det = _same_name_rules_detector(tmp_path, ".", ".")
+    try:
+        alpha = tmp_path / "alpha.bin"
+        alpha.write_bytes(b"ALPHA_MARKER")
+        bravo = tmp_path / "bravo.bin"
+        bravo.write_bytes(b"BRAVO_MARKER")
+
+        assert det.scan_file_sync(str(alpha)).severity == "high"
+        assert det.scan_file_sync(str(bravo)).severity == "low"
+    finally:
+        det.shutdown()
+
+
+def test_rule_metadata_cached_per_rule_set(tmp_path, monkeypatch):
+    from biocybe.detection.signature_detector import HEADER_RULES_DIR
+
+    monkeypatch.chdir(tmp_path)
+    # rule_0 dans chacun des deux jeux compilés (en-tête et complet)
+    det = _same_name_rules_detector(tmp_path, HEADER_RULES_DIR, ".")
+    try:
+        alpha = tmp_path / "alpha.bin"
+        alpha.write_bytes(b"ALPHA_MARKER")
+        bravo = tmp_path / "bravo.bin"
+        bravo.write_bytes(b"BRAVO_MARKER")
+
+        assert det.scan_file_sync(str(alpha)).severity == "high"
+        assert det.scan_file_sync(str(bravo)).severity == "low"
+    finally:
+        det.shutdown()
+
+
+def test_compiled_rules_shared_between_detectors(tmp_path, monkeypatch):
+    from biocybe.detection.signature_detector import SignatureDetector
+
+    monkeypatch.chdir(tmp_path)
+    config = _rules_config(tmp_path)
+    first = SignatureDetector(config_path=str(config))
+    second = SignatureDetector(config_path=str(config))
+    try:
+        assert first.rules is second.rules
+    finally:
+        first.shutdown()
+        second.shutdown()
+
+
+def _severity_rule(name, severity, marker):
+    return f"""
+rule {name} {{
+    meta:
+        severity = "{severity}"
+    strings:
+        $m = "{marker}"
+    condition:
+        $m
+}}
+"""
+
+
+def test_highest_severity_wins(tmp_path, monkeypatch):
+    from biocybe.detection.signature_detector import SignatureDetector
+
+    monkeypatch.chdir(tmp_path)
+    rules_text = (
+        _severity_rule("Low", "low", "AAA")
+        + _severity_rule("Odd", "bizarre", "BBB")
+        + _severity_rule("Crit", "critical", "CCC")
+        + _severity_rule("Med", "medium", "DDD")
+    )
+    det = SignatureDetector(config_path=str(_rules_config(tmp_path, rules_text)))
+    try:
+        target = tmp_path / "sample.bin"
+        target.write_bytes(b"AAA BBB CCC DDD")
+        assert det.scan_file_sync(str(target)).severity == "critical"
+        target.write_bytes(b"BBB AAA")
+        assert det.scan_file_sync(str(target)).severity == "low"
+    finally:
+        det.shutdown()
+
+
+def test_ransomware_category_and_best_confidence(tmp_path, monkeypatch):
+    from biocybe.detection.signature_detector import SignatureDetector
+
+    monkeypatch.chdir(tmp_path)
+    rules_text = """
+rule Locker {
+    meta:
+        category = "ransomware"
+        family = "lockbit"
+    strings:
+        $a = "AAA"
+        $b = "BBB"
+        $c = "CCC"
+    condition:
+        any of them
+}
+""" + _family_rule("Other", "emotet", "DDD")
+    det = SignatureDetector(config_path=str(_rules_config(tmp_path, rules_text)))
+    try:
+        target = tmp_path / "sample.bin"
+        target.write_bytes(b"AAA BBB CCC DDD")
+        result = det.scan_file_sync(str(target))
+        assert result.malware_family == "ransomware"  # égalité : la première l'emporte
+        assert result.confidence == pytest.approx(0.3)
+        assert result.severity == "unknown"
+    finally:
+        det.shutdown()
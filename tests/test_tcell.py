@@ -348,7 +348,7 @@ def test_anomaly_alert_routed_via_bus(model_dir):
     # Drainer toutes les messages et dispatcher
     drained = 0
     while not core.message_bus.empty():
-        _priority, msg = core.message_bus.get_nowait()
+        msg = core.message_bus.get_nowait()
         core._dispatch_message(msg)
         drained += 1
     assert drained >= 1